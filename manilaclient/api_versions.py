@@ -24,6 +24,7 @@ import manilaclient
 from manilaclient.common._i18n import _
 from manilaclient.common import cliutils
 from manilaclient.common import constants
+from manilaclient.common import httpclient
 from manilaclient import exceptions
 from manilaclient import utils
 
@@ -33,6 +34,10 @@ MAX_VERSION = '2.95'
 MIN_VERSION = '2.0'
 DEPRECATED_VERSION = '1.0'
 _VERSIONED_METHOD_MAP = {}
+# NOTE: maps (method name, version) to the method resolved for it. The
+# version of a client doesn't change, so resolving the method again on
+# every call is wasted work. Registering a versioned method clears it.
+_VERSIONED_METHOD_CACHE = {}
 
 
 class APIVersion:
@@ -241,7 +246,7 @@ def get_api_version(version_string):
     return api_version
 
 
-def _get_server_version_range(client):
+def get_server_version_range(client):
     """Obtain version range from server."""
     response = client.services.server_api_version('')
 
@@ -261,7 +266,7 @@ def _get_server_version_range(client):
     return min_version, max_version
 
 
-def discover_version(client, requested_version):
+def discover_version(client, requested_version, server_version_range=None):
     """Discovers the most recent version for client and API.
 
     Checks 'requested_version' and returns the most recent version
@@ -270,11 +275,14 @@ def discover_version(client, requested_version):
 
     :param client: client object
     :param requested_version: requested version represented by APIVersion obj
+    :param server_version_range: (min, max) tuple of APIVersion objects
+        previously obtained with get_server_version_range(). If provided,
+        the server is not queried and 'client' is not used.
     :returns: APIVersion
     """
-    server_start_version, server_end_version = _get_server_version_range(
-        client
-    )
+    if server_version_range is None:
+        server_version_range = get_server_version_range(client)
+    server_start_version, server_end_version = server_version_range
 
     valid_version = requested_version
     if server_start_version.is_null() and server_end_version.is_null():
@@ -388,6 +396,7 @@ def _validate_server_version(server_start_version, server_end_version):
 def add_versioned_method(versioned_method):
     _VERSIONED_METHOD_MAP.setdefault(versioned_method.name, [])
     _VERSIONED_METHOD_MAP[versioned_method.name].append(versioned_method)
+    _VERSIONED_METHOD_CACHE.clear()
 
 
 def get_versioned_methods(func_name, api_version=None):
@@ -401,18 +410,35 @@ def get_versioned_methods(func_name, api_version=None):
     return versioned_methods
 
 
+def get_versioned_method(func_name, api_version=None):
+    """Return the latest versioned method matching api_version, or None."""
+    if api_version and not api_version.is_null():
+        key = (func_name, api_version.ver_major, api_version.ver_minor)
+    else:
+        key = (func_name, None)
+    try:
+        return _VERSIONED_METHOD_CACHE[key]
+    except KeyError:
+        pass
+
+    methods = get_versioned_methods(func_name, api_version)
+    method = max(methods, key=lambda f: f.start_version) if methods else None
+    _VERSIONED_METHOD_CACHE[key] = method
+    return method
+
+
 def experimental_api(f):
-    """Adds to HTTP Header to indicate this is an experimental API call."""
+    """Adds to HTTP Header to indicate this is an experimental API call.
+
+    The header is only sent with the requests made by the decorated call,
+    the other users of the client are not affected.
+    """
 
     @functools.wraps(f)
     def _wrapper(*args, **kwargs):
-        client = args[0]
-        if isinstance(client, manilaclient.v2.client.Client) or hasattr(
-            client, 'client'
-        ):
-            dh = client.client.default_headers
-            dh[constants.EXPERIMENTAL_HTTP_HEADER] = 'true'
-        return f(*args, **kwargs)
+        headers = {constants.EXPERIMENTAL_HTTP_HEADER: 'true'}
+        with httpclient.request_headers(headers):
+            return f(*args, **kwargs)
 
     return _wrapper
 
@@ -441,9 +467,9 @@ def wraps(start_version, end_version=MAX_VERSION):
 
         @functools.wraps(func)
         def substitution(obj, *args, **kwargs):
-            methods = get_versioned_methods(name, obj.api_version)
+            method = get_versioned_method(name, obj.api_version)
 
-            if not methods:
+            if method is None:
                 raise exceptions.UnsupportedVersion(
                     _(
                         "API version '%(version)s' is not supported on "
@@ -455,8 +481,6 @@ def wraps(start_version, end_version=MAX_VERSION):
                     }
                 )
 
-            method = max(methods, key=lambda f: f.start_version)
-
             return method.func(obj, *args, **kwargs)
 
         if hasattr(func, 'arguments'):
@@ -25,13 +25,19 @@ import copy
 import hashlib
 import os
 
+from debtcollector import removals
 from oslo_utils import strutils
 
 from manilaclient import api_versions
 from manilaclient.common import cliutils
+from manilaclient.common import completion_cache
+from manilaclient.common import json_backend
 from manilaclient import exceptions
 from manilaclient import utils
 
+DEFAULT_PAGE_SIZE = 1000
+STREAM_CHUNK_SIZE = 64 * 1024
+
 
 def getid(obj):
     """Return id if argument is a Resource.
@@ -59,6 +65,11 @@ class Manager(utils.HookableMixin):
 
     resource_class = None
 
+    # NOTE: managers of resources which seldom change, such as types, set
+    # this so that repeated reads are served from the resource cache of the
+    # client, when it was created with one.
+    cache_reads = False
+
     def __init__(self, api):
         self.api = api
         self.client = api.client
@@ -67,8 +78,48 @@ class Manager(utils.HookableMixin):
     def api_version(self):
         return self.api.api_version
 
+    @property
+    def resource_cache(self):
+        cache = getattr(self.api, 'resource_cache', None)
+        if self.cache_reads and cache is not None and cache.active:
+            return cache
+        return None
+
+    def _cached_get(self, url):
+        """GET url, going through the resource cache when enabled."""
+        cache = self.resource_cache
+        if cache is None:
+            return self.api.client.get(url)[1]
+        key = (url, str(self.api_version))
+        body = cache.get(key)
+        if body is None:
+            body = self.api.client.get(url)[1]
+            if body is not None:
+                cache.set(key, body)
+        return body
+
+    def _write(self, method, url, **kwargs):
+        """Issue a request modifying resources.
+
+        Any change may affect other resources as well (e.g. deleting a
+        snapshot changes the status of its share), so the whole resource
+        cache of the client is dropped.
+        """
+        try:
+            return getattr(self.api.client, method)(url, **kwargs)
+        finally:
+            cache = getattr(self.api, 'resource_cache', None)
+            if cache is not None:
+                cache.clear()
+
     def _list(
-        self, url, response_key, manager=None, body=None, return_raw=None
+        self,
+        url,
+        response_key,
+        manager=None,
+        body=None,
+        return_raw=None,
+        stream=False,
     ):
         """List the collection.
 
@@ -80,12 +131,25 @@ class Manager(utils.HookableMixin):
             (self will be used by default)
         :param body: data that will be encoded as JSON and passed in POST
             request (GET will be sent by default)
+        :param stream: whether the collection may be huge, in which case it
+            is streamed if the client was created with
+            ``stream_listings=True``, see :meth:`_list_stream`.
         """
-        resp = None
+        # NOTE: the total count of resources follows the collection in the
+        # response, so listings requested "with_count" are never streamed.
+        if (
+            stream
+            and getattr(self.api, 'stream_listings', False)
+            and not body
+            and not return_raw
+            and 'with_count' not in url
+        ):
+            return self._list_stream(url, response_key, manager=manager)
+
         if body:
             resp, body = self.api.client.post(url, body=body)
         else:
-            resp, body = self.api.client.get(url)
+            body = self._cached_get(url)
 
         if manager is None:
             manager = self
@@ -100,24 +164,65 @@ class Manager(utils.HookableMixin):
                 data = data['values']
             except KeyError:
                 pass
-        with self.completion_cache('human_id', obj_class, mode="w"):
-            with self.completion_cache('uuid', obj_class, mode="w"):
+        with self.completion_cache('human_id', obj_class, mode="w") as hids:
+            with self.completion_cache('uuid', obj_class, mode="w") as uuids:
                 if return_raw:
                     return data
                 resource = [
                     obj_class(manager, res, loaded=True) for res in data if res
                 ]
+                self._add_to_completion_cache(resource, uuids, hids)
                 if 'count' in body:
                     return resource, body['count']
                 else:
                     return resource
 
+    def _list_stream(self, url, response_key, manager=None):
+        """Lazily list the collection as its response is being read.
+
+        Resources are yielded as soon as they are decoded, so only one of
+        them and the read buffer are held in memory rather than the whole
+        collection. The request is only sent once iteration starts.
+
+        :param url: a partial URL, e.g., '/shares/detail'
+        :param response_key: the key of the collection in the response,
+            e.g., 'shares'.
+        :param manager: manager instance for constructing the returned objects
+            (self will be used by default)
+        """
+        if manager is None:
+            manager = self
+
+        obj_class = manager.resource_class
+
+        resp = self.api.client.get(url, stream=True)[0]
+        try:
+            with self.completion_cache('human_id', obj_class, "w") as hids:
+                with self.completion_cache('uuid', obj_class, "w") as uuids:
+                    items = json_backend.iter_array(
+                        resp.iter_content(STREAM_CHUNK_SIZE), response_key
+                    )
+                    for res in items:
+                        if not res:
+                            continue
+                        resource = obj_class(manager, res, loaded=True)
+                        self._add_to_completion_cache([resource], uuids, hids)
+                        yield resource
+        finally:
+            resp.close()
+
+    @property
+    def completion_cache_enabled(self):
+        return getattr(self.api, 'use_completion_cache', False)
+
     @contextlib.contextmanager
     def completion_cache(self, cache_type, obj_class, mode):
         """Bash autocompletion items storage.
 
         The completion cache store items that can be used for bash
-        autocompletion, like UUIDs or human-friendly IDs.
+        autocompletion, like UUIDs or human-friendly IDs. It is disabled
+        unless the client was created with ``use_completion_cache=True``,
+        in which case no filesystem access is done here.
 
         A resource listing will clear and repopulate the cache.
 
@@ -125,7 +230,24 @@ class Manager(utils.HookableMixin):
 
         Delete is not handled because listings are assumed to be performed
         often enough to keep the cache reasonably up-to-date.
+
+        Items are collected into the list yielded by the context, which is
+        None when the cache is disabled, and written by a background thread
+        when it exits. The list is not stored on the manager so that
+        concurrent calls from different threads don't mix their items.
         """
+        if not self.completion_cache_enabled:
+            yield None
+            return
+
+        path = self._get_completion_cache_path(cache_type, obj_class)
+        cache = []
+        try:
+            yield cache
+        finally:
+            completion_cache.WRITER.submit(path, cache, append=(mode == "a"))
+
+    def _get_completion_cache_path(self, cache_type, obj_class):
         base_dir = cliutils.env(
             'manilaclient_UUID_CACHE_DIR',
             'MANILACLIENT_UUID_CACHE_DIR',
@@ -142,45 +264,35 @@ class Manager(utils.HookableMixin):
 
         cache_dir = os.path.expanduser(os.path.join(base_dir, uniqifier))
 
-        try:
-            os.makedirs(cache_dir, 0o755)
-        except OSError:
-            # NOTE(kiall): This is typically either permission denied while
-            #              attempting to create the directory, or the directory
-            #              already exists. Either way, don't fail.
-            pass
-
         resource = obj_class.__name__.lower()
         filename = "{}-{}-cache".format(resource, cache_type.replace('_', '-'))
-        path = os.path.join(cache_dir, filename)
-
-        cache_attr = f"_{cache_type}_cache"
-
-        try:
-            setattr(self, cache_attr, open(path, mode))
-        except OSError:
-            # NOTE(kiall): This is typically a permission denied while
-            #              attempting to write the cache file.
-            pass
-
-        try:
-            yield
-        finally:
-            cache = getattr(self, cache_attr, None)
-            if cache:
-                cache.close()
-                delattr(self, cache_attr)
-
+        return os.path.join(cache_dir, filename)
+
+    @removals.remove(
+        message='Resources are added to the completion cache as they are '
+        'listed or created, through manilaclient.common.completion_cache.',
+        version='6.4.0',
+        removal_version='7.0.0',
+    )
     def write_to_completion_cache(self, cache_type, val):
-        cache = getattr(self, f"_{cache_type}_cache", None)
-        if cache:
-            try:
-                cache.write(f"{val}\n")
-            except UnicodeEncodeError:
-                pass
+        if not self.completion_cache_enabled:
+            return
+        path = self._get_completion_cache_path(cache_type, self.resource_class)
+        completion_cache.WRITER.submit(path, [val], append=True)
+
+    def _add_to_completion_cache(self, resources, uuids, human_ids):
+        if uuids is None or human_ids is None:
+            return
+        for resource in resources:
+            uuid = resource._info.get('id')
+            if uuid:
+                uuids.append(uuid)
+            human_id = resource.human_id
+            if human_id:
+                human_ids.append(human_id)
 
     def _get(self, url, response_key, return_raw=False):
-        resp, body = self.api.client.get(url)
+        body = self._cached_get(url)
         if response_key:
             if return_raw:
                 return body[response_key]
@@ -201,23 +313,26 @@ class Manager(utils.HookableMixin):
 
     def _create(self, url, body, response_key, return_raw=False, **kwargs):
         self.run_hooks('modify_body_for_create', body, **kwargs)
-        resp, body = self.api.client.post(url, body=body)
+        resp, body = self._write('post', url, body=body)
         if return_raw:
             return body[response_key]
 
-        with self.completion_cache('human_id', self.resource_class, mode="a"):
-            with self.completion_cache('uuid', self.resource_class, mode="a"):
-                return self.resource_class(self, body[response_key])
+        obj_class = self.resource_class
+        with self.completion_cache('human_id', obj_class, mode="a") as hids:
+            with self.completion_cache('uuid', obj_class, mode="a") as uuids:
+                resource = obj_class(self, body[response_key])
+                self._add_to_completion_cache([resource], uuids, hids)
+                return resource
 
     def _accept(self, url, body):
-        resp, body = self.api.client.post(url, body=body)
+        resp, body = self._write('post', url, body=body)
 
     def _delete(self, url):
-        resp, body = self.api.client.delete(url)
+        resp, body = self._write('delete', url)
 
     def _update(self, url, body, response_key=None, **kwargs):
         self.run_hooks('modify_body_for_update', body, **kwargs)
-        resp, body = self.api.client.put(url, body=body)
+        resp, body = self._write('put', url, body=body)
         if body:
             if response_key:
                 return self.resource_class(self, body[response_key])
@@ -234,6 +349,11 @@ class Manager(utils.HookableMixin):
 class ManagerWithFind(Manager):
     """Like a `Manager`, but with additional `find()`/`findall()` methods."""
 
+    # NOTE: managers whose list API supports filtering by exact "name" set
+    # this, so that find()/findall() by name is narrowed down by the server
+    # instead of listing the whole collection.
+    name_search_opt = None
+
     def find(self, **kwargs):
         """Find a single item with attributes matching ``**kwargs``.
 
@@ -253,18 +373,21 @@ class ManagerWithFind(Manager):
     def findall(self, **kwargs):
         """Find all items with attributes matching ``**kwargs``.
 
-        This isn't very efficient: it loads the entire list then filters on
-        the Python side.
+        If the manager supports server side filtering by name and ``name``
+        is one of the searched attributes, only the resources with that
+        name are listed. Otherwise, this loads the entire list. Either way,
+        the results are filtered on the Python side.
         """
         found = []
         searches = list(kwargs.items())
 
         search_opts = {'all_tenants': 1}
-        resources = self.list(search_opts=search_opts)
+        search_opts.update(self._get_find_search_opts(kwargs))
+        resources = list(self.list(search_opts=search_opts))
         if 'v2.shares.ShareManager' in str(
             self.__class__
         ) and self.api_version >= api_versions.APIVersion("2.69"):
-            search_opts_2 = {'all_tenants': 1, 'is_soft_deleted': True}
+            search_opts_2 = dict(search_opts, is_soft_deleted=True)
             shares_soft_deleted = self.list(search_opts=search_opts_2)
             resources += shares_soft_deleted
         for obj in resources:
@@ -278,6 +401,71 @@ class ManagerWithFind(Manager):
 
         return found
 
+    def _get_find_search_opts(self, kwargs):
+        """Return the search options that the server can filter on."""
+        name = kwargs.get('name')
+        if self.name_search_opt and isinstance(name, str) and name:
+            return {self.name_search_opt: name}
+        return {}
+
+    def iter_list(self, page_size=DEFAULT_PAGE_SIZE, search_opts=None, **kw):
+        """Lazily iterate over a collection, one page at a time.
+
+        Pages are requested with the ``limit`` and ``offset`` search options
+        as the previous one is consumed, so only a single page of resources
+        is held in memory at a time. The iteration ends with the first empty
+        page, since the server may return fewer resources per page than
+        requested. Use a stable ``sort_key`` if the collection may change
+        while it is being iterated.
+
+        :param page_size: number of resources requested per API call.
+        :param search_opts: search options passed to ``list()``. If
+            ``limit`` or ``offset`` are given, they bound the whole iteration
+            rather than a single page.
+        :param kw: extra arguments passed to ``list()``, e.g. ``sort_key``.
+        """
+        page_size = int(page_size)
+        if page_size < 1:
+            raise ValueError("page_size must be a positive integer.")
+
+        search_opts = dict(search_opts or {})
+        total_limit = search_opts.pop('limit', None)
+        total_limit = int(total_limit) if total_limit else None
+        offset = int(search_opts.pop('offset', None) or 0)
+        returned = 0
+        previous = None
+
+        while total_limit is None or returned < total_limit:
+            limit = page_size
+            if total_limit is not None:
+                limit = min(page_size, total_limit - returned)
+
+            page_opts = dict(search_opts, limit=limit, offset=offset)
+            page = self.list(search_opts=page_opts, **kw)
+            if isinstance(page, tuple):
+                # NOTE: listings requested "with_count" return (items, count)
+                page = page[0]
+            page = list(page)
+
+            if len(page) > limit:
+                # NOTE: a page larger than requested means the server
+                # ignored the pagination parameters and returned the whole
+                # collection at once.
+                if total_limit is not None:
+                    page = page[: total_limit - returned]
+                yield from page
+                return
+
+            # NOTE: the server caps the page size at its osapi_max_limit, so
+            # a short page isn't necessarily the last one, only an empty page
+            # is. A server ignoring the offset returns the same page again.
+            if not page or page == previous:
+                return
+            yield from page
+            returned += len(page)
+            offset += len(page)
+            previous = page
+
     def list(self, search_opts=None):
         raise NotImplementedError
 
@@ -300,13 +488,20 @@ class Resource:
         """
         self.manager = manager
         self._info = info
+        # NOTE: compact resources don't copy their fields into the instance
+        # __dict__, they are looked up in _info instead. This roughly halves
+        # the memory used by large listings.
+        self._compact = getattr(
+            getattr(manager, 'api', None), 'compact_resources', False
+        )
         self._add_details(info)
         self._loaded = loaded
 
     def __repr__(self):
-        reprkeys = sorted(
-            k for k in self.__dict__.keys() if k[0] != '_' and k != 'manager'
-        )
+        keys = self.__dict__.keys()
+        if self._compact:
+            keys = keys | self._info.keys()
+        reprkeys = sorted(k for k in keys if k[0] != '_' and k != 'manager')
         info = ", ".join(f"{k}={getattr(self, k)}" for k in reprkeys)
         return f"<{self.__class__.__name__} {info}>"
 
@@ -320,6 +515,10 @@ class Resource:
         return None
 
     def _add_details(self, info):
+        if self._compact:
+            if info is not self._info:
+                self._info.update(info)
+            return
         for k, v in info.items():
             try:
                 setattr(self, k, v)
@@ -330,6 +529,8 @@ class Resource:
 
     def __getattr__(self, k):
         if k not in self.__dict__:
+            if self.__dict__.get('_compact') and k in self._info:
+                return self._info[k]
             # NOTE(bcwaldon): disallow lazy-loading if already loaded once
             if not self.is_loaded():
                 self.get()
@@ -422,7 +623,7 @@ class MetadataCapableResource(Resource, metaclass=abc.ABCMeta):
             resource, metadata, subresource=subresource
         )
 
-    def delete_metadata(self, keys, superresource=None):
+    def delete_metadata(self, keys, superresource=None, bulk=False):
         """Delete specified keys from the given resource.
 
         :param keys: An iterable with keys of metadata items to be deleted
@@ -430,13 +631,15 @@ class MetadataCapableResource(Resource, metaclass=abc.ABCMeta):
             its ID. Required for sub-resources such as share share export
             locations which do not include a reference to the parent object
             by default
+        :param bulk: delete all the keys with a single update of the
+            metadata, see :meth:`MetadataCapableManager.delete_metadata`.
         """
         resource, subresource = self._get_subresource_and_resource(
             superresource
         )
 
         return self.manager.delete_metadata(
-            resource, keys, subresource=subresource
+            resource, keys, subresource=subresource, bulk=bulk
         )
 
     def update_all_metadata(self, metadata, superresource=None):
@@ -464,19 +667,21 @@ class MetadataCapableManager(ManagerWithFind, metaclass=abc.ABCMeta):
     resource_path = None
     subresource_path = None
 
+    def _get_metadata_path(self, resource, subresource=None):
+        resource = getid(resource)
+        if subresource:
+            subresource = getid(subresource)
+            resource = f"{resource}{self.subresource_path}/{subresource}"
+        return f"{self.resource_path}/{resource}/metadata"
+
     def get_metadata(self, resource, subresource=None):
         """Get metadata of a resource.
 
         :param resource: either resource object or text with its ID.
         :param subresource: either a child resource object or text with its ID
         """
-        resource = getid(resource)
-        if subresource:
-            subresource = getid(subresource)
-            resource = f"{resource}{self.subresource_path}/{subresource}"
-
         return self._get(
-            f"{self.resource_path}/{resource}/metadata", "metadata"
+            self._get_metadata_path(resource, subresource), "metadata"
         )
 
     def set_metadata(self, resource, metadata, subresource=None):
@@ -488,29 +693,39 @@ class MetadataCapableManager(ManagerWithFind, metaclass=abc.ABCMeta):
         :param subresource: either a child resource object or text with its ID
         """
         body = {'metadata': metadata}
-        resource = getid(resource)
-        if subresource:
-            subresource = getid(subresource)
-            resource = f"{resource}{self.subresource_path}/{subresource}"
-
         return self._create(
-            f"{self.resource_path}/{resource}/metadata", body, "metadata"
+            self._get_metadata_path(resource, subresource), body, "metadata"
         )
 
-    def delete_metadata(self, resource, keys, subresource=None):
+    def delete_metadata(self, resource, keys, subresource=None, bulk=False):
         """Delete specified keys from resource metadata.
 
         :param resource: either resource object or text with its ID.
         :param keys: An iterable with keys of metadata items to be deleted
         :param subresource: either a child resource object or text with its ID
+        :param bulk: instead of one request per key, fetch the metadata and
+            replace it with the remaining items in a single request. Changes
+            made to the metadata by others in between are overwritten.
+        :raises NotFound: in bulk mode, if some of the keys don't exist. The
+            other keys are deleted nonetheless.
         """
-        resource = getid(resource)
-        if subresource:
-            subresource = getid(subresource)
-            resource = f"{resource}{self.subresource_path}/{subresource}"
+        path = self._get_metadata_path(resource, subresource)
 
-        for key in keys:
-            self._delete(f"{self.resource_path}/{resource}/metadata/{key}")
+        if not bulk:
+            for key in keys:
+                self._delete(f"{path}/{key}")
+            return
+
+        keys = set(keys)
+        metadata = self._get(path, "metadata", return_raw=True) or {}
+        missing = sorted(keys - set(metadata))
+        if len(missing) < len(keys):
+            remaining = {k: v for k, v in metadata.items() if k not in keys}
+            self._update(path, {'metadata': remaining})
+        if missing:
+            raise exceptions.NotFound(
+                message=f"Metadata keys not found: {', '.join(missing)}"
+            )
 
     def update_all_metadata(self, resource, metadata, subresource=None):
         """Update all metadata of a resource.
@@ -521,9 +736,6 @@ class MetadataCapableManager(ManagerWithFind, metaclass=abc.ABCMeta):
         :param subresource: either a child resource object or text with its ID
         """
         body = {'metadata': metadata}
-        resource = getid(resource)
-        if subresource:
-            subresource = getid(subresource)
-            resource = f"{resource}{self.subresource_path}/{subresource}"
-
-        return self._update(f"{self.resource_path}/{resource}/metadata", body)
+        return self._update(
+            self._get_metadata_path(resource, subresource), body
+        )
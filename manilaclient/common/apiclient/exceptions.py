@@ -33,8 +33,10 @@ Exception definitions.
 #
 ########################################################################
 
+from email import utils as email_utils
 import inspect
 import sys
+import time
 
 from manilaclient.common._i18n import _
 
@@ -155,6 +157,32 @@ class HttpError(ClientException):
         super().__init__(formatted_string)
 
 
+class RetryAfterException(HttpError):
+    """The base exception class for HTTP errors that may ask for a retry.
+
+    The delay requested by the server with the Retry-After header, either
+    in seconds or as an HTTP date, is available as ``retry_after``. It is
+    0 if the header is missing or invalid.
+    """
+
+    def __init__(self, *args, **kwargs):
+        retry_after = kwargs.pop('retry_after', None)
+        try:
+            self.retry_after = max(int(retry_after), 0)
+        except (TypeError, ValueError):
+            self.retry_after = self._parse_http_date(retry_after)
+
+        super().__init__(*args, **kwargs)
+
+    @staticmethod
+    def _parse_http_date(value):
+        try:
+            retry_at = email_utils.parsedate_to_datetime(value).timestamp()
+        except (TypeError, ValueError):
+            return 0
+        return max(int(retry_at - time.time()), 0)
+
+
 class HTTPRedirection(HttpError):
     """HTTP Redirection."""
 
@@ -329,7 +357,7 @@ class PreconditionFailed(HTTPClientError):
     message = _("Precondition Failed")
 
 
-class RequestEntityTooLarge(HTTPClientError):
+class RequestEntityTooLarge(RetryAfterException, HTTPClientError):
     """HTTP 413 - Request Entity Too Large.
 
     The request is larger than the server is willing or able to process.
@@ -338,14 +366,6 @@ class RequestEntityTooLarge(HTTPClientError):
     http_status = 413
     message = _("Request Entity Too Large")
 
-    def __init__(self, *args, **kwargs):
-        try:
-            self.retry_after = int(kwargs.pop('retry_after'))
-        except (KeyError, ValueError):
-            self.retry_after = 0
-
-        super().__init__(*args, **kwargs)
-
 
 class RequestUriTooLong(HTTPClientError):
     """HTTP 414 - Request-URI Too Long.
@@ -400,6 +420,16 @@ class UnprocessableEntity(HTTPClientError):
     message = _("Unprocessable Entity")
 
 
+class TooManyRequests(RetryAfterException, HTTPClientError):
+    """HTTP 429 - Too Many Requests.
+
+    The user has sent too many requests in a given amount of time.
+    """
+
+    http_status = 429
+    message = _("Too Many Requests")
+
+
 class InternalServerError(HttpServerError):
     """HTTP 500 - Internal Server Error.
 
@@ -433,7 +463,7 @@ class BadGateway(HttpServerError):
     message = _("Bad Gateway")
 
 
-class ServiceUnavailable(HttpServerError):
+class ServiceUnavailable(RetryAfterException, HttpServerError):
     """HTTP 503 - Service Unavailable.
 
     The server is currently unavailable.
@@ -491,9 +521,6 @@ def from_response(response, method, url):
         "url": url,
         "request_id": req_id,
     }
-    if "retry-after" in response.headers:
-        kwargs["retry_after"] = response.headers["retry-after"]
-
     content_type = response.headers.get("Content-Type", "")
     if content_type.startswith("application/json"):
         try:
@@ -520,4 +547,6 @@ def from_response(response, method, url):
             cls = HTTPClientError
         else:
             cls = HttpError
+    if issubclass(cls, RetryAfterException):
+        kwargs["retry_after"] = response.headers.get("retry-after")
     return cls(**kwargs)
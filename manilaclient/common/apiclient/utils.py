@@ -52,15 +52,18 @@ def find_resource(manager, name_or_id, **find_args):
         except exceptions.NotFound:
             pass
 
+    resource = getattr(manager, 'resource_class', None)
     try:
-        try:
-            return manager.find(human_id=name_or_id, **find_args)
-        except exceptions.NotFound:
-            pass
+        # NOTE: human_id is only set on resources which opt in to it, and
+        # looking it up means listing and scanning the whole collection.
+        if getattr(resource, 'HUMAN_ID', True):
+            try:
+                return manager.find(human_id=name_or_id, **find_args)
+            except exceptions.NotFound:
+                pass
 
         # finally try to find entity by name
         try:
-            resource = getattr(manager, 'resource_class', None)
             name_attr = resource.NAME_ATTR if resource else 'name'
             kwargs = {name_attr: name_or_id}
             kwargs.update(find_args)
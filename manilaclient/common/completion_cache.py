@@ -0,0 +1,102 @@
+# Licensed under the Apache License, Version 2.0 (the "License"); you may
+# not use this file except in compliance with the License. You may obtain
+# a copy of the License at
+#
+# http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+# WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+# License for the specific language governing permissions and limitations
+# under the License.
+
+"""Background writer for the bash completion cache files."""
+
+import atexit
+import logging
+import os
+import queue
+import tempfile
+import threading
+
+LOG = logging.getLogger(__name__)
+
+
+class CompletionCacheWriter:
+    """Writes completion cache files from a background thread.
+
+    Callers only enqueue the values to be written, so listing or creating
+    resources never waits on the filesystem. Every file is written to a
+    temporary file first and then atomically renamed over the previous
+    version, so readers never see a partially written cache.
+    """
+
+    def __init__(self):
+        self._queue = queue.Queue()
+        self._lock = threading.Lock()
+        self._thread = None
+        self._known_dirs = set()
+
+    def submit(self, path, values, append=False):
+        """Schedule writing values, one per line, to the cache file.
+
+        :param path: path of the cache file.
+        :param values: iterable of values to be written.
+        :param append: if True, values are added to the existing content
+            of the file instead of replacing it.
+        """
+        with self._lock:
+            if self._thread is None or not self._thread.is_alive():
+                self._thread = threading.Thread(
+                    target=self._run,
+                    name='manilaclient-completion-cache',
+                    daemon=True,
+                )
+                self._thread.start()
+        self._queue.put((path, list(values), append))
+
+    def flush(self):
+        """Block until all the scheduled writes are done."""
+        self._queue.join()
+
+    def _run(self):
+        while True:
+            path, values, append = self._queue.get()
+            try:
+                self._write(path, values, append)
+            except OSError as e:
+                # NOTE: this is typically a permission denied error, the
+                # completion cache is best effort so don't fail.
+                LOG.debug("Unable to write completion cache %s: %s", path, e)
+            finally:
+                self._queue.task_done()
+
+    def _write(self, path, values, append):
+        cache_dir = os.path.dirname(path)
+        if cache_dir not in self._known_dirs:
+            os.makedirs(cache_dir, 0o755, exist_ok=True)
+            self._known_dirs.add(cache_dir)
+
+        lines = []
+        if append:
+            try:
+                with open(path, encoding='utf-8') as cache_file:
+                    lines = cache_file.read().splitlines()
+            except FileNotFoundError:
+                pass
+        lines.extend(str(value) for value in values)
+
+        fd, tmp_path = tempfile.mkstemp(
+            dir=cache_dir, prefix=f'.{os.path.basename(path)}.'
+        )
+        try:
+            with os.fdopen(fd, 'w', encoding='utf-8') as tmp_file:
+                tmp_file.writelines(f"{line}\n" for line in lines)
+            os.replace(tmp_path, path)
+        except OSError:
+            os.unlink(tmp_path)
+            raise
+
+
+WRITER = CompletionCacheWriter()
+atexit.register(WRITER.flush)
@@ -16,16 +16,25 @@
 # See the License for the specific language governing permissions and
 # limitations under the License.
 
+import contextlib
+import contextvars
 import copy
 import logging
+import time
 from urllib import parse
 
+from keystoneauth1 import exceptions as ks_exceptions
 from oslo_serialization import jsonutils
 from oslo_utils import importutils
 from oslo_utils import strutils
 import re
 import requests
+from requests import adapters
+import threading
 
+from manilaclient.common import json_backend
+from manilaclient.common import metrics
+from manilaclient.common import retry
 from manilaclient import exceptions
 
 from time import sleep  # noqa
@@ -35,6 +44,26 @@ try:
 except ImportError:
     pass
 
+_request_headers = contextvars.ContextVar('manilaclient_request_headers')
+
+
+@contextlib.contextmanager
+def request_headers(headers):
+    """Add headers to the API requests made within the context.
+
+    The headers are scoped to the current thread (or asyncio task), so a
+    client shared by many threads only sends them with the requests made
+    by the caller. Nested contexts add to the headers of the outer ones.
+    ``ThreadedAsyncClient`` and the parallel helpers of the OSC commands run
+    their calls in a copy of the context of the caller, so the headers apply
+    to them too. Threads started otherwise don't inherit them.
+    """
+    token = _request_headers.set({**_request_headers.get({}), **headers})
+    try:
+        yield
+    finally:
+        _request_headers.reset(token)
+
 
 class HTTPClient:
     """HTTP Client class used by multiple clients.
@@ -44,9 +73,24 @@ class HTTPClient:
     necessary that the Requests module is only imported once during client
     execution. This class is shared by multiple client versions so that the
     client can be changed to another version during execution.
+
+    An instance is safe to share between threads: its state is only read
+    while making requests, and headers specific to some requests are passed
+    along with them or set with :func:`request_headers`.
+
+    Requests are sent with a requests session owned by the client, using the
+    given token. If a keystoneauth ``session_adapter`` is given instead, they
+    are sent through it: the keystoneauth session then provides the
+    connection pool and TLS settings, and the token, which is renewed when it
+    expires.
+
+    The endpoint URL and the token may be given as callables. They are then
+    only resolved when the first request is made, and the result is kept
+    for the following ones.
     """
 
     API_VERSION_HEADER = "X-Openstack-Manila-Api-Version"
+    DEFAULT_POOL_MAXSIZE = 10
 
     def __init__(
         self,
@@ -60,25 +104,149 @@ class HTTPClient:
         retries=None,
         http_log_debug=False,
         cert=None,
+        pool_maxsize=None,
+        connection_retries=None,
+        keep_alive=True,
+        http_session=None,
+        json_decoder=None,
+        retry_policy=None,
+        rate_limiter=None,
+        instruments=None,
+        session_adapter=None,
     ):
-        self.endpoint_url = endpoint_url
-        self.base_url = self._get_base_url(self.endpoint_url)
-        self.retries = int(retries or 0)
+        self._endpoint_url = endpoint_url
+        self._base_url = None
+        self._token = token
+        self._resolve_lock = threading.Lock()
+        self.retry_policy = retry_policy or retry.RetryPolicy(retries=retries)
+        self.rate_limiter = rate_limiter
+        self.instruments = list(instruments or ())
         self.http_log_debug = http_log_debug
+        self.json_loads = json_backend.get_loads(json_decoder)
 
-        self.request_options = self._set_request_options(
-            insecure, cacert, timeout, cert
-        )
+        self.session_adapter = session_adapter
+        # Size of the connection pool, when it is owned by this client.
+        self.pool_maxsize = None
 
         self.default_headers = {
-            'X-Auth-Token': token,
             self.API_VERSION_HEADER: api_version.get_string(),
             'User-Agent': user_agent,
             'Accept': 'application/json',
         }
 
+        if session_adapter is not None:
+            self.http_session = None
+            # NOTE: TLS settings are those of the keystoneauth session.
+            self.request_options = {'timeout': timeout} if timeout else {}
+        else:
+            self.http_session = http_session or self._create_http_session(
+                pool_maxsize, connection_retries, keep_alive
+            )
+            self.request_options = self._set_request_options(
+                insecure, cacert, timeout, cert
+            )
+
         self._add_log_handlers(http_log_debug)
 
+    @property
+    def retries(self):
+        return self.retry_policy.retries
+
+    def _resolve(self, attr):
+        """Return the value of attr, calling it first if it is callable."""
+        value = getattr(self, attr)
+        if callable(value):
+            with self._resolve_lock:
+                value = getattr(self, attr)
+                if callable(value):
+                    value = value()
+                    setattr(self, attr, value)
+        return value
+
+    @property
+    def endpoint_url(self):
+        return self._resolve('_endpoint_url')
+
+    @property
+    def base_url(self):
+        if self._base_url is None:
+            self._base_url = self._get_base_url(self.endpoint_url)
+        return self._base_url
+
+    @property
+    def token(self):
+        return self._resolve('_token')
+
+    def derive(self, endpoint_url, token, session_adapter=None):
+        """Return a client for another endpoint and token.
+
+        The new client shares the connection pool, retry policy, rate
+        limiter and instruments of this one, so that many clients, such as
+        clients of different projects, don't each open their own
+        connections.
+
+        :param endpoint_url: endpoint URL of the new client, or a callable
+            returning it.
+        :param token: token of the new client, or a callable returning it.
+        :param session_adapter: keystoneauth adapter of the new client, if
+            this one sends its requests through a keystoneauth session.
+        """
+        derived = copy.copy(self)
+        derived._endpoint_url = endpoint_url
+        derived._base_url = None
+        derived._token = token
+        derived._resolve_lock = threading.Lock()
+        derived.session_adapter = session_adapter
+        derived.default_headers = dict(self.default_headers)
+        derived.request_options = dict(self.request_options)
+        derived.instruments = list(self.instruments)
+        return derived
+
+    def add_instrument(self, instrument):
+        """Register a :class:`manilaclient.common.metrics.RequestInstrument`.
+
+        Instruments are notified of the attempts, responses and retries of
+        every request made by this client.
+        """
+        self.instruments.append(instrument)
+
+    def _notify(self, callback, *args):
+        for instrument in self.instruments:
+            try:
+                getattr(instrument, callback)(*args)
+            except Exception:
+                self._logger.warning(
+                    "Instrument %r failed in %s",
+                    instrument,
+                    callback,
+                    exc_info=True,
+                )
+
+    def _start_request_info(self, info):
+        info.attempt += 1
+        info.elapsed = info.status = info.bytes_in = info.error = None
+        info.bytes_out = 0
+        self._notify('on_request_start', info)
+        return time.monotonic()
+
+    def _complete_request_info(self, info, started_at, resp, error, stream):
+        info.elapsed = time.monotonic() - started_at
+        info.error = error
+        if resp is not None:
+            info.status = resp.status_code
+            request = getattr(resp, 'request', None)
+            body = getattr(request, 'body', None)
+            info.bytes_out = len(body) if body else 0
+            if stream and resp.status_code < 400:
+                # NOTE: reading the content would consume the stream.
+                length = resp.headers.get('Content-Length')
+                info.bytes_in = int(length) if length else None
+            else:
+                info.bytes_in = len(resp.content or b'')
+        else:
+            info.status = getattr(error, 'http_status', None)
+        self._notify('on_response', info)
+
     def _add_log_handlers(self, http_log_debug):
         self._logger = logging.getLogger(__name__)
 
@@ -107,6 +275,44 @@ class HTTPClient:
         base_url = service_endpoint._replace(path=base_path)
         return parse.urlunparse(base_url) + '/'
 
+    def _create_http_session(
+        self, pool_maxsize=None, connection_retries=None, keep_alive=True
+    ):
+        """Create a requests session with a sized connection pool.
+
+        The session is owned by this client and reused for every API call,
+        so connections (and TLS handshakes) to the API endpoint are kept
+        alive across requests instead of being set up on each call.
+
+        :param pool_maxsize: maximum number of connections kept open per
+            host, defaults to DEFAULT_POOL_MAXSIZE.
+        :param connection_retries: number of times a failed connection
+            attempt is retried by the transport before giving up.
+        :param keep_alive: if False, ask the server to close the connection
+            after each request.
+        """
+        pool_maxsize = int(pool_maxsize or self.DEFAULT_POOL_MAXSIZE)
+        self.pool_maxsize = pool_maxsize
+        http_adapter = adapters.HTTPAdapter(
+            pool_maxsize=pool_maxsize,
+            max_retries=int(connection_retries or 0),
+        )
+        http_session = requests.Session()
+        http_session.mount('http://', http_adapter)
+        http_session.mount('https://', http_adapter)
+        if not keep_alive:
+            http_session.headers['Connection'] = 'close'
+        return http_session
+
+    def close(self):
+        """Release the pooled connections held by this client.
+
+        The keystoneauth session of a ``session_adapter`` is left open, it
+        belongs to the caller.
+        """
+        if self.http_session is not None:
+            self.http_session.close()
+
     def _set_request_options(self, insecure, cacert, timeout=None, cert=None):
         options = {'verify': True}
 
@@ -123,10 +329,15 @@ class HTTPClient:
         return options
 
     def request(self, url, method, **kwargs):
-        headers = copy.deepcopy(self.default_headers)
+        # NOTE: the defaults only hold strings and flags, a shallow copy
+        # keeps them safe from the per request updates below.
+        headers = dict(self.default_headers)
+        if self.session_adapter is None:
+            headers['X-Auth-Token'] = self.token
+        headers.update(_request_headers.get({}))
         headers.update(kwargs.get('headers', {}))
 
-        options = copy.deepcopy(self.request_options)
+        options = dict(self.request_options)
 
         if osprofiler_web:
             headers.update(osprofiler_web.get_trace_id_headers())
@@ -135,15 +346,37 @@ class HTTPClient:
             headers['Content-Type'] = 'application/json'
             options['data'] = jsonutils.dumps(kwargs['body'])
 
+        # NOTE: streamed responses are returned unread, for the caller to
+        # consume them incrementally with resp.iter_content().
+        stream = kwargs.get('stream', False)
+        if stream:
+            options['stream'] = True
+
         self.log_request(method, url, headers, options.get('data', None))
-        resp = requests.request(method, url, headers=headers, **options)  # noqa: S113
+        if self.session_adapter is not None:
+            # NOTE: error statuses are mapped to exceptions below, like for
+            # the requests made with the client's own session.
+            resp = self.session_adapter.request(
+                url, method, headers=headers, raise_exc=False, **options
+            )
+        else:
+            resp = self.http_session.request(  # noqa: S113
+                method, url, headers=headers, **options
+            )
+
+        if stream and resp.status_code < 400:
+            self.log_response(resp, streamed=True)
+            return resp, None
+
         self.log_response(resp)
 
         body = None
 
-        if resp.text:
+        # NOTE: decode the raw bytes, resp.text would guess the charset and
+        # build a str copy of the whole body before parsing it.
+        if resp.content:
             try:
-                body = jsonutils.loads(resp.text)
+                body = self.json_loads(resp.content)
             except ValueError:
                 pass
 
@@ -162,31 +395,67 @@ class HTTPClient:
             self.base_url + url, method, **kwargs
         )
 
+    def _get_endpoint_path(self, url):
+        """Return the path of url relative to the API endpoint."""
+        path = parse.urlparse(url).path
+        endpoint_path = parse.urlparse(self.endpoint_url).path.rstrip('/')
+        if endpoint_path and path.startswith(endpoint_path):
+            path = path[len(endpoint_path) :]
+        return path or '/'
+
     def _cs_request_with_retries(self, url, method, **kwargs):
         attempts = 0
-        timeout = 1
+        self.retry_policy.record_request()
+        if self.rate_limiter is not None or self.instruments:
+            path = self._get_endpoint_path(url)
+        info = None
+        if self.instruments:
+            info = metrics.RequestInfo(method, metrics.get_path_template(path))
+        stream = kwargs.get('stream', False)
         while True:
             attempts += 1
+            if self.rate_limiter is not None:
+                self.rate_limiter.acquire(method, path)
+            if info is not None:
+                started_at = self._start_request_info(info)
             try:
                 resp, body = self.request(url, method, **kwargs)
+                if info is not None:
+                    self._complete_request_info(
+                        info, started_at, resp, None, stream
+                    )
                 return resp, body
             except (
-                exceptions.BadRequest,
                 requests.exceptions.RequestException,
+                ks_exceptions.ConnectionError,
                 exceptions.ClientException,
             ) as e:
-                if attempts > self.retries:
+                if info is not None:
+                    self._complete_request_info(
+                        info,
+                        started_at,
+                        getattr(e, 'response', None),
+                        e,
+                        stream,
+                    )
+                delay = self.retry_policy.get_delay(method, attempts, e)
+                if delay is None:
                     raise
 
                 self._logger.debug("Request error: %s", str(e))
+                if info is not None:
+                    self._notify('on_retry', info, delay)
 
             self._logger.debug(
                 "Failed attempt(%(current)s of %(total)s), "
-                " retrying in %(sec)s seconds",
-                {'current': attempts, 'total': self.retries, 'sec': timeout},
+                " retrying in %(sec).2f seconds",
+                {
+                    'current': attempts,
+                    'total': self.retry_policy.retries,
+                    'sec': delay,
+                },
             )
-            sleep(timeout)
-            timeout *= 2
+            sleep(delay)
 
     def get_with_base_url(self, url, **kwargs):
         return self._cs_request_base_url(url, 'GET', **kwargs)
@@ -219,7 +488,7 @@ class HTTPClient:
             string_parts.append(f" -d '{data}'")
         self._logger.debug("\nREQ: %s\n", "".join(string_parts))
 
-    def log_response(self, resp):
+    def log_response(self, resp, streamed=False):
         if not self.http_log_debug:
             return
         self._logger.debug(
@@ -227,6 +496,6 @@ class HTTPClient:
             {
                 'code': resp.status_code,
                 'headers': resp.headers,
-                'body': resp.text,
+                'body': '<streamed>' if streamed else resp.text,
             },
         )
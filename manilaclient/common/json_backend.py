@@ -0,0 +1,172 @@
+# Licensed under the Apache License, Version 2.0 (the "License"); you may
+# not use this file except in compliance with the License. You may obtain
+# a copy of the License at
+#
+# http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+# WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+# License for the specific language governing permissions and limitations
+# under the License.
+
+"""JSON decoders used to parse API response bodies.
+
+Response bodies are decoded straight from the raw bytes received, which
+avoids building an intermediate str copy of large listings. The fastest
+installed parser is used by default; the stdlib json module is always
+available as a fallback.
+
+Huge listings can also be decoded incrementally with :func:`iter_array`,
+which yields the items of a collection as they are read instead of
+parsing the whole body at once.
+"""
+
+import codecs
+import json
+import re
+
+from oslo_utils import importutils
+
+orjson = importutils.try_import('orjson')
+
+BACKENDS = {'json': json.loads}
+if orjson:
+    BACKENDS['orjson'] = orjson.loads
+
+DEFAULT_BACKEND = 'orjson' if orjson else 'json'
+
+_WHITESPACE = re.compile(r'[ \t\n\r]*')
+_DELIMITERS = frozenset(' \t\n\r,:]}')
+
+
+def get_loads(backend=None):
+    """Return the function decoding JSON bytes with the given backend.
+
+    :param backend: name of the backend, one of BACKENDS, or a callable
+        taking bytes and returning the decoded object. Defaults to the
+        fastest installed backend.
+    :raises ValueError: if the backend is not known or not installed.
+    """
+    if callable(backend):
+        return backend
+    backend = backend or DEFAULT_BACKEND
+    try:
+        return BACKENDS[backend]
+    except KeyError:
+        raise ValueError(
+            f"Unknown JSON backend '{backend}', expected one of: "
+            f"{', '.join(sorted(BACKENDS))}"
+        )
+
+
+class _StreamReader:
+    """Decode JSON values one at a time from an iterable of bytes chunks."""
+
+    # NOTE: the stdlib decoder is the only one able to decode a value from
+    # the middle of a buffer, so it is used regardless of the backend.
+    _decoder = json.JSONDecoder()
+
+    def __init__(self, chunks):
+        self._chunks = iter(chunks)
+        self._text_decoder = codecs.getincrementaldecoder('utf-8')()
+        self._buffer = ''
+        self._pos = 0
+        self._eof = False
+
+    def _fill(self):
+        """Read the next chunk into the buffer, return False at EOF."""
+        if self._eof:
+            return False
+        # Drop what was already consumed so the buffer only ever holds the
+        # value being decoded plus the last chunk read.
+        self._buffer = self._buffer[self._pos :]
+        self._pos = 0
+        for chunk in self._chunks:
+            text = self._text_decoder.decode(chunk)
+            if text:
+                self._buffer += text
+                return True
+        self._buffer += self._text_decoder.decode(b'', final=True)
+        self._eof = True
+        return False
+
+    def peek(self):
+        """Return the next non whitespace character, or '' at EOF."""
+        while True:
+            self._pos = _WHITESPACE.match(self._buffer, self._pos).end()
+            if self._pos < len(self._buffer):
+                return self._buffer[self._pos]
+            if not self._fill():
+                return ''
+
+    def take(self, expected):
+        """Consume the next character, which must be one of expected."""
+        char = self.peek()
+        if not char or char not in expected:
+            raise ValueError(
+                f"Expected one of {expected!r} at position {self._pos}, "
+                f"got {char!r}"
+            )
+        self._pos += 1
+        return char
+
+    def value(self):
+        """Consume and return the next JSON value."""
+        self.peek()
+        while True:
+            try:
+                value, end = self._decoder.raw_decode(self._buffer, self._pos)
+            except ValueError:
+                if not self._fill():
+                    raise
+                continue
+            # A value which isn't followed by a delimiter, like a number
+            # split across chunks, may continue in the next chunk.
+            if (
+                end == len(self._buffer)
+                or self._buffer[end] not in _DELIMITERS
+            ) and self._fill():
+                continue
+            self._pos = end
+            return value
+
+
+def iter_array(chunks, key):
+    """Incrementally decode the array stored under key in a JSON object.
+
+    Only the item being decoded and the chunk being read are held in
+    memory, so the whole collection is never materialized.
+
+    :param chunks: iterable of bytes holding a UTF-8 encoded JSON object,
+        e.g. ``resp.iter_content(chunk_size)``.
+    :param key: the member of the object holding the array,
+        e.g. ``'shares'``.
+    :raises KeyError: if the object has no such array.
+    :raises ValueError: if the document is not valid JSON.
+    """
+    reader = _StreamReader(chunks)
+    found = False
+    reader.take('{')
+    if reader.peek() == '}':
+        raise KeyError(key)
+    while True:
+        name = reader.value()
+        reader.take(':')
+        if name == key and reader.peek() == '[':
+            found = True
+            reader.take('[')
+            if reader.peek() == ']':
+                reader.take(']')
+            else:
+                while True:
+                    yield reader.value()
+                    if reader.take(',]') == ']':
+                        break
+        else:
+            # Other members, such as the pagination links, are skipped.
+            reader.value()
+        if reader.take(',}') == '}':
+            break
+    if not found:
+        raise KeyError(key)
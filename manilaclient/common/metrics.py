@@ -0,0 +1,344 @@
+# Licensed under the Apache License, Version 2.0 (the "License"); you may
+# not use this file except in compliance with the License. You may obtain
+# a copy of the License at
+#
+# http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+# WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+# License for the specific language governing permissions and limitations
+# under the License.
+
+"""Instrumentation of the API requests made by a client.
+
+Instruments are notified of every attempt of a request, its outcome and
+its retries. They are registered on the HTTP client of a Manila client::
+
+    >>> from manilaclient.common import metrics
+    >>> request_metrics = metrics.InMemoryMetrics()
+    >>> manila = client.Client(VERSION, session=sess,
+    ...                        instruments=[request_metrics])
+
+Requests are identified by their method and the template of their path,
+such as ``/shares/{id}/action``, so the number of series stays bounded
+whatever the number of resources.
+"""
+
+import collections
+import os
+import tempfile
+import threading
+
+DEFAULT_BUCKETS = (
+    0.005,
+    0.01,
+    0.025,
+    0.05,
+    0.1,
+    0.25,
+    0.5,
+    1,
+    2.5,
+    5,
+    10,
+)
+
+# Segments found where the ID of an item of a collection is expected,
+# which are not IDs, e.g. '/shares/detail' or '/scheduler-stats/pools'.
+_COLLECTION_PATHS = frozenset(
+    (
+        'detail',
+        'manage',
+        'default',
+        'pools',
+        'enable',
+        'disable',
+        'ensure-shares',
+    )
+)
+# Collections whose items are addressed by keys chosen by users.
+_KEYED_COLLECTIONS = frozenset(
+    ('metadata', 'extra_specs', 'group_specs', 'group-specs', 'specs')
+)
+
+
+def get_path_template(path):
+    """Return the template of an API path, e.g. '/shares/{id}/action'.
+
+    API paths alternate collections and items: '/shares/{id}/action'.
+    Collection names and actions are kept. The segments where an item is
+    expected are replaced with '{id}', or with '{key}' for the keys of
+    metadata and specs, whatever their value. The names of resources,
+    such as '/shares/my-share' looked up by name, thus don't make the
+    number of templates grow.
+
+    :param path: the path of a request, relative to the API endpoint and
+        without its query string.
+    """
+    segments = []
+    collection = None
+    for segment in path.split('/'):
+        if not segment:
+            segments.append(segment)
+            continue
+        if collection is None or segment in _COLLECTION_PATHS:
+            collection = segment
+        else:
+            if collection in _KEYED_COLLECTIONS:
+                segment = '{key}'
+            else:
+                segment = '{id}'
+            collection = None
+        segments.append(segment)
+    return '/'.join(segments)
+
+
+class RequestInfo:
+    """Attempt of an API request, as seen by the instruments.
+
+    :ivar method: HTTP method of the request.
+    :ivar path: template of the path of the request.
+    :ivar attempt: number of the attempt, starting at 1.
+    :ivar elapsed: duration of the attempt in seconds, once it completed.
+    :ivar status: HTTP status of the response, or None if none was
+        received.
+    :ivar bytes_out: size of the request body.
+    :ivar bytes_in: size of the response body, None if it is unknown such
+        as for streamed responses without a Content-Length.
+    :ivar error: exception raised by the attempt, if it failed.
+    """
+
+    def __init__(self, method, path):
+        self.method = method
+        self.path = path
+        self.attempt = 0
+        self.elapsed = None
+        self.status = None
+        self.bytes_out = 0
+        self.bytes_in = None
+        self.error = None
+
+    def __repr__(self):
+        return (
+            f"<RequestInfo {self.method} {self.path} "
+            f"attempt={self.attempt} status={self.status}>"
+        )
+
+
+class RequestInstrument:
+    """Base class of the instruments of the requests of a client.
+
+    Subclasses override the callbacks they are interested in. Callbacks are
+    run synchronously by the thread making the request, so they should be
+    quick. Errors they raise are logged and ignored.
+    """
+
+    def on_request_start(self, request):
+        """Called before every attempt of a request.
+
+        :param request: :class:`RequestInfo` of the attempt.
+        """
+
+    def on_response(self, request):
+        """Called when an attempt completed, successfully or not."""
+
+    def on_retry(self, request, delay):
+        """Called when a failed attempt is going to be retried.
+
+        :param delay: time to wait before the next attempt, in seconds.
+        """
+
+
+class Histogram:
+    """Distribution of observed values over a fixed set of buckets."""
+
+    def __init__(self, buckets=DEFAULT_BUCKETS):
+        self.buckets = tuple(sorted(buckets))
+        self.counts = [0] * len(self.buckets)
+        self.count = 0
+        self.sum = 0.0
+
+    def observe(self, value):
+        for index, bound in enumerate(self.buckets):
+            if value <= bound:
+                self.counts[index] += 1
+                break
+        self.count += 1
+        self.sum += value
+
+    def cumulative_counts(self):
+        """Return (upper bound, count of values up to it) pairs."""
+        total = 0
+        result = []
+        for bound, count in zip(self.buckets, self.counts):
+            total += count
+            result.append((bound, total))
+        result.append((float('inf'), self.count))
+        return result
+
+
+class InMemoryMetrics(RequestInstrument):
+    """Collect request metrics in memory, per method and path template.
+
+    Collects the latency of the attempts, the number of responses by
+    status, the number of retries and the bytes sent and received. May be
+    shared by many clients and threads.
+
+    :param buckets: upper bounds of the latency histogram buckets, in
+        seconds.
+    """
+
+    def __init__(self, buckets=DEFAULT_BUCKETS):
+        self._buckets = buckets
+        self._lock = threading.Lock()
+        self.latency = collections.defaultdict(self._new_histogram)
+        self.responses = collections.Counter()
+        self.retries = collections.Counter()
+        self.bytes_out = collections.Counter()
+        self.bytes_in = collections.Counter()
+
+    def _new_histogram(self):
+        return Histogram(self._buckets)
+
+    def on_response(self, request):
+        key = (request.method, request.path)
+        status = str(request.status) if request.status else 'error'
+        with self._lock:
+            self.latency[key].observe(request.elapsed)
+            self.responses[key + (status,)] += 1
+            self.bytes_out[key] += request.bytes_out
+            if request.bytes_in:
+                self.bytes_in[key] += request.bytes_in
+
+    def on_retry(self, request, delay):
+        with self._lock:
+            self.retries[(request.method, request.path)] += 1
+
+    def reset(self):
+        with self._lock:
+            self.latency.clear()
+            self.responses.clear()
+            self.retries.clear()
+            self.bytes_out.clear()
+            self.bytes_in.clear()
+
+
+def _format_labels(**labels):
+    def escape(value):
+        return (
+            str(value)
+            .replace('\\', '\\\\')
+            .replace('"', '\\"')
+            .replace('\n', '\\n')
+        )
+
+    pairs = ','.join(
+        f'{name}="{escape(value)}"' for name, value in labels.items()
+    )
+    return '{' + pairs + '}'
+
+
+def _format_value(value):
+    if value == float('inf'):
+        return '+Inf'
+    return repr(float(value)) if isinstance(value, float) else str(value)
+
+
+class PrometheusTextfileExporter:
+    """Export :class:`InMemoryMetrics` in the Prometheus text format.
+
+    The file is meant to be collected by the textfile collector of the
+    Prometheus node exporter. It is replaced atomically on every write, so
+    the collector never reads a partially written file.
+
+    :param metrics: the :class:`InMemoryMetrics` to export.
+    :param path: the file to write, its name must end with '.prom'.
+    :param prefix: prefix of the names of the exported metrics.
+    """
+
+    def __init__(self, metrics, path, prefix='manilaclient'):
+        self.metrics = metrics
+        self.path = path
+        self.prefix = prefix
+
+    def render(self):
+        """Return the metrics in the Prometheus text exposition format."""
+        metrics = self.metrics
+        with metrics._lock:
+            latency = {
+                key: (histogram.cumulative_counts(), histogram.sum)
+                for key, histogram in metrics.latency.items()
+            }
+            responses = dict(metrics.responses)
+            retries = dict(metrics.retries)
+            bytes_out = dict(metrics.bytes_out)
+            bytes_in = dict(metrics.bytes_in)
+
+        lines = []
+
+        name = f'{self.prefix}_request_duration_seconds'
+        lines.append(f'# HELP {name} Duration of the API requests.')
+        lines.append(f'# TYPE {name} histogram')
+        for (method, path), (buckets, total) in sorted(latency.items()):
+            for bound, count in buckets:
+                labels = _format_labels(
+                    method=method, path=path, le=_format_value(bound)
+                )
+                lines.append(f'{name}_bucket{labels} {count}')
+            labels = _format_labels(method=method, path=path)
+            lines.append(f'{name}_sum{labels} {_format_value(total)}')
+            lines.append(f'{name}_count{labels} {buckets[-1][1]}')
+
+        counters = (
+            (
+                'responses_total',
+                'API responses, by HTTP status.',
+                responses,
+                ('method', 'path', 'status'),
+            ),
+            (
+                'retries_total',
+                'Retried API requests.',
+                retries,
+                ('method', 'path'),
+            ),
+            (
+                'request_bytes_total',
+                'Bytes sent in API request bodies.',
+                bytes_out,
+                ('method', 'path'),
+            ),
+            (
+                'response_bytes_total',
+                'Bytes received in API response bodies.',
+                bytes_in,
+                ('method', 'path'),
+            ),
+        )
+        for suffix, help_text, values, label_names in counters:
+            name = f'{self.prefix}_{suffix}'
+            lines.append(f'# HELP {name} {help_text}')
+            lines.append(f'# TYPE {name} counter')
+            for key, value in sorted(values.items()):
+                labels = _format_labels(**dict(zip(label_names, key)))
+                lines.append(f'{name}{labels} {value}')
+
+        return '\n'.join(lines) + '\n'
+
+    def write(self):
+        """Write the current metrics to the file."""
+        directory = os.path.dirname(os.path.abspath(self.path))
+        fd, tmp_path = tempfile.mkstemp(
+            dir=directory, prefix='.manilaclient-', suffix='.tmp'
+        )
+        try:
+            with os.fdopen(fd, 'w') as f:
+                f.write(self.render())
+            # NOTE: temporary files are only readable by their owner, the
+            # collector may run as another user.
+            os.chmod(tmp_path, 0o644)
+            os.replace(tmp_path, self.path)
+        except BaseException:
+            os.unlink(tmp_path)
+            raise
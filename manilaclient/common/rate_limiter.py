@@ -0,0 +1,169 @@
+# Licensed under the Apache License, Version 2.0 (the "License"); you may
+# not use this file except in compliance with the License. You may obtain
+# a copy of the License at
+#
+# http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+# WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+# License for the specific language governing permissions and limitations
+# under the License.
+
+"""Client side rate limiting of API requests.
+
+Pacing the requests on the client keeps bulk jobs at the highest
+throughput allowed by the server, without tripping its rate limits and
+having to back off and retry.
+"""
+
+import logging
+import re
+import threading
+import time
+
+LOG = logging.getLogger(__name__)
+
+UNITS = {
+    'SECOND': 1,
+    'MINUTE': 60,
+    'HOUR': 60 * 60,
+    'DAY': 60 * 60 * 24,
+}
+
+
+class TokenBucket:
+    """Thread safe token bucket.
+
+    Holds up to ``capacity`` tokens, refilled at ``rate`` tokens per
+    second. Each request takes a token. When none is left, the request
+    reserves the next one to be refilled, so concurrent callers are served
+    in turn without polling.
+    """
+
+    def __init__(self, rate, capacity, tokens=None):
+        if rate <= 0 or capacity < 1:
+            raise ValueError("rate and capacity must be positive.")
+        self.rate = float(rate)
+        self.capacity = float(capacity)
+        self._tokens = self.capacity if tokens is None else float(tokens)
+        self._updated_at = time.monotonic()
+        self._lock = threading.Lock()
+
+    def reserve(self):
+        """Take a token, return how long to wait before it can be used."""
+        with self._lock:
+            now = time.monotonic()
+            self._tokens = min(
+                self.capacity,
+                self._tokens + (now - self._updated_at) * self.rate,
+            )
+            self._updated_at = now
+            self._tokens -= 1
+            if self._tokens >= 0:
+                return 0
+            return -self._tokens / self.rate
+
+    def acquire(self):
+        """Take a token, sleeping until it is available."""
+        delay = self.reserve()
+        if delay:
+            time.sleep(delay)
+        return delay
+
+
+class RateLimit:
+    """A limit of the requests matching a method and a path regex."""
+
+    def __init__(self, verb, regex, value, unit='MINUTE', remaining=None):
+        try:
+            period = UNITS[unit.upper()]
+        except KeyError:
+            raise ValueError(
+                f"Unknown rate limit unit '{unit}', expected one of: "
+                f"{', '.join(UNITS)}"
+            )
+        self.verb = verb.upper()
+        self.regex = re.compile(regex)
+        self.bucket = TokenBucket(
+            rate=value / period,
+            capacity=value,
+            tokens=None if remaining is None else min(remaining, value),
+        )
+
+    def matches(self, method, path):
+        return self.verb in ('*', method.upper()) and bool(
+            self.regex.match(path)
+        )
+
+
+class RateLimiter:
+    """Pace API requests to stay within a set of rate limits.
+
+    A single limiter may be shared by threads using the same client, the
+    requests of all of them are then paced together.
+
+    :param limits: iterable of :class:`RateLimit`.
+    """
+
+    def __init__(self, limits=()):
+        self.limits = list(limits)
+
+    @classmethod
+    def from_rate_limits(cls, rate_limits):
+        """Build a limiter from the rate limits advertised by the server.
+
+        Limits which don't allow any request can't be paced and are
+        skipped, the server rejects the requests they match anyway.
+
+        :param rate_limits: iterable of
+            :class:`manilaclient.v2.limits.RateLimit`, as returned by
+            ``client.limits.get().rate``.
+        """
+        limits = []
+        for rate_limit in rate_limits:
+            if rate_limit.value <= 0:
+                LOG.warning(
+                    "Ignoring the rate limit of %(verb)s %(regex)s "
+                    "requests, which allows none of them.",
+                    {'verb': rate_limit.verb, 'regex': rate_limit.regex},
+                )
+                continue
+            limits.append(
+                RateLimit(
+                    rate_limit.verb,
+                    rate_limit.regex,
+                    rate_limit.value,
+                    unit=rate_limit.unit,
+                    remaining=rate_limit.remaining,
+                )
+            )
+        return cls(limits)
+
+    def add_limit(self, verb, regex, value, unit='MINUTE'):
+        """Limit the requests with the given method and matching path.
+
+        :param verb: HTTP method of the requests to limit, or '*' for all.
+        :param regex: regular expression matched against the path of the
+            requests, relative to the API endpoint, e.g. '^/shares'.
+        :param value: number of requests allowed per unit of time.
+        :param unit: one of SECOND, MINUTE, HOUR or DAY.
+        """
+        self.limits.append(RateLimit(verb, regex, value, unit=unit))
+
+    def acquire(self, method, path):
+        """Wait until a request is allowed by all the matching limits.
+
+        :returns: the time waited, in seconds.
+        """
+        waited = 0
+        for limit in self.limits:
+            if limit.matches(method, path):
+                waited += limit.bucket.acquire()
+        if waited:
+            LOG.debug(
+                "Delayed %(method)s %(path)s by %(waited).2f seconds to "
+                "stay within the rate limits",
+                {'method': method, 'path': path, 'waited': waited},
+            )
+        return waited
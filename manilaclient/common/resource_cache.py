@@ -0,0 +1,85 @@
+# Licensed under the Apache License, Version 2.0 (the "License"); you may
+# not use this file except in compliance with the License. You may obtain
+# a copy of the License at
+#
+# http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+# WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+# License for the specific language governing permissions and limitations
+# under the License.
+
+"""In-process cache for API responses read by the managers."""
+
+import collections
+import contextlib
+import contextvars
+import copy
+import threading
+import time
+
+DEFAULT_TTL = 60
+DEFAULT_MAXSIZE = 256
+
+_bypass = contextvars.ContextVar('manilaclient_resource_cache_bypass')
+
+
+@contextlib.contextmanager
+def bypass():
+    """Make the reads done within the context skip the resource cache.
+
+    Used when polling for state changes, where a cached response would
+    hide the transition being waited for.
+    """
+    token = _bypass.set(True)
+    try:
+        yield
+    finally:
+        _bypass.reset(token)
+
+
+class ResourceCache:
+    """Thread safe LRU cache whose entries expire after a TTL.
+
+    Values are deep copied on the way in and out, so callers are free to
+    modify the bodies they get without affecting other readers.
+    """
+
+    def __init__(self, ttl=DEFAULT_TTL, maxsize=DEFAULT_MAXSIZE):
+        self.ttl = ttl
+        self.maxsize = maxsize
+        self._data = collections.OrderedDict()
+        self._lock = threading.Lock()
+
+    @property
+    def active(self):
+        return not _bypass.get(False)
+
+    def get(self, key):
+        """Return the cached value for key, or None."""
+        with self._lock:
+            entry = self._data.get(key)
+            if entry is None:
+                return None
+            expires_at, value = entry
+            if expires_at <= time.monotonic():
+                del self._data[key]
+                return None
+            self._data.move_to_end(key)
+        return copy.deepcopy(value)
+
+    def set(self, key, value):
+        value = copy.deepcopy(value)
+        with self._lock:
+            self._data[key] = (time.monotonic() + self.ttl, value)
+            self._data.move_to_end(key)
+            while len(self._data) > self.maxsize:
+                self._data.popitem(last=False)
+
+    def clear(self):
+        with self._lock:
+            self._data.clear()
+
+    def __len__(self):
+        return len(self._data)
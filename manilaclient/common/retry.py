@@ -0,0 +1,177 @@
+# Licensed under the Apache License, Version 2.0 (the "License"); you may
+# not use this file except in compliance with the License. You may obtain
+# a copy of the License at
+#
+# http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+# WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+# License for the specific language governing permissions and limitations
+# under the License.
+
+"""Policy deciding whether and when failed API requests are retried."""
+
+import logging
+import random
+import threading
+
+from keystoneauth1 import exceptions as ks_exceptions
+import requests
+
+from manilaclient import exceptions
+
+LOG = logging.getLogger(__name__)
+
+DEFAULT_BASE_DELAY = 1
+DEFAULT_MAX_DELAY = 30
+DEFAULT_BUDGET_RATIO = 0.2
+DEFAULT_BUDGET_RESERVE = 10
+
+IDEMPOTENT_METHODS = frozenset(('GET', 'HEAD', 'OPTIONS', 'PUT', 'DELETE'))
+# Statuses of transient server side failures, the request may have been
+# processed so only idempotent requests are retried.
+RETRY_STATUSES = frozenset((408, 500, 502, 504))
+# Statuses of requests turned down by the server without processing them,
+# which are safe to retry whatever the method.
+REJECTED_STATUSES = frozenset((429, 503))
+# Transport errors which may not happen again. Other errors, such as
+# invalid URLs or headers, are bound to happen again on every attempt.
+TRANSIENT_ERRORS = (
+    requests.exceptions.ConnectionError,
+    requests.exceptions.Timeout,
+    requests.exceptions.ChunkedEncodingError,
+    ks_exceptions.ConnectionError,
+)
+# TLS failures are reported as connection errors but don't fix themselves.
+PERMANENT_ERRORS = (
+    requests.exceptions.SSLError,
+    ks_exceptions.SSLError,
+)
+
+
+class RetryBudget:
+    """Limit the retries to a share of the requests sent.
+
+    Every request adds ``ratio`` to the budget, up to ``reserve``, and every
+    retry takes one from it. During an outage, a client thus stops retrying
+    once its reserve is spent instead of multiplying the load on the API.
+    """
+
+    def __init__(
+        self, ratio=DEFAULT_BUDGET_RATIO, reserve=DEFAULT_BUDGET_RESERVE
+    ):
+        self.ratio = ratio
+        self.reserve = reserve
+        self._balance = float(reserve)
+        self._lock = threading.Lock()
+
+    def deposit(self):
+        with self._lock:
+            self._balance = min(self._balance + self.ratio, self.reserve)
+
+    def withdraw(self):
+        """Take a retry from the budget, return False if it is spent."""
+        with self._lock:
+            if self._balance < 1:
+                return False
+            self._balance -= 1
+            return True
+
+
+class RetryPolicy:
+    """Decide whether and when failed API requests are retried.
+
+    Only transient failures are retried: connection errors, timeouts,
+    server errors and requests rejected because of rate limiting. Requests
+    which may have been processed by the server are only retried if their
+    method is idempotent. Retries are delayed with exponential backoff and
+    full jitter, unless the server asked for a delay with Retry-After.
+
+    :param retries: maximum number of retries of a request.
+    :param base_delay: delay before the first retry, doubled for each
+        following one, in seconds. The actual delay is picked at random up
+        to that value.
+    :param max_delay: upper bound of the delay between attempts. Requests
+        for which the server asks to wait longer are not retried.
+    :param retry_non_idempotent: also retry non idempotent requests, such
+        as POST actions, when they may have been processed.
+    :param budget: :class:`RetryBudget` shared by the requests of the
+        client, a new one is created by default. Pass False to disable it.
+    """
+
+    def __init__(
+        self,
+        retries=0,
+        base_delay=DEFAULT_BASE_DELAY,
+        max_delay=DEFAULT_MAX_DELAY,
+        retry_non_idempotent=False,
+        budget=None,
+    ):
+        self.retries = int(retries or 0)
+        self.base_delay = base_delay
+        self.max_delay = max_delay
+        self.retry_non_idempotent = retry_non_idempotent
+        if budget is None:
+            budget = RetryBudget()
+        self.budget = budget or None
+
+    def record_request(self):
+        """Account for a new request, before its first attempt."""
+        if self.budget is not None:
+            self.budget.deposit()
+
+    def is_retryable(self, method, error):
+        """Whether the failure of a request is worth retrying."""
+        if isinstance(error, requests.exceptions.ConnectTimeout):
+            # The connection was never established.
+            return True
+        status = getattr(error, 'http_status', None)
+        if status in REJECTED_STATUSES:
+            return True
+        if isinstance(error, exceptions.RequestEntityTooLarge):
+            # Rate limited requests have a Retry-After header, unlike the
+            # requests exceeding a quota.
+            return error.retry_after > 0
+        if not (
+            self.retry_non_idempotent or method.upper() in IDEMPOTENT_METHODS
+        ):
+            return False
+        # NOTE: keystoneauth reports read timeouts as connect timeouts, so
+        # its connection errors may come from processed requests.
+        if isinstance(error, PERMANENT_ERRORS):
+            return False
+        if isinstance(error, TRANSIENT_ERRORS):
+            return True
+        return status in RETRY_STATUSES
+
+    def get_delay(self, method, attempts, error):
+        """Return how long to wait before retrying a failed request.
+
+        :param method: HTTP method of the request.
+        :param attempts: number of attempts made so far.
+        :param error: exception raised by the last attempt.
+        :returns: the delay in seconds, or None if the request must not be
+            retried.
+        """
+        if attempts > self.retries or not self.is_retryable(method, error):
+            return None
+
+        retry_after = getattr(error, 'retry_after', 0)
+        if retry_after > self.max_delay:
+            LOG.debug(
+                "Not retrying, the server asked to wait %s seconds",
+                retry_after,
+            )
+            return None
+
+        if self.budget is not None and not self.budget.withdraw():
+            LOG.debug("Not retrying, the retry budget is exhausted")
+            return None
+
+        if retry_after:
+            return retry_after
+        # NOTE: full jitter spreads the retries of many clients failing at
+        # once, rather than having them hit the API again in lockstep.
+        backoff = min(self.max_delay, self.base_delay * 2 ** (attempts - 1))
+        return random.uniform(0, backoff)  # noqa: S311
@@ -0,0 +1,185 @@
+# Licensed under the Apache License, Version 2.0 (the "License"); you may
+# not use this file except in compliance with the License. You may obtain
+# a copy of the License at
+#
+# http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+# WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+# License for the specific language governing permissions and limitations
+# under the License.
+
+"""Wait for many resources to reach a state with shared polling.
+
+Waiting on resources one at a time costs a full polling loop per resource.
+The helpers in this module track a batch of resource IDs at once: every
+polling interval issues a single (optionally filtered) list call and only
+falls back to fetching the resources missing from that listing one by one.
+"""
+
+import logging
+import random
+import time
+
+from manilaclient.common.apiclient import exceptions
+from manilaclient.common import resource_cache
+
+LOG = logging.getLogger(__name__)
+
+DEFAULT_SLEEP_TIME = 2
+DEFAULT_MAX_SLEEP_TIME = 30
+DEFAULT_TIMEOUT = 300
+DEFAULT_ERROR_STATUS = ('error', 'error_deleting', 'unmanage_error')
+
+
+def _poll(manager, res_ids, search_opts):
+    """Fetch the current state of the given resources.
+
+    :returns: dict mapping every ID in res_ids to its resource, or to None
+        if the resource no longer exists.
+    """
+    found = {}
+    if search_opts is not None:
+        wanted = set(res_ids)
+        for resource in manager.list(search_opts=search_opts):
+            if resource.id in wanted:
+                found[resource.id] = resource
+    # NOTE: resources missing from the listing were either deleted or no
+    # longer match the filters, so they are looked up individually.
+    for res_id in res_ids:
+        if res_id in found:
+            continue
+        try:
+            found[res_id] = manager.get(res_id)
+        except exceptions.NotFound:
+            found[res_id] = None
+    return found
+
+
+def _wait(
+    manager,
+    res_ids,
+    check,
+    search_opts,
+    sleep_time,
+    max_sleep_time,
+    timeout,
+):
+    res_ids = list(res_ids)
+    results = {}
+    pending = list(dict.fromkeys(res_ids))
+    deadline = time.monotonic() + timeout
+    delay = sleep_time
+
+    while pending:
+        with resource_cache.bypass():
+            polled = _poll(manager, pending, search_opts)
+        for res_id, resource in polled.items():
+            outcome = check(resource)
+            if outcome is not None:
+                results[res_id] = outcome
+        pending = [res_id for res_id in pending if res_id not in results]
+
+        remaining = deadline - time.monotonic()
+        if not pending or remaining <= 0:
+            break
+        # Jitter the delay so that concurrent waiters don't poll the API in
+        # lockstep, and back off while resources are still transitioning.
+        jitter = random.uniform(0.5, 1)  # noqa: S311
+        time.sleep(min(remaining, delay * jitter))
+        delay = min(delay * 1.5, max_sleep_time)
+
+    if pending:
+        LOG.debug("Timed out waiting for resources %s", ', '.join(pending))
+    return {res_id: results.get(res_id, False) for res_id in res_ids}
+
+
+def wait_for_delete(
+    manager,
+    res_ids,
+    search_opts=None,
+    status_field='status',
+    error_status=DEFAULT_ERROR_STATUS,
+    sleep_time=DEFAULT_SLEEP_TIME,
+    max_sleep_time=DEFAULT_MAX_SLEEP_TIME,
+    timeout=DEFAULT_TIMEOUT,
+):
+    """Wait for many resources to be deleted.
+
+    :param manager: the manager of the resources, e.g. ``client.shares``.
+    :param res_ids: IDs of the resources to wait for.
+    :param search_opts: filters for the list call issued every polling
+        interval, e.g. ``{'status': 'deleting'}``. If None, no list call is
+        made and each resource is fetched individually.
+    :param status_field: the resource attribute holding its status.
+    :param error_status: statuses meaning that the deletion failed.
+    :param sleep_time: initial delay between polls, in seconds.
+    :param max_sleep_time: upper bound for the delay between polls.
+    :param timeout: total time to wait, in seconds.
+    :returns: dict mapping each ID to True if the resource was deleted and
+        False if it ended up in an error state or the wait timed out.
+    """
+    error_status = {status.lower() for status in error_status}
+
+    def check(resource):
+        if resource is None:
+            return True
+        status = getattr(resource, status_field, '') or ''
+        if status.lower() in error_status:
+            return False
+        return None
+
+    return _wait(
+        manager,
+        res_ids,
+        check,
+        search_opts,
+        sleep_time,
+        max_sleep_time,
+        timeout,
+    )
+
+
+def wait_for_status(
+    manager,
+    res_ids,
+    success_status=('available',),
+    error_status=DEFAULT_ERROR_STATUS,
+    search_opts=None,
+    status_field='status',
+    sleep_time=DEFAULT_SLEEP_TIME,
+    max_sleep_time=DEFAULT_MAX_SLEEP_TIME,
+    timeout=DEFAULT_TIMEOUT,
+):
+    """Wait for many resources to reach one of the given statuses.
+
+    Takes the same arguments as :func:`wait_for_delete`, plus
+    success_status, the statuses that end the wait successfully.
+
+    :returns: dict mapping each ID to True if the resource reached a
+        success status and False if it reached an error status, vanished
+        or the wait timed out.
+    """
+    success_status = {status.lower() for status in success_status}
+    error_status = {status.lower() for status in error_status}
+
+    def check(resource):
+        if resource is None:
+            return False
+        status = (getattr(resource, status_field, '') or '').lower()
+        if status in success_status:
+            return True
+        if status in error_status:
+            return False
+        return None
+
+    return _wait(
+        manager,
+        res_ids,
+        check,
+        search_opts,
+        sleep_time,
+        max_sleep_time,
+        timeout,
+    )
@@ -16,12 +16,18 @@
 """OpenStackClient plugin for the Shared File System Service."""
 
 import logging
+import os
+import tempfile
+import time
 
+from oslo_serialization import jsonutils
 from osc_lib import utils
 
 from manilaclient import api_versions
 from manilaclient import client
 from manilaclient.common import constants
+from manilaclient.common import resource_cache
+from manilaclient.common import retry
 from manilaclient import exceptions
 
 LOG = logging.getLogger(__name__)
@@ -36,6 +42,9 @@ API_VERSIONS = {
     f'2.{i}': CLIENT_CLASS for i in range(0, int(LATEST_MINOR_VERSION) + 1)
 }
 
+DEFAULT_VERSION_CACHE_TTL = 3600
+VERSION_CACHE_FILENAME = 'api-versions-cache.json'
+
 
 def _get_manila_url_from_service_catalog(instance):
     service_type = constants.SFS_SERVICE_TYPE
@@ -60,6 +69,94 @@ def _get_manila_url_from_service_catalog(instance):
     return service_type, url
 
 
+def _get_version_cache_path():
+    base_dir = utils.env(
+        'MANILACLIENT_CACHE_DIR', default='~/.cache/manilaclient'
+    )
+    return os.path.join(os.path.expanduser(base_dir), VERSION_CACHE_FILENAME)
+
+
+def _read_version_cache():
+    try:
+        with open(_get_version_cache_path()) as cache_file:
+            cache = jsonutils.loads(cache_file.read())
+    except (OSError, ValueError):
+        return {}
+    return cache if isinstance(cache, dict) else {}
+
+
+def _get_cached_server_version_range(endpoint_url, ttl):
+    """Return the (min, max) version range cached for an endpoint.
+
+    Returns None if nothing is cached for the endpoint or if the cached
+    entry is older than 'ttl' seconds.
+    """
+    entry = _read_version_cache().get(endpoint_url)
+    try:
+        if time.time() - entry['timestamp'] > ttl:
+            return None
+        return (
+            api_versions.APIVersion(entry['min_version']),
+            api_versions.APIVersion(entry['max_version']),
+        )
+    except (TypeError, KeyError, exceptions.UnsupportedVersion):
+        return None
+
+
+def _cache_server_version_range(endpoint_url, version_range):
+    """Store the version range discovered for an endpoint on disk.
+
+    The cache file is replaced atomically. Failures to write it are only
+    logged, since the cache is an optimization.
+    """
+    min_version, max_version = version_range
+    if min_version.is_null() or max_version.is_null():
+        return
+
+    cache = _read_version_cache()
+    cache[endpoint_url] = {
+        'min_version': min_version.get_string(),
+        'max_version': max_version.get_string(),
+        'timestamp': time.time(),
+    }
+    cache_path = _get_version_cache_path()
+    try:
+        os.makedirs(os.path.dirname(cache_path), 0o755, exist_ok=True)
+        fd, tmp_path = tempfile.mkstemp(dir=os.path.dirname(cache_path))
+        with os.fdopen(fd, 'w') as tmp_file:
+            tmp_file.write(jsonutils.dumps(cache))
+        os.replace(tmp_path, cache_path)
+    except OSError as e:
+        LOG.debug('Unable to write API version cache: %s', e)
+
+
+def _get_server_version_range(instance, endpoint_url, client_args):
+    ttl = getattr(
+        instance._cli_options,
+        'os_share_api_version_cache_ttl',
+        DEFAULT_VERSION_CACHE_TTL,
+    )
+    refresh = getattr(
+        instance._cli_options, 'os_share_api_version_refresh', False
+    )
+    ttl = int(ttl or 0)
+
+    if ttl > 0 and not refresh:
+        version_range = _get_cached_server_version_range(endpoint_url, ttl)
+        if version_range:
+            LOG.debug('Using cached API version range for %s', endpoint_url)
+            return version_range
+
+    max_version = api_versions.APIVersion(api_versions.MAX_VERSION)
+    temp_client = client.Client(
+        max_version, **dict(client_args, api_version=max_version)
+    )
+    version_range = api_versions.get_server_version_range(temp_client)
+    if ttl > 0:
+        _cache_server_version_range(endpoint_url, version_range)
+    return version_range
+
+
 def make_client(instance):
     """Returns a shared file system service client."""
     requested_api_version = instance._api_version[API_NAME]
@@ -78,6 +175,17 @@ def make_client(instance):
     instance.setup_auth()
     debugging_enabled = instance._cli_options.debug
 
+    retry_policy = retry.RetryPolicy(
+        retries=getattr(instance._cli_options, 'os_share_retries', 0),
+        max_delay=float(
+            getattr(
+                instance._cli_options,
+                'os_share_retry_max_delay',
+                retry.DEFAULT_MAX_DELAY,
+            )
+        ),
+    )
+
     client_args = dict(
         session=instance.session,
         service_catalog_url=manila_endpoint_url,
@@ -89,6 +197,7 @@ def make_client(instance):
         cacert=instance.cacert,
         cert=instance.cert,
         insecure=not instance.verify,
+        retry_policy=retry_policy,
     )
 
     # Cast the API version into an object for further processing
@@ -96,11 +205,11 @@ def make_client(instance):
         version_str=requested_api_version
     )
 
-    max_version = api_versions.APIVersion(api_versions.MAX_VERSION)
-    client_args.update(dict(api_version=max_version))
-    temp_client = client.Client(max_version, **client_args)
+    server_version_range = _get_server_version_range(
+        instance, manila_endpoint_url, client_args
+    )
     discovered_version = api_versions.discover_version(
-        temp_client, requested_api_version
+        None, requested_api_version, server_version_range=server_version_range
     )
 
     shared_file_system_client = utils.get_client_class(
@@ -113,7 +222,17 @@ def make_client(instance):
     )
     LOG.debug('Shared File System API version: %s', discovered_version)
 
-    client_args.update(dict(api_version=discovered_version))
+    client_args.update(
+        dict(
+            api_version=discovered_version,
+            resource_cache_ttl=int(
+                getattr(
+                    instance._cli_options, 'os_share_resource_cache_ttl', 0
+                )
+                or 0
+            ),
+        )
+    )
     return shared_file_system_client(**client_args)
 
 
@@ -146,4 +265,66 @@ def build_option_parser(parser):
             "Defaults to env[OS_SHARED_FILE_SYSTEM_ENDPOINT_OVERRIDE]."
         ),
     )
+    parser.add_argument(
+        '--os-share-api-version-cache-ttl',
+        metavar='<seconds>',
+        type=int,
+        default=utils.env(
+            'OS_SHARE_API_VERSION_CACHE_TTL',
+            default=DEFAULT_VERSION_CACHE_TTL,
+        ),
+        help=(
+            'Number of seconds the API version range discovered from the '
+            'Shared File System service is cached on disk, 0 disables the '
+            f'cache. Default={DEFAULT_VERSION_CACHE_TTL} '
+            '(Env: OS_SHARE_API_VERSION_CACHE_TTL)'
+        ),
+    )
+    parser.add_argument(
+        '--os-share-retries',
+        metavar='<count>',
+        type=int,
+        default=utils.env('OS_SHARE_RETRIES', default=0),
+        help=(
+            'Number of times requests failing because of transient errors '
+            'are retried. Only idempotent requests are retried if they may '
+            'have been processed by the server. Default=0 '
+            '(Env: OS_SHARE_RETRIES)'
+        ),
+    )
+    parser.add_argument(
+        '--os-share-retry-max-delay',
+        metavar='<seconds>',
+        type=float,
+        default=utils.env(
+            'OS_SHARE_RETRY_MAX_DELAY', default=retry.DEFAULT_MAX_DELAY
+        ),
+        help=(
+            'Maximum number of seconds to wait before retrying a request. '
+            f'Default={retry.DEFAULT_MAX_DELAY} '
+            '(Env: OS_SHARE_RETRY_MAX_DELAY)'
+        ),
+    )
+    parser.add_argument(
+        '--os-share-resource-cache-ttl',
+        metavar='<seconds>',
+        type=int,
+        default=utils.env('OS_SHARE_RESOURCE_CACHE_TTL', default=0),
+        help=(
+            'Number of seconds the responses about share types, share group '
+            'types and availability zones are kept in memory, to be reused '
+            'when they are requested again, e.g. in interactive mode. '
+            f'{resource_cache.DEFAULT_TTL} is a sensible value, 0 disables '
+            'the cache. Default=0 (Env: OS_SHARE_RESOURCE_CACHE_TTL)'
+        ),
+    )
+    parser.add_argument(
+        '--os-share-api-version-refresh',
+        action='store_true',
+        default=False,
+        help=(
+            'Ignore the cached API version range and discover it again '
+            'from the Shared File System service.'
+        ),
+    )
     return parser
@@ -12,9 +12,12 @@
 #   License for the specific language governing permissions and limitations
 #   under the License.
 
+from concurrent import futures
+import contextvars
 import logging
 
 from oslo_utils import strutils
+from oslo_utils import uuidutils
 
 from manilaclient.common._i18n import _
 from manilaclient.common import constants
@@ -22,6 +25,8 @@ from manilaclient import exceptions
 
 LOG = logging.getLogger(__name__)
 
+DEFAULT_PARALLEL = 1
+
 
 def extract_key_value_options(pairs):
     result_dict = {}
@@ -127,3 +132,167 @@ def format_share_group_type(share_group_type, formatter='table'):
         )
 
     return printable_share_group_type
+
+
+def add_parallel_option(parser, resource):
+    parser.add_argument(
+        "--parallel",
+        metavar="<N>",
+        type=int,
+        default=DEFAULT_PARALLEL,
+        help=_(
+            "Number of %(resource)s to process concurrently. "
+            "(Default=%(default)s)"
+        )
+        % {'resource': resource, 'default': DEFAULT_PARALLEL},
+    )
+
+
+def add_bulk_unset_option(parser):
+    parser.add_argument(
+        "--bulk",
+        action='store_true',
+        default=False,
+        help=_(
+            "Unset the properties with a single update of all the "
+            "properties, instead of one request per property. Properties "
+            "changed by others between the read and the update are "
+            "overwritten. (Default=False)"
+        ),
+    )
+
+
+def _in_context(func):
+    """Wrap func to run it in a copy of the context of the caller.
+
+    Context variables, such as the headers set with
+    ``httpclient.request_headers``, are not propagated to the threads of an
+    executor otherwise. Every call gets its own copy, since a context can't
+    be entered by several threads at once.
+    """
+    context = contextvars.copy_context()
+
+    def _run(*args, **kwargs):
+        return context.copy().run(func, *args, **kwargs)
+
+    return _run
+
+
+def run_in_parallel(func, items, parallel=DEFAULT_PARALLEL):
+    """Call func on each item, with up to `parallel` calls in flight.
+
+    :returns: list with the results of func, in the same order as items.
+    """
+    items = list(items)
+    if parallel < 1:
+        raise exceptions.CommandError(
+            _("The number of parallel operations must be at least 1.")
+        )
+    if parallel == 1 or len(items) < 2:
+        return [func(item) for item in items]
+    with futures.ThreadPoolExecutor(
+        max_workers=min(parallel, len(items))
+    ) as executor:
+        return list(executor.map(_in_context(func), items))
+
+
+# NOTE: threads are only started when calls are submitted, and are reused
+# by the following fetches instead of starting a pool per command.
+_FETCH_EXECUTOR = futures.ThreadPoolExecutor(
+    max_workers=4, thread_name_prefix='manilaclient-fetch'
+)
+
+
+def fetch_concurrently(*calls):
+    """Make independent API calls concurrently.
+
+    :param calls: callables taking no argument.
+    :returns: list with the results of the calls, in the same order.
+    :raises: once all the calls completed, the exception raised by the
+        first failed call.
+    """
+    if len(calls) < 2:
+        return [call() for call in calls]
+    # The first call is made by the caller, the others by the threads of
+    # the executor shared by all the fetches.
+    pending = [_FETCH_EXECUTOR.submit(_in_context(call)) for call in calls[1:]]
+    try:
+        first = calls[0]()
+    finally:
+        futures.wait(pending)
+    return [first] + [future.result() for future in pending]
+
+
+def find_resource_and_fetch(find_resource, manager, name_or_id, *fetches):
+    """Find a resource and fetch its sub-resources.
+
+    When the resource is referenced by ID, its sub-resources are fetched
+    concurrently with it. Otherwise they are fetched concurrently with each
+    other, once the resource is found.
+
+    :param find_resource: function finding the resource by name or ID, such
+        as ``osc_lib.utils.find_resource``.
+    :param fetches: callables taking the ID of the resource and returning
+        one of its sub-resources.
+    :returns: list with the resource followed by the results of fetches.
+    """
+    if not uuidutils.is_uuid_like(name_or_id):
+        resource = find_resource(manager, name_or_id)
+        return [resource] + fetch_concurrently(
+            *(lambda fetch=fetch: fetch(resource.id) for fetch in fetches)
+        )
+
+    def try_fetch(fetch):
+        try:
+            return fetch(name_or_id), None
+        except Exception as e:
+            return None, e
+
+    resource, *fetched = fetch_concurrently(
+        lambda: find_resource(manager, name_or_id),
+        *(lambda fetch=fetch: try_fetch(fetch) for fetch in fetches),
+    )
+    results = [resource]
+    for fetch, (result, error) in zip(fetches, fetched):
+        # NOTE: a failure of a speculative fetch may be caused by a name
+        # that looks like an ID, fetch again with the ID of the resource
+        # to report the actual error.
+        if error is not None or resource.id != name_or_id:
+            LOG.debug(
+                "Fetching a sub-resource of %(ref)s again: %(error)s",
+                {'ref': name_or_id, 'error': error},
+            )
+            result = fetch(resource.id)
+        results.append(result)
+    return results
+
+
+# NOTE: the default order of listings, which is applied on the client so
+# that it doesn't depend on how the database orders missing names.
+DEFAULT_SORT = 'name:asc'
+
+
+def get_server_sort(sort, sort_key_values):
+    """Translate a ``--sort`` option into server side sorting.
+
+    The API sorts results by a single key. Sorting on the server keeps
+    ``--limit`` and ``--marker`` consistent with the order of the results,
+    and spares sorting all of them on the client.
+
+    :param sort: value of the option, '<key>[:<direction>]', multiple keys
+        being separated by commas. None if the option wasn't given, the
+        results are then sorted on the client by ``DEFAULT_SORT``.
+    :param sort_key_values: keys the API can sort by.
+    :returns: (sort_key, sort_dir), or (None, None) if the results have to
+        be sorted on the client.
+    """
+    if not sort or ',' in sort:
+        return None, None
+    sort_key, _sep, sort_dir = sort.strip().partition(':')
+    sort_dir = sort_dir or 'asc'
+    if (
+        sort_key not in sort_key_values
+        or sort_dir not in constants.SORT_DIR_VALUES
+    ):
+        return None, None
+    return sort_key, sort_dir
@@ -19,6 +19,8 @@ from osc_lib import utils as oscutils
 from manilaclient import api_versions
 from manilaclient.common._i18n import _
 from manilaclient.common.apiclient import utils as apiutils
+from manilaclient.common import constants
+from manilaclient.osc import utils
 
 
 LOG = logging.getLogger(__name__)
@@ -50,25 +52,30 @@ class DeleteMessage(command.Command):
             nargs='+',
             help=_('ID of the message(s).'),
         )
+        utils.add_parallel_option(parser, _("messages"))
         return parser
 
     def take_action(self, parsed_args):
         share_client = self.app.client_manager.share
-        failure_count = 0
 
-        for message in parsed_args.message:
+        def _delete_message(message):
             try:
                 message_ref = apiutils.find_resource(
                     share_client.messages, message
                 )
                 share_client.messages.delete(message_ref)
+                return True
             except Exception as e:
-                failure_count += 1
                 LOG.error(
                     _("Delete for message %(message)s failed: %(e)s"),
                     {'message': message, 'e': e},
                 )
 
+        results = utils.run_in_parallel(
+            _delete_message, parsed_args.message, parsed_args.parallel
+        )
+        failure_count = results.count(None)
+
         if failure_count > 0:
             raise exceptions.CommandError(
                 _("Unable to delete some or all of the specified messages.")
@@ -151,11 +158,36 @@ class ListMessage(command.Lister):
                 'Available only for microversion >= 2.52.'
             ),
         )
+        parser.add_argument(
+            '--sort',
+            metavar='<key>[:<direction>]',
+            default=None,
+            help=_(
+                'Sort messages by a key and a direction (asc or desc), the '
+                'direction defaults to asc. Supported keys: %s. '
+                'Default=None.'
+            )
+            % ', '.join(dict.fromkeys(constants.MESSAGE_SORT_KEY_VALUES)),
+        )
         return parser
 
     def take_action(self, parsed_args):
         share_client = self.app.client_manager.share
 
+        sort_key = sort_dir = None
+        if parsed_args.sort:
+            sort_key, sort_dir = utils.get_server_sort(
+                parsed_args.sort, constants.MESSAGE_SORT_KEY_VALUES
+            )
+            if sort_key is None:
+                raise exceptions.CommandError(
+                    _(
+                        "Invalid sort '%s', messages can only be sorted "
+                        "by one of the supported keys, in asc or desc order."
+                    )
+                    % parsed_args.sort
+                )
+
         search_opts = {
             'limit': parsed_args.limit,
             'request_id': parsed_args.request_id,
@@ -178,7 +210,9 @@ class ListMessage(command.Lister):
             search_opts['created_since'] = parsed_args.since
             search_opts['created_before'] = parsed_args.before
 
-        messages = share_client.messages.list(search_opts=search_opts)
+        messages = share_client.messages.list(
+            search_opts=search_opts, sort_key=sort_key, sort_dir=sort_dir
+        )
         columns = [
             'ID',
             'Resource Type',
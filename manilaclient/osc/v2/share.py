@@ -26,10 +26,20 @@ from manilaclient.common._i18n import _
 from manilaclient.common.apiclient import exceptions as apiclient_exceptions
 from manilaclient.common.apiclient import utils as apiutils
 from manilaclient.common import cliutils
+from manilaclient.common import constants
+from manilaclient.common import waiters
 from manilaclient.osc import utils
 
 LOG = logging.getLogger(__name__)
 
+# NOTE: the API sorts shares by the ID of their availability zone, not by
+# its name as displayed.
+SERVER_SORT_KEYS = tuple(
+    key
+    for key in constants.SHARE_SORT_KEY_VALUES
+    if key != 'availability_zone'
+)
+
 SHARE_ATTRIBUTES = [
     'id',
     'name',
@@ -399,13 +409,13 @@ class DeleteShare(command.Command):
             default=False,
             help=_("Soft delete one or more shares."),
         )
+        utils.add_parallel_option(parser, _("shares"))
         return parser
 
     def take_action(self, parsed_args):
         share_client = self.app.client_manager.share
-        result = 0
 
-        for share in parsed_args.shares:
+        def _delete_share(share):
             try:
                 share_obj = apiutils.find_resource(share_client.shares, share)
                 share_group_id = None
@@ -428,14 +438,9 @@ class DeleteShare(command.Command):
                         )
                 else:
                     share_client.shares.delete(share_obj, share_group_id)
-                if parsed_args.wait:
-                    if not oscutils.wait_for_delete(
-                        manager=share_client.shares, res_id=share_obj.id
-                    ):
-                        result += 1
+                return share_obj.id
 
             except Exception as exc:
-                result += 1
                 LOG.error(
                     _(
                         "Failed to delete share with "
@@ -444,6 +449,20 @@ class DeleteShare(command.Command):
                     {'share': share, 'e': exc},
                 )
 
+        results = utils.run_in_parallel(
+            _delete_share, parsed_args.shares, parsed_args.parallel
+        )
+        deleted_ids = [share_id for share_id in results if share_id]
+        result = results.count(None)
+
+        if parsed_args.wait and deleted_ids:
+            wait_results = waiters.wait_for_delete(
+                share_client.shares,
+                deleted_ids,
+                search_opts={'status': 'deleting'},
+            )
+            result += list(wait_results.values()).count(False)
+
         if result > 0:
             total = len(parsed_args.shares)
             msg = _("%(result)s of %(total)s shares failed to delete.") % {
@@ -572,7 +591,7 @@ class ListShare(command.Lister):
         parser.add_argument(
             '--sort',
             metavar="<key>[:<direction>]",
-            default='name:asc',
+            default=None,
             help=_(
                 "Sort output by selected keys and directions(asc or desc) "
                 "(default: name:asc), multiple keys and directions can be "
@@ -755,8 +774,16 @@ class ListShare(command.Lister):
                 " is only available with manila API version >= 2.36"
             )
 
-        data = share_client.shares.list(search_opts=search_opts)
-        data = oscutils.sort_items(data, parsed_args.sort, str)
+        sort_key, sort_dir = utils.get_server_sort(
+            parsed_args.sort, SERVER_SORT_KEYS
+        )
+        data = share_client.shares.list(
+            search_opts=search_opts, sort_key=sort_key, sort_dir=sort_dir
+        )
+        if sort_key is None:
+            data = oscutils.sort_items(
+                data, parsed_args.sort or utils.DEFAULT_SORT, str
+            )
 
         return (
             column_headers,
@@ -786,11 +813,12 @@ class ShowShare(command.ShowOne):
     def take_action(self, parsed_args):
         share_client = self.app.client_manager.share
 
-        share_obj = apiutils.find_resource(
-            share_client.shares, parsed_args.share
+        share_obj, export_locations = utils.find_resource_and_fetch(
+            apiutils.find_resource,
+            share_client.shares,
+            parsed_args.share,
+            share_client.share_export_locations.list,
         )
-
-        export_locations = share_client.share_export_locations.list(share_obj)
         export_locations = cliutils.convert_dict_list_to_string(
             export_locations,
             ignored_keys=[
@@ -970,6 +998,7 @@ class UnsetShare(command.Command):
                 '(repeat option to remove multiple properties)'
             ),
         )
+        utils.add_bulk_unset_option(parser)
         parser.add_argument(
             '--name', action='store_true', help=_('Unset share name.')
         )
@@ -1004,7 +1033,13 @@ class UnsetShare(command.Command):
                 )
                 result += 1
 
-        if parsed_args.property:
+        if parsed_args.property and parsed_args.bulk:
+            try:
+                share_obj.delete_metadata(parsed_args.property, bulk=True)
+            except Exception as e:
+                LOG.error(_("Failed to unset share properties: %s"), e)
+                result += 1
+        elif parsed_args.property:
             for key in parsed_args.property:
                 try:
                     share_obj.delete_metadata([key])
@@ -1274,28 +1309,20 @@ class AbandonShare(command.Command):
             action='store_true',
             help=_("Wait until share is abandoned"),
         )
+        utils.add_parallel_option(parser, _("shares"))
         return parser
 
     def take_action(self, parsed_args):
         share_client = self.app.client_manager.share
-        result = 0
 
-        for share in parsed_args.share:
+        def _abandon_share(share):
             try:
                 share_obj = apiutils.find_resource(share_client.shares, share)
                 share_client.shares.unmanage(share_obj)
 
-                if parsed_args.wait:
-                    # 'wait_for_delete' checks that the resource is no longer
-                    # retrievable with the given 'res_id' so we can use it
-                    # to check that the share has been abandoned
-                    if not oscutils.wait_for_delete(
-                        manager=share_client.shares, res_id=share_obj.id
-                    ):
-                        result += 1
+                return share_obj.id
 
             except Exception as e:
-                result += 1
                 LOG.error(
                     _(
                         "Failed to abandon share with "
@@ -1304,6 +1331,20 @@ class AbandonShare(command.Command):
                     {'share': share, 'e': e},
                 )
 
+        results = utils.run_in_parallel(
+            _abandon_share, parsed_args.share, parsed_args.parallel
+        )
+        abandoned_ids = [share_id for share_id in results if share_id]
+        result = results.count(None)
+
+        if parsed_args.wait and abandoned_ids:
+            wait_results = waiters.wait_for_delete(
+                share_client.shares,
+                abandoned_ids,
+                search_opts={'status': 'unmanage_starting'},
+            )
+            result += list(wait_results.values()).count(False)
+
         if result > 0:
             total = len(parsed_args.share)
             msg = _(
@@ -1467,6 +1508,7 @@ class ShareExportLocationUnset(command.Command):
                 "Available only for microversion >= 2.87."
             ),
         )
+        utils.add_bulk_unset_option(parser)
         return parser
 
     def take_action(self, parsed_args):
@@ -1484,7 +1526,19 @@ class ShareExportLocationUnset(command.Command):
                 "version >= 2.87."
             )
 
-        if parsed_args.property:
+        if parsed_args.property and parsed_args.bulk:
+            try:
+                share_client.share_export_locations.delete_metadata(
+                    share_id,
+                    parsed_args.property,
+                    subresource=parsed_args.export_location,
+                    bulk=True,
+                )
+            except Exception as e:
+                raise exceptions.CommandError(
+                    f"Failed to unset export location properties: {e}"
+                )
+        elif parsed_args.property:
             result = 0
             for key in parsed_args.property:
                 try:
@@ -12,6 +12,7 @@
 
 import logging
 
+from oslo_serialization import jsonutils
 from osc_lib.cli import parseractions
 from osc_lib.command import command
 from osc_lib import exceptions
@@ -571,3 +572,154 @@ class UnsetShareAccess(command.Command):
                 "Option to unset properties of access rule is available only "
                 "for API microversion 2.45 and higher"
             )
+
+
+def _is_rule(rule):
+    return (
+        isinstance(rule, dict)
+        and 'access_type' in rule
+        and 'access_to' in rule
+    )
+
+
+class SyncShareAccess(command.Lister):
+    """Make the access rules of a share match the given ones."""
+
+    _description = _(
+        "Make the access rules of a share match the given ones. Rules "
+        "missing from the share are created, rules with a different access "
+        "level or properties are updated, rules in error state are "
+        "recreated, and the other rules are deleted. "
+        "Available for API microversion 2.45 and higher"
+    )
+
+    def get_parser(self, prog_name):
+        parser = super().get_parser(prog_name)
+        parser.add_argument(
+            'share',
+            metavar="<share>",
+            help=_('Name or ID of the NAS share to modify.'),
+        )
+        parser.add_argument(
+            '--rule',
+            metavar=(
+                'access_type=<access_type>,access_to=<access_to>'
+                '[,access_level=<access_level>]'
+            ),
+            action=parseractions.MultiKeyValueAction,
+            required_keys=['access_type', 'access_to'],
+            optional_keys=['access_level'],
+            default=[],
+            help=_(
+                'Access rule the share must have. The access level '
+                'defaults to rw. (Repeat option to give multiple rules)'
+            ),
+        )
+        parser.add_argument(
+            '--rules-file',
+            metavar='<rules-file>',
+            default=None,
+            help=_(
+                'Path to a JSON file holding a list of the access rules the '
+                'share must have, as objects with the "access_type", '
+                '"access_to" and optionally "access_level" and '
+                '"properties" keys. The properties of a rule are left as is '
+                'unless given.'
+            ),
+        )
+        utils.add_parallel_option(parser, 'access rule changes')
+        parser.add_argument(
+            '--dry-run',
+            action='store_true',
+            default=False,
+            help=_('Only display the changes, without applying them.'),
+        )
+        return parser
+
+    def _read_rules_file(self, path):
+        try:
+            with open(path) as rules_file:
+                rules = jsonutils.loads(rules_file.read())
+        except (OSError, ValueError) as e:
+            raise exceptions.CommandError(
+                _("Failed to read access rules from %(path)s: %(e)s")
+                % {'path': path, 'e': e}
+            )
+        if not isinstance(rules, list) or not all(map(_is_rule, rules)):
+            raise exceptions.CommandError(
+                _(
+                    "%s must hold a list of objects with the access_type "
+                    "and access_to keys."
+                )
+                % path
+            )
+        for rule in rules:
+            # properties --> metadata in the API
+            if 'properties' in rule:
+                rule['metadata'] = rule.pop('properties')
+        return rules
+
+    def take_action(self, parsed_args):
+        share_client = self.app.client_manager.share
+
+        if share_client.api_version < api_versions.APIVersion("2.45"):
+            raise exceptions.CommandError(
+                "Synchronizing share access rules is only available with "
+                "API microversion 2.45 and higher."
+            )
+        if parsed_args.parallel < 1:
+            raise exceptions.CommandError(
+                _("The number of parallel operations must be at least 1.")
+            )
+
+        rules = list(parsed_args.rule)
+        if parsed_args.rules_file:
+            rules.extend(self._read_rules_file(parsed_args.rules_file))
+
+        share = apiutils.find_resource(share_client.shares, parsed_args.share)
+        try:
+            changes = share_client.share_access_rules.sync(
+                share,
+                rules,
+                concurrency=parsed_args.parallel,
+                dry_run=parsed_args.dry_run,
+            )
+        except ValueError as e:
+            raise exceptions.CommandError(str(e))
+
+        result = 0
+        for action, rule, error in changes:
+            if error is not None:
+                result += 1
+                LOG.error(
+                    _(
+                        "Failed to %(action)s access to %(access_to)s for "
+                        "share %(share)s: %(e)s"
+                    ),
+                    {
+                        'action': action,
+                        'access_to': rule['access_to'],
+                        'share': parsed_args.share,
+                        'e': error,
+                    },
+                )
+        if result > 0:
+            total = len(changes)
+            msg = _("%(result)s of %(total)s access rule changes failed") % {
+                'result': result,
+                'total': total,
+            }
+            raise exceptions.CommandError(msg)
+
+        columns = ['Action', 'ID', 'Access Type', 'Access To', 'Access Level']
+        values = (
+            (
+                action,
+                rule.get('id'),
+                rule['access_type'],
+                rule['access_to'],
+                rule['access_level'],
+            )
+            for action, rule, error in changes
+        )
+        return (columns, values)
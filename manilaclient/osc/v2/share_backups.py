@@ -23,6 +23,7 @@ from osc_lib import utils as osc_utils
 from manilaclient import api_versions
 from manilaclient.common._i18n import _
 from manilaclient.common import constants
+from manilaclient.common import waiters
 from manilaclient.osc import utils
 
 
@@ -108,6 +109,7 @@ class DeleteShareBackup(command.Command):
     def take_action(self, parsed_args):
         share_client = self.app.client_manager.share
         result = 0
+        deleted_ids = []
 
         for backup in parsed_args.backup:
             try:
@@ -116,12 +118,7 @@ class DeleteShareBackup(command.Command):
                 )
                 share_client.share_backups.delete(share_backup_obj)
 
-                if parsed_args.wait:
-                    if not osc_utils.wait_for_delete(
-                        manager=share_client.share_backups,
-                        res_id=share_backup_obj.id,
-                    ):
-                        result += 1
+                deleted_ids.append(share_backup_obj.id)
 
             except Exception as e:
                 result += 1
@@ -133,6 +130,14 @@ class DeleteShareBackup(command.Command):
                     {'backup': backup, 'e': e},
                 )
 
+        if parsed_args.wait and deleted_ids:
+            wait_results = waiters.wait_for_delete(
+                share_client.share_backups,
+                deleted_ids,
+                search_opts={'status': 'deleting'},
+            )
+            result += list(wait_results.values()).count(False)
+
         if result > 0:
             total = len(parsed_args.backup)
             msg = _("%(result)s of %(total)s backups failed to delete.") % {
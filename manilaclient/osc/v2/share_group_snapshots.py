@@ -19,6 +19,7 @@ from osc_lib import utils
 from osc_lib import utils as osc_utils
 
 from manilaclient.common._i18n import _
+from manilaclient.common import waiters
 
 LOG = logging.getLogger(__name__)
 
@@ -121,6 +122,7 @@ class DeleteShareGroupSnapshot(command.Command):
     def take_action(self, parsed_args):
         share_client = self.app.client_manager.share
         result = 0
+        deleted_ids = []
 
         for share_group_snapshot in parsed_args.share_group_snapshot:
             try:
@@ -132,12 +134,7 @@ class DeleteShareGroupSnapshot(command.Command):
                     share_group_snapshot_obj, force=parsed_args.force
                 )
 
-                if parsed_args.wait:
-                    if not osc_utils.wait_for_delete(
-                        manager=share_client.share_group_snapshots,
-                        res_id=share_group_snapshot_obj.id,
-                    ):
-                        result += 1
+                deleted_ids.append(share_group_snapshot_obj.id)
 
             except Exception as e:
                 result += 1
@@ -146,6 +143,14 @@ class DeleteShareGroupSnapshot(command.Command):
                     f'name or ID {share_group_snapshot}: {e}'
                 )
 
+        if parsed_args.wait and deleted_ids:
+            wait_results = waiters.wait_for_delete(
+                share_client.share_group_snapshots,
+                deleted_ids,
+                search_opts={'status': 'deleting'},
+            )
+            result += list(wait_results.values()).count(False)
+
         if result > 0:
             total = len(parsed_args.share_group_snapshot)
             msg = (
@@ -19,6 +19,7 @@ from osc_lib import utils as osc_utils
 
 from manilaclient import api_versions
 from manilaclient.common._i18n import _
+from manilaclient.common import waiters
 
 LOG = logging.getLogger(__name__)
 
@@ -187,6 +188,7 @@ class DeleteShareGroup(command.Command):
     def take_action(self, parsed_args):
         share_client = self.app.client_manager.share
         result = 0
+        deleted_ids = []
 
         for share_group in parsed_args.share_group:
             try:
@@ -198,12 +200,7 @@ class DeleteShareGroup(command.Command):
                     share_group_obj, force=parsed_args.force
                 )
 
-                if parsed_args.wait:
-                    if not osc_utils.wait_for_delete(
-                        manager=share_client.share_groups,
-                        res_id=share_group_obj.id,
-                    ):
-                        result += 1
+                deleted_ids.append(share_group_obj.id)
 
             except Exception as e:
                 result += 1
@@ -215,6 +212,14 @@ class DeleteShareGroup(command.Command):
                     {'share_group': share_group, 'e': e},
                 )
 
+        if parsed_args.wait and deleted_ids:
+            wait_results = waiters.wait_for_delete(
+                share_client.share_groups,
+                deleted_ids,
+                search_opts={'status': 'deleting'},
+            )
+            result += list(wait_results.values()).count(False)
+
         if result > 0:
             total = len(parsed_args.share_group)
             msg = _(
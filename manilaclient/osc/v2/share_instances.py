@@ -20,6 +20,7 @@ from manilaclient import api_versions
 from manilaclient.common._i18n import _
 from manilaclient.common.apiclient import utils as apiutils
 from manilaclient.common import cliutils
+from manilaclient.common import waiters
 
 
 LOG = logging.getLogger(__name__)
@@ -49,6 +50,7 @@ class ShareInstanceDelete(command.Command):
     def take_action(self, parsed_args):
         share_client = self.app.client_manager.share
         number_of_deletion_failures = 0
+        deleted_ids = []
 
         for instance in parsed_args.instance:
             try:
@@ -58,12 +60,7 @@ class ShareInstanceDelete(command.Command):
 
                 share_client.share_instances.force_delete(share_instance)
 
-                if parsed_args.wait:
-                    if not osc_utils.wait_for_delete(
-                        manager=share_client.share_instances,
-                        res_id=share_instance.id,
-                    ):
-                        number_of_deletion_failures += 1
+                deleted_ids.append(share_instance.id)
 
             except Exception as e:
                 number_of_deletion_failures += 1
@@ -74,6 +71,16 @@ class ShareInstanceDelete(command.Command):
                     ),
                     {'instance': instance, 'e': e},
                 )
+
+        if parsed_args.wait and deleted_ids:
+            wait_results = waiters.wait_for_delete(
+                share_client.share_instances,
+                deleted_ids,
+            )
+            number_of_deletion_failures += list(wait_results.values()).count(
+                False
+            )
+
         if number_of_deletion_failures > 0:
             msg = _(
                 "%(number_of_deletion_failures)s of "
@@ -22,6 +22,7 @@ from osc_lib import utils as oscutils
 from manilaclient import api_versions
 from manilaclient.common._i18n import _
 from manilaclient.common import cliutils
+from manilaclient.osc import utils
 
 
 LOG = logging.getLogger(__name__)
@@ -384,6 +385,7 @@ class UnsetShareNetworkSubnet(command.Command):
                 "Available only for microversion >= 2.78."
             ),
         )
+        utils.add_bulk_unset_option(parser)
         return parser
 
     def take_action(self, parsed_args):
@@ -402,7 +404,19 @@ class UnsetShareNetworkSubnet(command.Command):
             share_client.share_networks, parsed_args.share_network
         ).id
 
-        if parsed_args.property:
+        if parsed_args.property and parsed_args.bulk:
+            try:
+                share_client.share_network_subnets.delete_metadata(
+                    share_network_id,
+                    parsed_args.property,
+                    subresource=parsed_args.share_network_subnet,
+                    bulk=True,
+                )
+            except Exception as e:
+                raise exceptions.CommandError(
+                    f"Failed to unset subnet properties: {e}"
+                )
+        elif parsed_args.property:
             result = 0
             for key in parsed_args.property:
                 try:
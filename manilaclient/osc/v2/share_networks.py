@@ -23,6 +23,8 @@ from osc_lib import utils as oscutils
 from manilaclient import api_versions
 from manilaclient.common._i18n import _
 from manilaclient.common import cliutils
+from manilaclient.common import waiters
+from manilaclient.osc import utils
 
 LOG = logging.getLogger(__name__)
 
@@ -235,8 +237,14 @@ class ShowShareNetwork(command.ShowOne):
     def take_action(self, parsed_args):
         share_client = self.app.client_manager.share
 
-        share_network = oscutils.find_resource(
-            share_client.share_networks, parsed_args.share_network
+        share_network, security_services = utils.find_resource_and_fetch(
+            oscutils.find_resource,
+            share_client.share_networks,
+            parsed_args.share_network,
+            lambda share_network_id: share_client.security_services.list(
+                search_opts={'share_network_id': share_network_id},
+                detailed=False,
+            ),
         )
 
         data = share_network._info
@@ -255,9 +263,6 @@ class ShowShareNetwork(command.ShowOne):
             )
 
         # Add security services information
-        security_services = share_client.security_services.list(
-            search_opts={'share_network_id': share_network.id}, detailed=False
-        )
         data['security_services'] = [
             {
                 'security_service_name': ss.name,
@@ -418,32 +423,42 @@ class DeleteShareNetwork(command.Command):
             default=False,
             help=_("Wait for the share network(s) to be deleted"),
         )
+        utils.add_parallel_option(parser, _("share networks"))
         return parser
 
     def take_action(self, parsed_args):
         share_client = self.app.client_manager.share
-        result = 0
 
-        for share_network in parsed_args.share_network:
+        def _delete_share_network(share_network):
             try:
                 share_network_obj = oscutils.find_resource(
                     share_client.share_networks, share_network
                 )
                 share_client.share_networks.delete(share_network_obj)
 
-                if parsed_args.wait:
-                    if not oscutils.wait_for_delete(
-                        manager=share_client.share_networks,
-                        res_id=share_network_obj.id,
-                    ):
-                        result += 1
+                return share_network_obj.id
             except Exception as e:
-                result += 1
                 LOG.error(
                     f"Failed to delete share network with "
                     f"name or ID {share_network}: {e}"
                 )
 
+        results = utils.run_in_parallel(
+            _delete_share_network,
+            parsed_args.share_network,
+            parsed_args.parallel,
+        )
+        deleted_ids = [network_id for network_id in results if network_id]
+        result = results.count(None)
+
+        if parsed_args.wait and deleted_ids:
+            wait_results = waiters.wait_for_delete(
+                share_client.share_networks,
+                deleted_ids,
+                search_opts={},
+            )
+            result += list(wait_results.values()).count(False)
+
         if result > 0:
             total = len(parsed_args.share_network)
             msg = f"{result} of {total} share networks failed to be deleted."
@@ -20,6 +20,7 @@ from osc_lib import utils as osc_utils
 from manilaclient import api_versions
 from manilaclient.common._i18n import _
 from manilaclient.common import cliutils
+from manilaclient.common import waiters
 from manilaclient.osc import utils
 
 LOG = logging.getLogger(__name__)
@@ -190,6 +191,7 @@ class DeleteShareReplica(command.Command):
     def take_action(self, parsed_args):
         share_client = self.app.client_manager.share
         result = 0
+        deleted_ids = []
 
         for replica in parsed_args.replica:
             try:
@@ -201,12 +203,7 @@ class DeleteShareReplica(command.Command):
                     replica_obj, force=parsed_args.force
                 )
 
-                if parsed_args.wait:
-                    if not osc_utils.wait_for_delete(
-                        manager=share_client.share_replicas,
-                        res_id=replica_obj.id,
-                    ):
-                        result += 1
+                deleted_ids.append(replica_obj.id)
 
             except Exception as e:
                 result += 1
@@ -218,6 +215,13 @@ class DeleteShareReplica(command.Command):
                     {'replica': replica, 'e': e},
                 )
 
+        if parsed_args.wait and deleted_ids:
+            wait_results = waiters.wait_for_delete(
+                share_client.share_replicas,
+                deleted_ids,
+            )
+            result += list(wait_results.values()).count(False)
+
         if result > 0:
             total = len(parsed_args.replica)
             msg = _("%(result)s of %(total)s replicas failed to delete.") % {
@@ -326,12 +330,11 @@ class ShowShareReplica(command.ShowOne):
     def take_action(self, parsed_args):
         share_client = self.app.client_manager.share
 
-        replica = share_client.share_replicas.get(parsed_args.replica)
-
-        replica_export_locations = (
-            share_client.share_replica_export_locations.list(
-                share_replica=replica
-            )
+        replica, replica_export_locations = utils.fetch_concurrently(
+            lambda: share_client.share_replicas.get(parsed_args.replica),
+            lambda: share_client.share_replica_export_locations.list(
+                share_replica=parsed_args.replica
+            ),
         )
 
         replica._info['export_locations'] = []
@@ -509,6 +512,7 @@ class UnsetShareReplica(command.Command):
                 '(repeat option to remove multiple properties)'
             ),
         )
+        utils.add_bulk_unset_option(parser)
         return parser
 
     def take_action(self, parsed_args):
@@ -526,6 +530,18 @@ class UnsetShareReplica(command.Command):
                         "with API microversion '2.95'."
                     )
                 )
+            if parsed_args.bulk:
+                try:
+                    replica.delete_metadata(parsed_args.property, bulk=True)
+                except Exception as e:
+                    LOG.error(
+                        _("Failed to unset replica properties: %(exception)s"),
+                        {'exception': e},
+                    )
+                    raise exceptions.CommandError(
+                        _("One or more of the unset operations failed")
+                    )
+                return
             result = 0
             for key in parsed_args.property:
                 try:
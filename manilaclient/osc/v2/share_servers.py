@@ -23,6 +23,8 @@ from manilaclient.common._i18n import _
 from manilaclient.common.apiclient import utils as apiutils
 from manilaclient.common import cliutils
 from manilaclient.common import constants
+from manilaclient.common import waiters
+from manilaclient.osc import utils
 
 LOG = logging.getLogger(__name__)
 
@@ -46,28 +48,22 @@ class DeleteShareServer(command.Command):
             default=False,
             help=_("Wait for share server deletion."),
         )
+        utils.add_parallel_option(parser, _("share servers"))
         return parser
 
     def take_action(self, parsed_args):
         share_client = self.app.client_manager.share
-        result = 0
 
-        for server in parsed_args.share_servers:
+        def _delete_server(server):
             try:
                 server_obj = osc_utils.find_resource(
                     share_client.share_servers, server
                 )
 
                 share_client.share_servers.delete(server_obj)
-                if parsed_args.wait:
-                    if not osc_utils.wait_for_delete(
-                        manager=share_client.share_servers,
-                        res_id=server_obj.id,
-                    ):
-                        result += 1
+                return server_obj.id
 
             except Exception as e:
-                result += 1
                 LOG.error(
                     _(
                         "Failed to delete a share server with "
@@ -76,6 +72,20 @@ class DeleteShareServer(command.Command):
                     {'server': server, 'e': e},
                 )
 
+        results = utils.run_in_parallel(
+            _delete_server, parsed_args.share_servers, parsed_args.parallel
+        )
+        deleted_ids = [server_id for server_id in results if server_id]
+        result = results.count(None)
+
+        if parsed_args.wait and deleted_ids:
+            wait_results = waiters.wait_for_delete(
+                share_client.share_servers,
+                deleted_ids,
+                search_opts={'status': 'deleting'},
+            )
+            result += list(wait_results.values()).count(False)
+
         if result > 0:
             msg = "Failed to delete %(result)d servers out %(total)d"
             raise exceptions.CommandError(
@@ -406,6 +416,7 @@ class AbandonShareServer(command.Command):
     def take_action(self, parsed_args):
         share_client = self.app.client_manager.share
         result = 0
+        abandoned_ids = []
 
         for server in parsed_args.share_server:
             try:
@@ -417,12 +428,7 @@ class AbandonShareServer(command.Command):
                     kwargs['force'] = parsed_args.force
                 share_client.share_servers.unmanage(server_obj, **kwargs)
 
-                if parsed_args.wait:
-                    if not osc_utils.wait_for_delete(
-                        manager=share_client.share_servers,
-                        res_id=server_obj.id,
-                    ):
-                        result += 1
+                abandoned_ids.append(server_obj.id)
 
             except Exception as e:
                 result += 1
@@ -434,6 +440,14 @@ class AbandonShareServer(command.Command):
                     {'server': server, 'e': e},
                 )
 
+        if parsed_args.wait and abandoned_ids:
+            wait_results = waiters.wait_for_delete(
+                share_client.share_servers,
+                abandoned_ids,
+                search_opts={'status': 'unmanage_starting'},
+            )
+            result += list(wait_results.values()).count(False)
+
         if result > 0:
             msg = _('Failed to abandon %(result)s of %(total)s servers.')
             raise exceptions.CommandError(
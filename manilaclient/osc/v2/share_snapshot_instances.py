@@ -16,6 +16,7 @@ from osc_lib import utils
 
 from manilaclient.common._i18n import _
 from manilaclient.common import cliutils
+from manilaclient.osc import utils as osc_utils
 
 
 class ListShareSnapshotInstance(command.Lister):
@@ -90,13 +91,16 @@ class ShowShareSnapshotInstance(command.ShowOne):
 
     def take_action(self, parsed_args):
         share_client = self.app.client_manager.share
-        snapshot_instance = share_client.share_snapshot_instances.get(
-            parsed_args.snapshot_instance
-        )
-
-        snapshot_instance_export_locations = (
-            share_client.share_snapshot_instance_export_locations.list(
-                snapshot_instance=snapshot_instance
+        snapshot_instance, snapshot_instance_export_locations = (
+            osc_utils.fetch_concurrently(
+                lambda: share_client.share_snapshot_instances.get(
+                    parsed_args.snapshot_instance
+                ),
+                lambda: (
+                    share_client.share_snapshot_instance_export_locations.list(
+                        snapshot_instance=parsed_args.snapshot_instance
+                    )
+                ),
             )
         )
 
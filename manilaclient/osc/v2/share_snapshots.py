@@ -21,6 +21,8 @@ from osc_lib import utils
 from manilaclient import api_versions
 from manilaclient.common._i18n import _
 from manilaclient.common import cliutils
+from manilaclient.common import constants
+from manilaclient.common import waiters
 from manilaclient.osc import utils as oscutils
 
 LOG = logging.getLogger(__name__)
@@ -139,13 +141,13 @@ class DeleteShareSnapshot(command.Command):
             default=False,
             help=_("Wait for share snapshot deletion"),
         )
+        oscutils.add_parallel_option(parser, _("snapshots"))
         return parser
 
     def take_action(self, parsed_args):
         share_client = self.app.client_manager.share
-        result = 0
 
-        for snapshot in parsed_args.snapshot:
+        def _delete_snapshot(snapshot):
             try:
                 snapshot_obj = utils.find_resource(
                     share_client.share_snapshots, snapshot
@@ -154,14 +156,8 @@ class DeleteShareSnapshot(command.Command):
                     share_client.share_snapshots.force_delete(snapshot_obj)
                 else:
                     share_client.share_snapshots.delete(snapshot_obj)
-                if parsed_args.wait:
-                    if not utils.wait_for_delete(
-                        manager=share_client.share_snapshots,
-                        res_id=snapshot_obj.id,
-                    ):
-                        result += 1
+                return snapshot_obj.id
             except Exception as e:
-                result += 1
                 LOG.error(
                     _(
                         "Failed to delete snapshot with "
@@ -170,6 +166,20 @@ class DeleteShareSnapshot(command.Command):
                     {'snapshot': snapshot, 'e': e},
                 )
 
+        results = oscutils.run_in_parallel(
+            _delete_snapshot, parsed_args.snapshot, parsed_args.parallel
+        )
+        deleted_ids = [snapshot_id for snapshot_id in results if snapshot_id]
+        result = results.count(None)
+
+        if parsed_args.wait and deleted_ids:
+            wait_results = waiters.wait_for_delete(
+                share_client.share_snapshots,
+                deleted_ids,
+                search_opts={'status': 'deleting'},
+            )
+            result += list(wait_results.values()).count(False)
+
         if result > 0:
             total = len(parsed_args.snapshot)
             msg = _("%(result)s of %(total)s snapshots failed to delete.") % {
@@ -196,12 +206,11 @@ class ShowShareSnapshot(command.ShowOne):
     def take_action(self, parsed_args):
         share_client = self.app.client_manager.share
 
-        share_snapshot = utils.find_resource(
-            share_client.share_snapshots, parsed_args.snapshot
-        )
-
-        export_locations = share_client.share_snapshot_export_locations.list(
-            share_snapshot
+        share_snapshot, export_locations = oscutils.find_resource_and_fetch(
+            utils.find_resource,
+            share_client.share_snapshots,
+            parsed_args.snapshot,
+            share_client.share_snapshot_export_locations.list,
         )
 
         locations = []
@@ -375,6 +384,7 @@ class UnsetShareSnapshot(command.Command):
                 '(repeat option to remove multiple properties)'
             ),
         )
+        oscutils.add_bulk_unset_option(parser)
         return parser
 
     def take_action(self, parsed_args):
@@ -398,7 +408,13 @@ class UnsetShareSnapshot(command.Command):
                     "description: %(e)s"
                 )
                 raise exceptions.CommandError(msg % {'e': e})
-        if parsed_args.property:
+        if parsed_args.property and parsed_args.bulk:
+            try:
+                share_snapshot.delete_metadata(parsed_args.property, bulk=True)
+            except Exception as e:
+                msg = _("Failed to unset snapshot properties: %(e)s")
+                raise exceptions.CommandError(msg % {'e': e})
+        elif parsed_args.property:
             for key in parsed_args.property:
                 try:
                     share_snapshot.delete_metadata([key])
@@ -472,7 +488,7 @@ class ListShareSnapshot(command.Lister):
         parser.add_argument(
             '--sort',
             metavar="<key>[:<direction>]",
-            default='name:asc',
+            default=None,
             help=_(
                 "Sort output by selected keys and directions(asc or desc) "
                 "(default: name:asc), multiple keys and directions can be "
@@ -592,18 +608,24 @@ class ListShareSnapshot(command.Lister):
         if parsed_args.all_projects:
             columns.append('Project ID')
 
+        sort_key, sort_dir = oscutils.get_server_sort(
+            parsed_args.sort, constants.SNAPSHOT_SORT_KEY_VALUES
+        )
         total_count = 0
         if parsed_args.count:
             search_opts['with_count'] = True
             snapshots, total_count = share_client.share_snapshots.list(
-                search_opts=search_opts
+                search_opts=search_opts, sort_key=sort_key, sort_dir=sort_dir
             )
         else:
             snapshots = share_client.share_snapshots.list(
-                search_opts=search_opts
+                search_opts=search_opts, sort_key=sort_key, sort_dir=sort_dir
             )
 
-        snapshots = utils.sort_items(snapshots, parsed_args.sort, str)
+        if sort_key is None:
+            snapshots = utils.sort_items(
+                snapshots, parsed_args.sort or oscutils.DEFAULT_SORT, str
+            )
 
         if parsed_args.count:
             print(f"Total number of snapshots: {total_count}")
@@ -710,26 +732,20 @@ class AbandonShareSnapshot(command.Command):
             action='store_true',
             help=_("Wait until share snapshot is abandoned"),
         )
+        oscutils.add_parallel_option(parser, _("snapshots"))
         return parser
 
     def take_action(self, parsed_args):
         share_client = self.app.client_manager.share
-        result = 0
 
-        for snapshot in parsed_args.snapshot:
+        def _abandon_snapshot(snapshot):
             snapshot_obj = utils.find_resource(
                 share_client.share_snapshots, snapshot
             )
             try:
                 share_client.share_snapshots.unmanage(snapshot_obj)
-                if parsed_args.wait:
-                    if not utils.wait_for_delete(
-                        manager=share_client.share_snapshots,
-                        res_id=snapshot_obj.id,
-                    ):
-                        result += 1
+                return snapshot_obj.id
             except Exception as e:
-                result += 1
                 LOG.error(
                     _(
                         "Failed to abandon share snapshot with "
@@ -738,6 +754,20 @@ class AbandonShareSnapshot(command.Command):
                     {'snapshot': snapshot, 'e': e},
                 )
 
+        results = oscutils.run_in_parallel(
+            _abandon_snapshot, parsed_args.snapshot, parsed_args.parallel
+        )
+        abandoned_ids = [snapshot_id for snapshot_id in results if snapshot_id]
+        result = results.count(None)
+
+        if parsed_args.wait and abandoned_ids:
+            wait_results = waiters.wait_for_delete(
+                share_client.share_snapshots,
+                abandoned_ids,
+                search_opts={'status': 'unmanage_starting'},
+            )
+            result += list(wait_results.values()).count(False)
+
         if result > 0:
             total = len(parsed_args.snapshot)
             msg = _("%(result)s of %(total)s snapshots failed to abandon.") % {
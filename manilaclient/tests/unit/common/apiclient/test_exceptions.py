@@ -0,0 +1,64 @@
+# Licensed under the Apache License, Version 2.0 (the "License"); you may
+# not use this file except in compliance with the License. You may obtain
+# a copy of the License at
+#
+# http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+# WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+# License for the specific language governing permissions and limitations
+# under the License.
+
+from unittest import mock
+
+import ddt
+
+from manilaclient.common.apiclient import exceptions
+from manilaclient.tests.unit import utils
+
+
+@ddt.ddt
+class FromResponseTest(utils.TestCase):
+    def _from_response(self, status_code, headers=None):
+        response = utils.TestResponse(
+            {'status_code': status_code, 'headers': headers or {}}
+        )
+        return exceptions.from_response(response, 'GET', '/fake')
+
+    @ddt.data(
+        (413, exceptions.RequestEntityTooLarge),
+        (429, exceptions.TooManyRequests),
+        (503, exceptions.ServiceUnavailable),
+    )
+    @ddt.unpack
+    def test_retry_after(self, status_code, exception_class):
+        error = self._from_response(status_code, {'retry-after': '5'})
+
+        self.assertIsInstance(error, exception_class)
+        self.assertEqual(5, error.retry_after)
+
+    def test_retry_after_http_date(self):
+        self.mock_object(
+            exceptions.time, 'time', mock.Mock(return_value=784198167)
+        )
+
+        error = self._from_response(
+            429, {'retry-after': 'Fri, 07 Nov 1994 08:49:37 GMT'}
+        )
+
+        self.assertEqual(10, error.retry_after)
+
+    @ddt.data(None, 'soon', '-1')
+    def test_retry_after_invalid(self, retry_after):
+        headers = {} if retry_after is None else {'retry-after': retry_after}
+
+        error = self._from_response(503, headers)
+
+        self.assertEqual(0, error.retry_after)
+
+    def test_retry_after_not_supported(self):
+        error = self._from_response(403, {'retry-after': '5'})
+
+        self.assertIsInstance(error, exceptions.Forbidden)
+        self.assertFalse(hasattr(error, 'retry_after'))
@@ -0,0 +1,83 @@
+# Licensed under the Apache License, Version 2.0 (the "License"); you may
+# not use this file except in compliance with the License. You may obtain
+# a copy of the License at
+#
+# http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+# WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+# License for the specific language governing permissions and limitations
+# under the License.
+
+from unittest import mock
+
+from manilaclient import base
+from manilaclient.common.apiclient import exceptions
+from manilaclient.common.apiclient import utils as apiutils
+from manilaclient.tests.unit import utils
+
+
+class FakeResource(base.Resource):
+    pass
+
+
+class FakeHumanIdResource(base.Resource):
+    HUMAN_ID = True
+
+
+class FindResourceTest(utils.TestCase):
+    def setUp(self):
+        super().setUp()
+        self.manager = mock.Mock()
+        self.manager.resource_class = FakeResource
+        self.manager.get.side_effect = exceptions.NotFound
+        self.resource = FakeResource(None, {'id': 'fake', 'name': 'fake'})
+
+    def test_find_by_uuid(self):
+        self.manager.get.side_effect = None
+        self.manager.get.return_value = self.resource
+        uuid = '9d2a7c1e-1f4c-4a1e-8d6e-2a7d0d3b3c3b'
+
+        result = apiutils.find_resource(self.manager, uuid)
+
+        self.assertEqual(self.resource, result)
+        self.manager.get.assert_called_once_with(uuid)
+        self.manager.find.assert_not_called()
+
+    def test_find_by_name_skips_human_id_lookup(self):
+        self.manager.find.return_value = self.resource
+
+        result = apiutils.find_resource(self.manager, 'fake')
+
+        self.assertEqual(self.resource, result)
+        self.manager.find.assert_called_once_with(name='fake')
+
+    def test_find_by_human_id(self):
+        self.manager.resource_class = FakeHumanIdResource
+        self.manager.find.return_value = self.resource
+
+        result = apiutils.find_resource(self.manager, 'fake')
+
+        self.assertEqual(self.resource, result)
+        self.manager.find.assert_called_once_with(human_id='fake')
+
+    def test_find_not_found(self):
+        self.manager.find.side_effect = exceptions.NotFound
+
+        self.assertRaises(
+            exceptions.CommandError,
+            apiutils.find_resource,
+            self.manager,
+            'fake',
+        )
+
+    def test_find_no_unique_match(self):
+        self.manager.find.side_effect = exceptions.NoUniqueMatch
+
+        self.assertRaises(
+            exceptions.CommandError,
+            apiutils.find_resource,
+            self.manager,
+            'fake',
+        )
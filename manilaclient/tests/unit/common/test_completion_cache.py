@@ -0,0 +1,84 @@
+# Licensed under the Apache License, Version 2.0 (the "License"); you may
+# not use this file except in compliance with the License. You may obtain
+# a copy of the License at
+#
+# http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+# WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+# License for the specific language governing permissions and limitations
+# under the License.
+
+import os
+from unittest import mock
+
+import fixtures
+
+from manilaclient.common import completion_cache
+from manilaclient.tests.unit import utils
+
+
+class CompletionCacheWriterTest(utils.TestCase):
+    def setUp(self):
+        super().setUp()
+        self.cache_dir = self.useFixture(fixtures.TempDir()).path
+        self.path = os.path.join(self.cache_dir, 'sub', 'share-uuid-cache')
+        self.writer = completion_cache.CompletionCacheWriter()
+
+    def _read(self):
+        with open(self.path) as cache_file:
+            return cache_file.read()
+
+    def test_write(self):
+        self.writer.submit(self.path, ['id1', 'id2'])
+        self.writer.flush()
+
+        self.assertEqual('id1\nid2\n', self._read())
+        self.assertEqual(
+            ['share-uuid-cache'], os.listdir(os.path.dirname(self.path))
+        )
+
+    def test_write_replaces_content(self):
+        self.writer.submit(self.path, ['id1', 'id2'])
+        self.writer.submit(self.path, ['id3'])
+        self.writer.flush()
+
+        self.assertEqual('id3\n', self._read())
+
+    def test_append(self):
+        self.writer.submit(self.path, ['id1'])
+        self.writer.submit(self.path, ['id2'], append=True)
+        self.writer.flush()
+
+        self.assertEqual('id1\nid2\n', self._read())
+
+    def test_append_to_missing_file(self):
+        self.writer.submit(self.path, ['id1'], append=True)
+        self.writer.flush()
+
+        self.assertEqual('id1\n', self._read())
+
+    def test_directory_created_once(self):
+        with mock.patch.object(
+            completion_cache.os, 'makedirs', wraps=os.makedirs
+        ) as mock_makedirs:
+            for i in range(3):
+                self.writer.submit(self.path, [f'id{i}'])
+            self.writer.flush()
+
+        mock_makedirs.assert_called_once_with(
+            os.path.dirname(self.path), 0o755, exist_ok=True
+        )
+
+    def test_write_errors_are_ignored(self):
+        self.mock_object(
+            completion_cache.os,
+            'makedirs',
+            mock.Mock(side_effect=PermissionError),
+        )
+
+        self.writer.submit(self.path, ['id1'])
+        self.writer.flush()
+
+        self.assertFalse(os.path.exists(self.path))
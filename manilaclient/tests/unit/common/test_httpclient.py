@@ -10,14 +10,23 @@
 # License for the specific language governing permissions and limitations
 # under the License.
 
+from http import server
+import json
 import re
+import threading
 from unittest import mock
 
 import ddt
+from keystoneauth1 import adapter
+from keystoneauth1 import exceptions as ks_exceptions
+from keystoneauth1 import plugin
+from keystoneauth1 import session
 import requests
 
 import manilaclient
 from manilaclient.common import httpclient
+from manilaclient.common import metrics
+from manilaclient.common import retry
 from manilaclient import exceptions
 from manilaclient.tests.unit import utils
 
@@ -120,7 +129,7 @@ class ClientTest(utils.TestCase):
     def test_get(self, endpoint_url):
         cl = get_authed_client(endpoint_url)
 
-        @mock.patch.object(requests, "request", mock_request)
+        @mock.patch.object(requests.Session, "request", mock_request)
         @mock.patch('time.time', mock.Mock(return_value=1234))
         def test_get_call():
             resp, body = cl.get("/hi")
@@ -154,7 +163,7 @@ class ClientTest(utils.TestCase):
             next_request = self.requests.pop(0)
             return next_request(*args, **kwargs)
 
-        @mock.patch.object(requests, "request", request)
+        @mock.patch.object(requests.Session, "request", request)
         @mock.patch('time.time', mock.Mock(return_value=1234))
         def test_get_call():
             resp, body = cl.get("/hi")
@@ -171,7 +180,7 @@ class ClientTest(utils.TestCase):
             next_request = self.requests.pop(0)
             return next_request(*args, **kwargs)
 
-        @mock.patch.object(requests, "request", request)
+        @mock.patch.object(requests.Session, "request", request)
         @mock.patch('time.time', mock.Mock(return_value=1234))
         def test_get_call():
             resp, body = cl.get("/hi")
@@ -188,7 +197,7 @@ class ClientTest(utils.TestCase):
             next_request = self.requests.pop(0)
             return next_request(*args, **kwargs)
 
-        @mock.patch.object(requests, "request", request)
+        @mock.patch.object(requests.Session, "request", request)
         @mock.patch('time.time', mock.Mock(return_value=1234))
         def test_get_call():
             resp, body = cl.get("/hi")
@@ -196,7 +205,7 @@ class ClientTest(utils.TestCase):
         self.assertRaises(exceptions.BadRequest, test_get_call)
         self.assertEqual(self.requests, [mock_request])
 
-    def test_get_retry_400_socket(self):
+    def test_get_no_retry_400_with_retries(self):
         cl = get_authed_client(retries=1)
 
         self.requests = [bad_400_request, mock_request]
@@ -205,18 +214,18 @@ class ClientTest(utils.TestCase):
             next_request = self.requests.pop(0)
             return next_request(*args, **kwargs)
 
-        @mock.patch.object(requests, "request", request)
+        @mock.patch.object(requests.Session, "request", request)
         @mock.patch('time.time', mock.Mock(return_value=1234))
         def test_get_call():
             resp, body = cl.get("/hi")
 
-        test_get_call()
-        self.assertEqual(self.requests, [])
+        self.assertRaises(exceptions.BadRequest, test_get_call)
+        self.assertEqual(self.requests, [mock_request])
 
     def test_get_with_retries_none(self):
         cl = get_authed_client(retries=None)
 
-        @mock.patch.object(requests, "request", bad_401_request)
+        @mock.patch.object(requests.Session, "request", bad_401_request)
         def test_get_call():
             resp, body = cl.get("/hi")
 
@@ -237,7 +246,7 @@ class ClientTest(utils.TestCase):
     def test_post(self, endpoint_url):
         cl = get_authed_client(endpoint_url)
 
-        @mock.patch.object(requests, "request", mock_request)
+        @mock.patch.object(requests.Session, "request", mock_request)
         def test_post_call():
             cl.post("/hi", body=[1, 2, 3])
             headers = {
@@ -260,3 +269,598 @@ class ClientTest(utils.TestCase):
             )
 
         test_post_call()
+
+    def test_http_session_is_reused(self):
+        cl = get_authed_client()
+
+        self.assertIsInstance(cl.http_session, requests.Session)
+        with mock.patch.object(
+            cl.http_session, "request", mock.Mock(return_value=fake_response)
+        ) as session_request:
+            cl.get("/hi")
+            cl.post("/hi", body={})
+            cl.get_with_base_url("/hi")
+
+        self.assertEqual(3, session_request.call_count)
+
+    def test_http_session_pool_options(self):
+        cl = httpclient.HTTPClient(
+            "http://example.com",
+            "token",
+            fake_user_agent,
+            api_version=manilaclient.API_MAX_VERSION,
+            pool_maxsize=42,
+            connection_retries=3,
+            keep_alive=False,
+        )
+
+        for prefix in ('http://', 'https://'):
+            http_adapter = cl.http_session.get_adapter(prefix + 'example.com')
+            self.assertEqual(42, http_adapter._pool_maxsize)
+            self.assertEqual(3, http_adapter.max_retries.total)
+        self.assertEqual(42, cl.pool_maxsize)
+        self.assertEqual('close', cl.http_session.headers['Connection'])
+
+    def test_http_session_default_pool_options(self):
+        cl = get_authed_client()
+
+        http_adapter = cl.http_session.get_adapter('http://example.com')
+        self.assertEqual(
+            httpclient.HTTPClient.DEFAULT_POOL_MAXSIZE,
+            http_adapter._pool_maxsize,
+        )
+        self.assertEqual(0, http_adapter.max_retries.total)
+        self.assertNotEqual('close', cl.http_session.headers.get('Connection'))
+
+    def test_http_session_provided(self):
+        http_session = mock.Mock()
+        http_session.request.return_value = fake_response
+        cl = httpclient.HTTPClient(
+            "http://example.com",
+            "token",
+            fake_user_agent,
+            api_version=manilaclient.API_MAX_VERSION,
+            http_session=http_session,
+        )
+
+        resp, body = cl.get("/hi")
+        cl.close()
+
+        self.assertEqual({"hi": "there"}, body)
+        http_session.request.assert_called_once_with(
+            "GET",
+            "http://example.com/hi",
+            headers=mock.ANY,
+            **self.TEST_REQUEST_BASE,
+        )
+        http_session.close.assert_called_once_with()
+
+    def _get_stub_server_client(self, get_payload, **kwargs):
+        """Return a client of a local API stub.
+
+        :param get_payload: callable taking the request handler and
+            returning the status and body of the response to a GET request.
+        """
+
+        class Handler(server.BaseHTTPRequestHandler):
+            protocol_version = 'HTTP/1.1'
+
+            def do_GET(self):
+                status, body = get_payload(self)
+                payload = json.dumps(body).encode()
+                self.send_response(status)
+                self.send_header('Content-Type', 'application/json')
+                self.send_header('Content-Length', str(len(payload)))
+                self.end_headers()
+                self.wfile.write(payload)
+
+            def log_message(self, *args):
+                pass
+
+        stub = server.ThreadingHTTPServer(('127.0.0.1', 0), Handler)
+        self.addCleanup(stub.server_close)
+        stub_thread = threading.Thread(target=stub.serve_forever)
+        stub_thread.daemon = True
+        stub_thread.start()
+        self.addCleanup(stub.shutdown)
+
+        cl = httpclient.HTTPClient(
+            f"http://127.0.0.1:{stub.server_address[1]}/v2",
+            "token",
+            fake_user_agent,
+            api_version=manilaclient.API_MAX_VERSION,
+            **kwargs,
+        )
+        self.addCleanup(cl.close)
+        return cl
+
+    def test_connections_are_kept_alive(self):
+        client_ports = set()
+
+        def get_payload(handler):
+            client_ports.add(handler.client_address[1])
+            return 200, {"hi": "there"}
+
+        cl = self._get_stub_server_client(get_payload)
+
+        for _ in range(20):
+            resp, body = cl.get("/hi")
+            self.assertEqual({"hi": "there"}, body)
+
+        self.assertEqual(1, len(client_ports))
+
+    def test_request_headers(self):
+        http_session = mock.Mock()
+        http_session.request.return_value = fake_response
+        cl = httpclient.HTTPClient(
+            "http://example.com",
+            "token",
+            fake_user_agent,
+            api_version=manilaclient.API_MAX_VERSION,
+            http_session=http_session,
+        )
+
+        with httpclient.request_headers({'X-Outer': '1', 'X-Inner': '1'}):
+            with httpclient.request_headers({'X-Inner': '2'}):
+                cl.get("/hi")
+            cl.get("/hi")
+        cl.get("/hi")
+
+        sent = [
+            call[1]['headers'] for call in http_session.request.call_args_list
+        ]
+        self.assertEqual(('1', '2'), (sent[0]['X-Outer'], sent[0]['X-Inner']))
+        self.assertEqual(('1', '1'), (sent[1]['X-Outer'], sent[1]['X-Inner']))
+        self.assertNotIn('X-Outer', sent[2])
+        self.assertNotIn('X-Outer', cl.default_headers)
+
+    def test_shared_client_concurrency(self):
+        threads = 8
+        requests_per_thread = 10
+
+        def get_payload(handler):
+            return 200, {
+                'thread': handler.headers.get('X-Thread'),
+                'experimental': handler.headers.get(
+                    'X-OpenStack-Manila-API-Experimental'
+                ),
+            }
+
+        cl = self._get_stub_server_client(get_payload, pool_maxsize=threads)
+        default_headers = dict(cl.default_headers)
+        barrier = threading.Barrier(threads)
+        results = {}
+
+        def worker(index):
+            barrier.wait()
+            headers = {'X-Thread': str(index)}
+            if index % 2:
+                headers['X-OpenStack-Manila-API-Experimental'] = 'true'
+            with httpclient.request_headers(headers):
+                results[index] = [
+                    cl.get("/hi")[1] for _ in range(requests_per_thread)
+                ]
+
+        workers = [
+            threading.Thread(target=worker, args=(index,))
+            for index in range(threads)
+        ]
+        for thread in workers:
+            thread.start()
+        for thread in workers:
+            thread.join()
+
+        # Every thread only ever sent its own headers.
+        for index in range(threads):
+            expected = {
+                'thread': str(index),
+                'experimental': 'true' if index % 2 else None,
+            }
+            self.assertEqual([expected] * requests_per_thread, results[index])
+        self.assertEqual(default_headers, cl.default_headers)
+
+    def test_request_does_not_modify_defaults(self):
+        cl = get_authed_client()
+        default_headers = dict(cl.default_headers)
+        request_options = dict(cl.request_options)
+
+        with mock.patch.object(
+            cl.http_session, "request", mock.Mock(return_value=fake_response)
+        ):
+            cl.post("/hi", body={}, headers={'X-Fake': 'fake'})
+
+        self.assertEqual(default_headers, cl.default_headers)
+        self.assertEqual(request_options, cl.request_options)
+
+    def test_custom_json_decoder(self):
+        json_decoder = mock.Mock(return_value={'decoded': True})
+        http_session = mock.Mock()
+        http_session.request.return_value = fake_response
+        cl = httpclient.HTTPClient(
+            "http://example.com",
+            "token",
+            fake_user_agent,
+            api_version=manilaclient.API_MAX_VERSION,
+            http_session=http_session,
+            json_decoder=json_decoder,
+        )
+
+        resp, body = cl.get("/hi")
+
+        self.assertEqual({'decoded': True}, body)
+        json_decoder.assert_called_once_with(b'{"hi": "there"}')
+
+    def test_large_listing_is_decoded_from_bytes(self):
+        shares = [
+            {
+                'id': f'{i:08x}-0000-0000-0000-000000000000',
+                'name': f'share-{i}',
+                'status': 'available',
+                'size': 1,
+                'metadata': {'key': 'value'},
+                'links': [{'href': f'http://example.com/shares/{i}'}],
+            }
+            for i in range(20000)
+        ]
+        payload = json.dumps({'shares': shares}).encode('utf-8')
+        resp = mock.Mock(spec=requests.Response, status_code=200)
+        resp.content = payload
+        # Decoding the body must not go through the str copy built by
+        # resp.text.
+        text = mock.PropertyMock(side_effect=AssertionError)
+        type(resp).text = text
+        http_session = mock.Mock()
+        http_session.request.return_value = resp
+        cl = httpclient.HTTPClient(
+            "http://example.com/v2",
+            "token",
+            fake_user_agent,
+            api_version=manilaclient.API_MAX_VERSION,
+            http_session=http_session,
+        )
+
+        resp, body = cl.get("/shares/detail")
+
+        self.assertEqual({'shares': shares}, body)
+        text.assert_not_called()
+
+    def test_stream(self):
+        resp = mock.Mock(spec=requests.Response, status_code=200, headers={})
+        # The body is left for the caller to read.
+        type(resp).content = mock.PropertyMock(side_effect=AssertionError)
+        type(resp).text = mock.PropertyMock(side_effect=AssertionError)
+        http_session = mock.Mock()
+        http_session.request.return_value = resp
+        cl = httpclient.HTTPClient(
+            "http://example.com",
+            "token",
+            fake_user_agent,
+            api_version=manilaclient.API_MAX_VERSION,
+            http_session=http_session,
+            http_log_debug=True,
+        )
+
+        result = cl.get("/shares/detail", stream=True)
+
+        self.assertEqual((resp, None), result)
+        http_session.request.assert_called_once_with(
+            "GET",
+            "http://example.com/shares/detail",
+            headers=mock.ANY,
+            stream=True,
+            **self.TEST_REQUEST_BASE,
+        )
+
+    def test_stream_error(self):
+        http_session = mock.Mock()
+        http_session.request.return_value = bad_500_response
+        cl = httpclient.HTTPClient(
+            "http://example.com",
+            "token",
+            fake_user_agent,
+            api_version=manilaclient.API_MAX_VERSION,
+            http_session=http_session,
+        )
+
+        self.assertRaises(
+            exceptions.ClientException,
+            cl.get,
+            "/shares/detail",
+            stream=True,
+        )
+
+    def test_retry_after(self):
+        mock_sleep = self.mock_object(httpclient, 'sleep')
+        http_session = mock.Mock()
+        http_session.request.side_effect = [
+            utils.TestResponse(
+                {'status_code': 503, 'headers': {'retry-after': '3'}}
+            ),
+            fake_response,
+        ]
+        cl = httpclient.HTTPClient(
+            "http://example.com",
+            "token",
+            fake_user_agent,
+            api_version=manilaclient.API_MAX_VERSION,
+            retries=1,
+            http_session=http_session,
+        )
+
+        resp, body = cl.post("/shares/1234/action", body={'fake': {}})
+
+        self.assertEqual({"hi": "there"}, body)
+        self.assertEqual(2, http_session.request.call_count)
+        mock_sleep.assert_called_once_with(3)
+
+    def test_no_retry_of_non_idempotent_request(self):
+        mock_sleep = self.mock_object(httpclient, 'sleep')
+        http_session = mock.Mock()
+        http_session.request.side_effect = [bad_500_response, fake_response]
+        cl = httpclient.HTTPClient(
+            "http://example.com",
+            "token",
+            fake_user_agent,
+            api_version=manilaclient.API_MAX_VERSION,
+            retries=1,
+            http_session=http_session,
+        )
+
+        self.assertRaises(
+            exceptions.InternalServerError,
+            cl.post,
+            "/shares/1234/action",
+            body={'fake': {}},
+        )
+        self.assertEqual(1, http_session.request.call_count)
+        mock_sleep.assert_not_called()
+
+    def test_retry_policy(self):
+        mock_sleep = self.mock_object(httpclient, 'sleep')
+        policy = retry.RetryPolicy(retries=2)
+        self.mock_object(policy, 'get_delay', mock.Mock(return_value=0.5))
+        http_session = mock.Mock()
+        http_session.request.side_effect = [
+            requests.exceptions.ConnectionError(),
+            bad_500_response,
+            fake_response,
+        ]
+        cl = httpclient.HTTPClient(
+            "http://example.com",
+            "token",
+            fake_user_agent,
+            api_version=manilaclient.API_MAX_VERSION,
+            http_session=http_session,
+            retry_policy=policy,
+        )
+
+        resp, body = cl.get("/hi")
+
+        self.assertEqual({"hi": "there"}, body)
+        self.assertEqual(2, cl.retries)
+        policy.get_delay.assert_has_calls(
+            [
+                mock.call('GET', 1, mock.ANY),
+                mock.call('GET', 2, mock.ANY),
+            ]
+        )
+        mock_sleep.assert_has_calls([mock.call(0.5), mock.call(0.5)])
+
+    def test_rate_limiter(self):
+        self.mock_object(httpclient, 'sleep')
+        rate_limiter = mock.Mock()
+        http_session = mock.Mock()
+        http_session.request.side_effect = [
+            bad_500_response,
+            fake_response,
+            fake_response,
+        ]
+        cl = httpclient.HTTPClient(
+            "http://example.com/v2/fake_project",
+            "token",
+            fake_user_agent,
+            api_version=manilaclient.API_MAX_VERSION,
+            retries=1,
+            http_session=http_session,
+            rate_limiter=rate_limiter,
+        )
+
+        cl.get("/shares/detail?limit=1")
+        cl.get_with_base_url("")
+
+        # Every attempt, retries included, is paced.
+        self.assertEqual(
+            [
+                mock.call('GET', '/shares/detail'),
+                mock.call('GET', '/shares/detail'),
+                mock.call('GET', '/'),
+            ],
+            rate_limiter.acquire.call_args_list,
+        )
+
+    def _get_instrumented_client(self, responses, **kwargs):
+        instrument = mock.Mock(spec=metrics.RequestInstrument)
+        events = []
+
+        def record(callback):
+            def _record(request, *args):
+                events.append(
+                    (callback, request.attempt, request.status) + args
+                )
+
+            return _record
+
+        instrument.on_request_start.side_effect = record('start')
+        instrument.on_response.side_effect = record('response')
+        instrument.on_retry.side_effect = record('retry')
+        http_session = mock.Mock()
+        http_session.request.side_effect = responses
+        cl = httpclient.HTTPClient(
+            "http://example.com/v2/fake_project",
+            "token",
+            fake_user_agent,
+            api_version=manilaclient.API_MAX_VERSION,
+            http_session=http_session,
+            instruments=[instrument],
+            **kwargs,
+        )
+        return cl, instrument, events
+
+    def test_instruments(self):
+        self.mock_object(httpclient, 'sleep')
+        self.mock_object(retry.random, 'uniform', mock.Mock(return_value=1))
+        cl, instrument, events = self._get_instrumented_client(
+            [bad_500_response, fake_response], retries=1
+        )
+
+        cl.get("/shares/1234?all_tenants=1")
+
+        self.assertEqual(
+            [
+                ('start', 1, None),
+                ('response', 1, 500),
+                ('retry', 1, 500, 1),
+                ('start', 2, None),
+                ('response', 2, 200),
+            ],
+            events,
+        )
+        request = instrument.on_response.call_args[0][0]
+        self.assertEqual(
+            ('GET', '/shares/{id}'), (request.method, request.path)
+        )
+        self.assertEqual(len(fake_response.content), request.bytes_in)
+        self.assertIsNone(request.error)
+        self.assertGreaterEqual(request.elapsed, 0)
+
+    def test_instruments_connection_error(self):
+        error = requests.exceptions.ConnectionError()
+        cl, instrument, events = self._get_instrumented_client([error])
+
+        self.assertRaises(requests.exceptions.ConnectionError, cl.get, "/hi")
+
+        self.assertEqual([('start', 1, None), ('response', 1, None)], events)
+        request = instrument.on_response.call_args[0][0]
+        self.assertIs(error, request.error)
+        self.assertIsNone(request.bytes_in)
+
+    def test_instrument_errors_are_ignored(self):
+        cl, instrument, events = self._get_instrumented_client([fake_response])
+        instrument.on_response.side_effect = ValueError()
+
+        resp, body = cl.get("/hi")
+
+        self.assertEqual({"hi": "there"}, body)
+
+    def test_in_memory_metrics(self):
+        request_metrics = metrics.InMemoryMetrics()
+        http_session = mock.Mock()
+        http_session.request.return_value = fake_response
+        cl = httpclient.HTTPClient(
+            "http://example.com/v2",
+            "token",
+            fake_user_agent,
+            api_version=manilaclient.API_MAX_VERSION,
+            http_session=http_session,
+        )
+        cl.add_instrument(request_metrics)
+
+        for share_id in ('1', '2', '3'):
+            cl.get(f"/shares/{share_id}")
+
+        self.assertEqual(
+            {('GET', '/shares/{id}', '200'): 3},
+            dict(request_metrics.responses),
+        )
+
+    def test_session_adapter(self):
+        ks_adapter = mock.Mock()
+        ks_adapter.request.return_value = fake_response
+        cl = httpclient.HTTPClient(
+            "http://example.com/v2",
+            None,
+            fake_user_agent,
+            api_version=manilaclient.API_MAX_VERSION,
+            timeout=10,
+            insecure=True,
+            session_adapter=ks_adapter,
+        )
+
+        resp, body = cl.post("/shares", body={'share': {}})
+
+        self.assertEqual({"hi": "there"}, body)
+        self.assertIsNone(cl.http_session)
+        ks_adapter.request.assert_called_once_with(
+            "http://example.com/v2/shares",
+            "POST",
+            headers={
+                cl.API_VERSION_HEADER: self.max_version_str,
+                'User-Agent': fake_user_agent,
+                'Accept': 'application/json',
+                'Content-Type': 'application/json',
+            },
+            raise_exc=False,
+            timeout=10,
+            data='{"share": {}}',
+        )
+        cl.close()
+
+    def test_session_adapter_errors(self):
+        ks_adapter = mock.Mock()
+        ks_adapter.request.side_effect = [
+            bad_400_response,
+            ks_exceptions.ConnectFailure(),
+            fake_response,
+        ]
+        self.mock_object(httpclient, 'sleep')
+        cl = httpclient.HTTPClient(
+            "http://example.com/v2",
+            None,
+            fake_user_agent,
+            api_version=manilaclient.API_MAX_VERSION,
+            retries=1,
+            session_adapter=ks_adapter,
+        )
+
+        self.assertRaises(exceptions.BadRequest, cl.get, "/hi")
+        # Connection errors raised by keystoneauth are retried.
+        resp, body = cl.get("/hi")
+
+        self.assertEqual({"hi": "there"}, body)
+        self.assertEqual(3, ks_adapter.request.call_count)
+
+    def test_session_adapter_token_renewal(self):
+        class FakeAuth(plugin.BaseAuthPlugin):
+            tokens = ['expired', 'fresh']
+
+            def get_token(self, session, **kwargs):
+                return self.tokens[0]
+
+            def invalidate(self):
+                self.tokens.pop(0)
+                return True
+
+        received = []
+
+        def get_payload(handler):
+            token = handler.headers.get('X-Auth-Token')
+            received.append(token)
+            if token != 'fresh':
+                return 401, {'error': {'message': 'Unauthorized'}}
+            return 200, {
+                'version': handler.headers.get(
+                    httpclient.HTTPClient.API_VERSION_HEADER
+                ),
+            }
+
+        ks_adapter = adapter.Adapter(session.Session(auth=FakeAuth()))
+        cl = self._get_stub_server_client(
+            get_payload, session_adapter=ks_adapter
+        )
+
+        for _ in range(2):
+            resp, body = cl.get("/hi")
+            self.assertEqual({'version': self.max_version_str}, body)
+
+        # The expired token was renewed once, and then reused.
+        self.assertEqual(['expired', 'fresh', 'fresh'], received)
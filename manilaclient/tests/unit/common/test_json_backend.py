@@ -0,0 +1,92 @@
+# Licensed under the Apache License, Version 2.0 (the "License"); you may
+# not use this file except in compliance with the License. You may obtain
+# a copy of the License at
+#
+# http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+# WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+# License for the specific language governing permissions and limitations
+# under the License.
+
+import json
+
+import ddt
+
+from manilaclient.common import json_backend
+from manilaclient.tests.unit import utils
+
+
+@ddt.ddt
+class JSONBackendTest(utils.TestCase):
+    def test_default_backend(self):
+        self.assertIs(
+            json_backend.BACKENDS[json_backend.DEFAULT_BACKEND],
+            json_backend.get_loads(),
+        )
+
+    def test_stdlib_backend(self):
+        self.assertIs(json.loads, json_backend.get_loads('json'))
+
+    def test_callable_backend(self):
+        def loads(data):
+            return data
+
+        self.assertIs(loads, json_backend.get_loads(loads))
+
+    def test_unknown_backend(self):
+        self.assertRaises(ValueError, json_backend.get_loads, 'fake')
+
+    @ddt.data(*json_backend.BACKENDS)
+    def test_decode_bytes(self, backend):
+        loads = json_backend.get_loads(backend)
+
+        self.assertEqual(
+            {'share': {'name': 'café', 'size': 1}},
+            loads('{"share": {"name": "café", "size": 1}}'.encode()),
+        )
+        self.assertRaises(ValueError, loads, b'not json')
+
+    @ddt.data(1, 2, 7, 4096)
+    def test_iter_array(self, chunk_size):
+        body = {
+            'shares_links': [{'href': 'fake', 'rel': 'next'}],
+            'shares': [{'id': '1', 'name': 'café'}, {}, 12.5e3, True, None],
+            'count': 5,
+        }
+        payload = json.dumps(body).encode()
+        chunks = (
+            payload[i : i + chunk_size]
+            for i in range(0, len(payload), chunk_size)
+        )
+
+        self.assertEqual(
+            body['shares'], list(json_backend.iter_array(chunks, 'shares'))
+        )
+
+    def test_iter_array_is_lazy(self):
+        chunks = iter([b'{"shares": [{"id": "1"}, ', b'{"id": "2"}]}'])
+
+        items = json_backend.iter_array(chunks, 'shares')
+
+        self.assertEqual({'id': '1'}, next(items))
+        self.assertEqual([b'{"id": "2"}]}'], list(chunks))
+
+    @ddt.data(b'{"shares": []}', b'{"shares": [\n]\n}')
+    def test_iter_array_empty(self, payload):
+        self.assertEqual(
+            [], list(json_backend.iter_array([payload], 'shares'))
+        )
+
+    @ddt.data(b'{}', b'{"snapshots": []}', b'{"shares": {"id": "1"}}')
+    def test_iter_array_missing(self, payload):
+        items = json_backend.iter_array([payload], 'shares')
+
+        self.assertRaises(KeyError, list, items)
+
+    @ddt.data(b'', b'[]', b'{"shares": [1 2]}', b'{"shares": [1,')
+    def test_iter_array_invalid(self, payload):
+        items = json_backend.iter_array([payload], 'shares')
+
+        self.assertRaises(ValueError, list, items)
@@ -0,0 +1,163 @@
+# Licensed under the Apache License, Version 2.0 (the "License"); you may
+# not use this file except in compliance with the License. You may obtain
+# a copy of the License at
+#
+# http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+# WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+# License for the specific language governing permissions and limitations
+# under the License.
+
+import os
+import stat
+
+import ddt
+import fixtures
+
+from manilaclient.common import metrics
+from manilaclient.tests.unit import utils
+
+SHARE_ID = 'b2d18606-2673-4965-885a-4f5a8b955b9b'
+
+
+def _request(method='GET', path='/shares/{id}', status=200, elapsed=0.2):
+    request = metrics.RequestInfo(method, path)
+    request.attempt = 1
+    request.status = status
+    request.elapsed = elapsed
+    request.bytes_out = 10
+    request.bytes_in = 100
+    return request
+
+
+@ddt.ddt
+class PathTemplateTest(utils.TestCase):
+    @ddt.data(
+        ('/', '/'),
+        ('/shares/detail', '/shares/detail'),
+        (f'/shares/{SHARE_ID}', '/shares/{id}'),
+        (f'/shares/{SHARE_ID}/action', '/shares/{id}/action'),
+        (
+            f'/shares/{SHARE_ID}/export_locations/{SHARE_ID}',
+            '/shares/{id}/export_locations/{id}',
+        ),
+        (f'/shares/{SHARE_ID}/metadata/backup', '/shares/{id}/metadata/{key}'),
+        (
+            '/types/1234/extra_specs/snapshot_support',
+            '/types/{id}/extra_specs/{key}',
+        ),
+        (
+            '/quota-sets/16e1ab15c35a457e9c2b2aa189f544e1/detail',
+            '/quota-sets/{id}/detail',
+        ),
+        ('/scheduler-stats/pools/detail', '/scheduler-stats/pools/detail'),
+        ('/shares/myshare', '/shares/{id}'),
+        ('/types/gold_tier', '/types/{id}'),
+        ('/types/default', '/types/default'),
+        ('/services/enable', '/services/enable'),
+        (
+            '/share-group-types/1234/group-specs/consistent_snapshot_support',
+            '/share-group-types/{id}/group-specs/{key}',
+        ),
+    )
+    @ddt.unpack
+    def test_get_path_template(self, path, expected):
+        self.assertEqual(expected, metrics.get_path_template(path))
+
+
+class HistogramTest(utils.TestCase):
+    def test_observe(self):
+        histogram = metrics.Histogram(buckets=(1, 0.1))
+
+        for value in (0.05, 0.1, 0.5, 3):
+            histogram.observe(value)
+
+        self.assertEqual(4, histogram.count)
+        self.assertAlmostEqual(3.65, histogram.sum)
+        self.assertEqual(
+            [(0.1, 2), (1, 3), (float('inf'), 4)],
+            histogram.cumulative_counts(),
+        )
+
+
+class InMemoryMetricsTest(utils.TestCase):
+    def test_collect(self):
+        request_metrics = metrics.InMemoryMetrics()
+        request = _request(status=None)
+        request.error = Exception()
+
+        request_metrics.on_response(request)
+        request_metrics.on_retry(request, 1)
+        request_metrics.on_response(_request())
+
+        key = ('GET', '/shares/{id}')
+        self.assertEqual(2, request_metrics.latency[key].count)
+        self.assertEqual(
+            {key + ('error',): 1, key + ('200',): 1},
+            dict(request_metrics.responses),
+        )
+        self.assertEqual({key: 1}, dict(request_metrics.retries))
+        self.assertEqual({key: 20}, dict(request_metrics.bytes_out))
+        self.assertEqual({key: 200}, dict(request_metrics.bytes_in))
+
+        request_metrics.reset()
+
+        self.assertEqual({}, dict(request_metrics.latency))
+        self.assertEqual({}, dict(request_metrics.responses))
+
+
+class PrometheusTextfileExporterTest(utils.TestCase):
+    def setUp(self):
+        super().setUp()
+        self.metrics = metrics.InMemoryMetrics(buckets=(0.1, 1))
+        self.metrics.on_response(_request())
+        self.metrics.on_response(_request(method='POST', status=202))
+        self.metrics.on_retry(_request(), 0.5)
+
+    def test_render(self):
+        exporter = metrics.PrometheusTextfileExporter(self.metrics, 'x.prom')
+
+        text = exporter.render()
+
+        name = 'manilaclient_request_duration_seconds'
+        labels = 'method="GET",path="/shares/{id}"'
+        for line in (
+            f'# TYPE {name} histogram',
+            f'{name}_bucket{{{labels},le="0.1"}} 0',
+            f'{name}_bucket{{{labels},le="1"}} 1',
+            f'{name}_bucket{{{labels},le="+Inf"}} 1',
+            f'{name}_sum{{{labels}}} 0.2',
+            f'{name}_count{{{labels}}} 1',
+            '# TYPE manilaclient_responses_total counter',
+            f'manilaclient_responses_total{{{labels},status="200"}} 1',
+            'manilaclient_responses_total{method="POST",'
+            'path="/shares/{id}",status="202"} 1',
+            f'manilaclient_retries_total{{{labels}}} 1',
+            f'manilaclient_request_bytes_total{{{labels}}} 10',
+            f'manilaclient_response_bytes_total{{{labels}}} 100',
+        ):
+            self.assertIn(line + '\n', text)
+
+    def test_render_escapes_labels(self):
+        request_metrics = metrics.InMemoryMetrics()
+        request_metrics.on_retry(_request(path='/a"b\\c'), 1)
+        exporter = metrics.PrometheusTextfileExporter(request_metrics, 'x')
+
+        self.assertIn(
+            'manilaclient_retries_total{method="GET",path="/a\\"b\\\\c"} 1',
+            exporter.render(),
+        )
+
+    def test_write(self):
+        tmp_dir = self.useFixture(fixtures.TempDir()).path
+        path = os.path.join(tmp_dir, 'manilaclient.prom')
+        exporter = metrics.PrometheusTextfileExporter(self.metrics, path)
+
+        exporter.write()
+
+        with open(path) as f:
+            self.assertEqual(exporter.render(), f.read())
+        self.assertEqual(['manilaclient.prom'], os.listdir(tmp_dir))
+        self.assertTrue(os.stat(path).st_mode & stat.S_IROTH)
@@ -0,0 +1,148 @@
+# Licensed under the Apache License, Version 2.0 (the "License"); you may
+# not use this file except in compliance with the License. You may obtain
+# a copy of the License at
+#
+# http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+# WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+# License for the specific language governing permissions and limitations
+# under the License.
+
+from concurrent import futures
+from unittest import mock
+
+import ddt
+
+from manilaclient.common import rate_limiter
+from manilaclient.tests.unit import utils
+from manilaclient.v2 import limits
+
+
+class TokenBucketTest(utils.TestCase):
+    def setUp(self):
+        super().setUp()
+        self.now = 100.0
+        self.mock_object(
+            rate_limiter.time, 'monotonic', mock.Mock(side_effect=self._now)
+        )
+        self.mock_sleep = self.mock_object(rate_limiter.time, 'sleep')
+
+    def _now(self):
+        return self.now
+
+    def test_burst_then_paced(self):
+        bucket = rate_limiter.TokenBucket(rate=2, capacity=3)
+
+        delays = [bucket.reserve() for _ in range(5)]
+
+        self.assertEqual([0, 0, 0, 0.5, 1.0], delays)
+
+    def test_refill_is_capped(self):
+        bucket = rate_limiter.TokenBucket(rate=1, capacity=2, tokens=0)
+
+        self.assertEqual(1, bucket.reserve())
+        self.now += 60
+        delays = [bucket.reserve() for _ in range(3)]
+
+        self.assertEqual([0, 0, 1], delays)
+
+    def test_acquire_sleeps(self):
+        bucket = rate_limiter.TokenBucket(rate=4, capacity=1)
+
+        self.assertEqual(0, bucket.acquire())
+        self.assertEqual(0.25, bucket.acquire())
+
+        self.mock_sleep.assert_called_once_with(0.25)
+
+    def test_concurrent_reservations(self):
+        bucket = rate_limiter.TokenBucket(rate=10, capacity=1)
+
+        with futures.ThreadPoolExecutor(max_workers=8) as executor:
+            delays = list(executor.map(lambda _: bucket.reserve(), range(100)))
+
+        # Every caller got its own token, none was handed out twice.
+        self.assertEqual(
+            [round(i / 10, 6) for i in range(100)],
+            sorted(round(delay, 6) for delay in delays),
+        )
+
+    def test_invalid(self):
+        self.assertRaises(ValueError, rate_limiter.TokenBucket, 0, 1)
+        self.assertRaises(ValueError, rate_limiter.TokenBucket, 1, 0)
+
+
+@ddt.ddt
+class RateLimiterTest(utils.TestCase):
+    def setUp(self):
+        super().setUp()
+        self.mock_object(
+            rate_limiter.time, 'monotonic', mock.Mock(return_value=100.0)
+        )
+        self.mock_sleep = self.mock_object(rate_limiter.time, 'sleep')
+
+    @ddt.data(
+        ('POST', '/shares', True),
+        ('post', '/shares/1234/action', True),
+        ('GET', '/shares', False),
+        ('POST', '/snapshots', False),
+    )
+    @ddt.unpack
+    def test_matches(self, method, path, expected):
+        limit = rate_limiter.RateLimit('POST', '^/shares', 10)
+
+        self.assertEqual(expected, limit.matches(method, path))
+
+    def test_matches_any_verb(self):
+        limit = rate_limiter.RateLimit('*', '.*', 10)
+
+        self.assertTrue(limit.matches('DELETE', '/shares/1234'))
+
+    def test_invalid_unit(self):
+        self.assertRaises(
+            ValueError, rate_limiter.RateLimit, 'GET', '.*', 10, 'WEEK'
+        )
+
+    def test_acquire(self):
+        limiter = rate_limiter.RateLimiter()
+        limiter.add_limit('POST', '.*', 1, unit='SECOND')
+        limiter.add_limit('POST', '^/shares', 60, unit='MINUTE')
+        limiter.add_limit('GET', '.*', 1, unit='SECOND')
+
+        self.assertEqual(0, limiter.acquire('POST', '/shares'))
+        self.assertEqual(1, limiter.acquire('POST', '/shares'))
+        self.assertEqual(2, limiter.acquire('POST', '/snapshots'))
+        self.assertEqual(0, limiter.acquire('GET', '/shares'))
+
+        self.assertEqual(
+            [mock.call(1), mock.call(2)], self.mock_sleep.call_args_list
+        )
+
+    def test_from_rate_limits(self):
+        rate_limits = [
+            limits.RateLimit('POST', '*', '.*', 10, 1, 'MINUTE', 'fake'),
+            limits.RateLimit('GET', '*', '^/shares', 5, 5, 'SECOND', 'fake'),
+        ]
+
+        limiter = rate_limiter.RateLimiter.from_rate_limits(rate_limits)
+
+        self.assertEqual(2, len(limiter.limits))
+        self.assertEqual(0, limiter.acquire('POST', '/shares'))
+        # Only one request was left in the current minute.
+        self.assertEqual(6, limiter.acquire('POST', '/shares'))
+        for _ in range(5):
+            self.assertEqual(0, limiter.acquire('GET', '/shares/detail'))
+        self.assertEqual(0.2, limiter.acquire('GET', '/shares/detail'))
+
+    def test_from_rate_limits_without_allowed_requests(self):
+        rate_limits = [
+            limits.RateLimit('POST', '*', '.*', 0, 0, 'MINUTE', 'fake'),
+            limits.RateLimit('GET', '*', '^/shares', 5, 5, 'SECOND', 'fake'),
+        ]
+
+        limiter = rate_limiter.RateLimiter.from_rate_limits(rate_limits)
+
+        self.assertEqual(1, len(limiter.limits))
+        self.assertEqual(0, limiter.acquire('POST', '/shares'))
+        self.assertFalse(limiter.limits[0].matches('POST', '/shares'))
@@ -0,0 +1,73 @@
+# Licensed under the Apache License, Version 2.0 (the "License"); you may
+# not use this file except in compliance with the License. You may obtain
+# a copy of the License at
+#
+# http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+# WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+# License for the specific language governing permissions and limitations
+# under the License.
+
+from unittest import mock
+
+from manilaclient.common import resource_cache
+from manilaclient.tests.unit import utils
+
+
+class ResourceCacheTest(utils.TestCase):
+    def setUp(self):
+        super().setUp()
+        self.mock_monotonic = self.mock_object(
+            resource_cache.time, 'monotonic', mock.Mock(return_value=100)
+        )
+        self.cache = resource_cache.ResourceCache(ttl=10, maxsize=2)
+
+    def test_get_set(self):
+        self.assertIsNone(self.cache.get('key'))
+
+        self.cache.set('key', {'share': {'id': 'fake'}})
+
+        self.assertEqual({'share': {'id': 'fake'}}, self.cache.get('key'))
+
+    def test_values_are_copied(self):
+        value = {'share': {'id': 'fake'}}
+        self.cache.set('key', value)
+        value['share']['id'] = 'changed'
+        self.cache.get('key')['share']['id'] = 'changed'
+
+        self.assertEqual({'share': {'id': 'fake'}}, self.cache.get('key'))
+
+    def test_entries_expire(self):
+        self.cache.set('key', 'value')
+
+        self.mock_monotonic.return_value = 109
+        self.assertEqual('value', self.cache.get('key'))
+        self.mock_monotonic.return_value = 110
+        self.assertIsNone(self.cache.get('key'))
+        self.assertEqual(0, len(self.cache))
+
+    def test_least_recently_used_is_evicted(self):
+        self.cache.set('key1', 'value1')
+        self.cache.set('key2', 'value2')
+        self.cache.get('key1')
+
+        self.cache.set('key3', 'value3')
+
+        self.assertEqual('value1', self.cache.get('key1'))
+        self.assertIsNone(self.cache.get('key2'))
+        self.assertEqual('value3', self.cache.get('key3'))
+
+    def test_clear(self):
+        self.cache.set('key', 'value')
+
+        self.cache.clear()
+
+        self.assertIsNone(self.cache.get('key'))
+
+    def test_bypass(self):
+        self.assertTrue(self.cache.active)
+        with resource_cache.bypass():
+            self.assertFalse(self.cache.active)
+        self.assertTrue(self.cache.active)
@@ -0,0 +1,151 @@
+# Licensed under the Apache License, Version 2.0 (the "License"); you may
+# not use this file except in compliance with the License. You may obtain
+# a copy of the License at
+#
+# http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+# WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+# License for the specific language governing permissions and limitations
+# under the License.
+
+from unittest import mock
+
+import ddt
+from keystoneauth1 import exceptions as ks_exceptions
+import requests
+
+from manilaclient.common import retry
+from manilaclient import exceptions
+from manilaclient.tests.unit import utils
+
+
+@ddt.ddt
+class RetryPolicyTest(utils.TestCase):
+    @ddt.data(
+        ('GET', requests.exceptions.ConnectionError(), True),
+        ('GET', requests.exceptions.ReadTimeout(), True),
+        ('GET', exceptions.InternalServerError(), True),
+        ('GET', exceptions.GatewayTimeout(), True),
+        ('DELETE', exceptions.BadGateway(), True),
+        ('GET', exceptions.BadRequest(), False),
+        ('GET', exceptions.NotFound(), False),
+        ('GET', exceptions.Unauthorized(), False),
+        ('GET', exceptions.RequestEntityTooLarge(), False),
+        ('GET', exceptions.RequestEntityTooLarge(retry_after='5'), True),
+        ('POST', requests.exceptions.ConnectTimeout(), True),
+        ('POST', exceptions.TooManyRequests(), True),
+        ('POST', exceptions.ServiceUnavailable(), True),
+        ('POST', requests.exceptions.ConnectionError(), False),
+        ('POST', requests.exceptions.ReadTimeout(), False),
+        ('POST', exceptions.InternalServerError(), False),
+        ('GET', requests.exceptions.ChunkedEncodingError(), True),
+        ('GET', ks_exceptions.ConnectFailure(), True),
+        ('GET', requests.exceptions.InvalidURL(), False),
+        ('GET', requests.exceptions.MissingSchema(), False),
+        ('GET', requests.exceptions.InvalidHeader(), False),
+        ('GET', requests.exceptions.SSLError(), False),
+        ('GET', ks_exceptions.SSLError(), False),
+    )
+    @ddt.unpack
+    def test_is_retryable(self, method, error, expected):
+        policy = retry.RetryPolicy(retries=1)
+
+        self.assertEqual(expected, policy.is_retryable(method, error))
+
+    def test_is_retryable_non_idempotent(self):
+        policy = retry.RetryPolicy(retries=1, retry_non_idempotent=True)
+
+        self.assertTrue(
+            policy.is_retryable('POST', exceptions.InternalServerError())
+        )
+        self.assertFalse(policy.is_retryable('POST', exceptions.BadRequest()))
+
+    def test_get_delay_full_jitter(self):
+        mock_uniform = self.mock_object(
+            retry.random, 'uniform', mock.Mock(return_value=0.5)
+        )
+        policy = retry.RetryPolicy(retries=10, base_delay=1, max_delay=5)
+        error = exceptions.InternalServerError()
+
+        delays = [policy.get_delay('GET', n, error) for n in range(1, 6)]
+
+        self.assertEqual([0.5] * 5, delays)
+        self.assertEqual(
+            [mock.call(0, backoff) for backoff in (1, 2, 4, 5, 5)],
+            mock_uniform.call_args_list,
+        )
+
+    def test_get_delay_retries_exhausted(self):
+        policy = retry.RetryPolicy(retries=2)
+        error = exceptions.InternalServerError()
+
+        self.assertIsNotNone(policy.get_delay('GET', 2, error))
+        self.assertIsNone(policy.get_delay('GET', 3, error))
+
+    def test_get_delay_not_retryable(self):
+        policy = retry.RetryPolicy(retries=2)
+
+        self.assertIsNone(policy.get_delay('GET', 1, exceptions.NotFound()))
+
+    def test_get_delay_retry_after(self):
+        policy = retry.RetryPolicy(retries=2, max_delay=10)
+
+        self.assertEqual(
+            7,
+            policy.get_delay(
+                'POST', 1, exceptions.TooManyRequests(retry_after='7')
+            ),
+        )
+        self.assertIsNone(
+            policy.get_delay(
+                'POST', 1, exceptions.TooManyRequests(retry_after='11')
+            )
+        )
+
+    def test_get_delay_budget(self):
+        budget = retry.RetryBudget(ratio=0.5, reserve=2)
+        policy = retry.RetryPolicy(retries=5, budget=budget)
+        error = exceptions.ServiceUnavailable()
+
+        self.assertIsNotNone(policy.get_delay('GET', 1, error))
+        self.assertIsNotNone(policy.get_delay('GET', 1, error))
+        self.assertIsNone(policy.get_delay('GET', 1, error))
+
+        policy.record_request()
+        policy.record_request()
+
+        self.assertIsNotNone(policy.get_delay('GET', 1, error))
+        self.assertIsNone(policy.get_delay('GET', 1, error))
+
+    def test_get_delay_without_budget(self):
+        policy = retry.RetryPolicy(retries=1, budget=False)
+
+        self.assertIsNone(policy.budget)
+        for _ in range(50):
+            self.assertIsNotNone(
+                policy.get_delay('GET', 1, exceptions.ServiceUnavailable())
+            )
+
+
+class RetryBudgetTest(utils.TestCase):
+    def test_deposit_is_capped(self):
+        budget = retry.RetryBudget(ratio=1, reserve=2)
+
+        for _ in range(10):
+            budget.deposit()
+
+        self.assertTrue(budget.withdraw())
+        self.assertTrue(budget.withdraw())
+        self.assertFalse(budget.withdraw())
+
+    def test_withdraw(self):
+        budget = retry.RetryBudget(ratio=0.25, reserve=1)
+
+        self.assertTrue(budget.withdraw())
+        for _ in range(3):
+            budget.deposit()
+            self.assertFalse(budget.withdraw())
+        budget.deposit()
+        self.assertTrue(budget.withdraw())
@@ -0,0 +1,140 @@
+# Licensed under the Apache License, Version 2.0 (the "License"); you may
+# not use this file except in compliance with the License. You may obtain
+# a copy of the License at
+#
+# http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+# WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+# License for the specific language governing permissions and limitations
+# under the License.
+
+from unittest import mock
+
+from manilaclient.common.apiclient import exceptions
+from manilaclient.common import waiters
+from manilaclient.tests.unit import utils
+
+
+class FakeManager:
+    """Serve the states of resources, one list of states per poll."""
+
+    def __init__(self, states, listed=None):
+        self.states = states
+        self.listed = listed
+        self.polls = {res_id: 0 for res_id in states}
+        self.list = mock.Mock(side_effect=self._list)
+        self.get = mock.Mock(side_effect=self._get)
+
+    def _resource(self, res_id):
+        states = self.states[res_id]
+        status = states[min(self.polls[res_id], len(states) - 1)]
+        self.polls[res_id] += 1
+        if status is None:
+            raise exceptions.NotFound()
+        return mock.Mock(id=res_id, status=status)
+
+    def _list(self, search_opts=None):
+        listed = self.states if self.listed is None else self.listed
+        resources = []
+        for res_id in listed:
+            try:
+                resources.append(self._resource(res_id))
+            except exceptions.NotFound:
+                pass
+        return resources
+
+    def _get(self, res_id):
+        return self._resource(res_id)
+
+
+class WaitersTest(utils.TestCase):
+    def setUp(self):
+        super().setUp()
+        self.mock_sleep = self.mock_object(waiters.time, 'sleep')
+
+    def test_wait_for_delete(self):
+        manager = FakeManager(
+            {
+                'id1': ['deleting', None],
+                'id2': ['deleting', 'deleting', None],
+                'id3': ['deleting', 'error_deleting'],
+            }
+        )
+
+        result = waiters.wait_for_delete(
+            manager, ['id1', 'id2', 'id3'], search_opts={'status': 'deleting'}
+        )
+
+        self.assertEqual({'id1': True, 'id2': True, 'id3': False}, result)
+        # One listing per polling interval, no matter how many resources
+        # are tracked.
+        self.assertEqual(3, manager.list.call_count)
+        manager.list.assert_called_with(search_opts={'status': 'deleting'})
+        self.assertEqual(2, self.mock_sleep.call_count)
+
+    def test_wait_for_delete_falls_back_to_get(self):
+        manager = FakeManager(
+            {'id1': ['deleting', None], 'id2': ['error_deleting']},
+            listed=['id1'],
+        )
+
+        result = waiters.wait_for_delete(
+            manager, ['id1', 'id2'], search_opts={'status': 'deleting'}
+        )
+
+        self.assertEqual({'id1': True, 'id2': False}, result)
+        manager.get.assert_has_calls([mock.call('id2'), mock.call('id1')])
+
+    def test_wait_for_delete_without_listing(self):
+        manager = FakeManager({'id1': ['deleting', None]})
+
+        result = waiters.wait_for_delete(manager, ['id1'])
+
+        self.assertEqual({'id1': True}, result)
+        manager.list.assert_not_called()
+        self.assertEqual(2, manager.get.call_count)
+
+    def test_wait_for_delete_timeout(self):
+        manager = FakeManager({'id1': ['deleting'], 'id2': [None]})
+        self.mock_object(
+            waiters.time, 'monotonic', mock.Mock(side_effect=[0, 10, 31])
+        )
+
+        result = waiters.wait_for_delete(
+            manager, ['id1', 'id2'], search_opts={}, timeout=30
+        )
+
+        self.assertEqual({'id1': False, 'id2': True}, result)
+        self.assertEqual(2, manager.list.call_count)
+
+    def test_backoff_is_jittered_and_capped(self):
+        manager = FakeManager({'id1': ['deleting'] * 5 + [None]})
+        self.mock_object(waiters.random, 'uniform', mock.Mock(return_value=1))
+
+        waiters.wait_for_delete(
+            manager, ['id1'], sleep_time=2, max_sleep_time=5
+        )
+
+        self.assertEqual(
+            [mock.call(2), mock.call(3), mock.call(4.5)] + [mock.call(5)] * 2,
+            self.mock_sleep.call_args_list,
+        )
+        waiters.random.uniform.assert_called_with(0.5, 1)
+
+    def test_wait_for_status(self):
+        manager = FakeManager(
+            {
+                'id1': ['creating', 'available'],
+                'id2': ['creating', 'error'],
+                'id3': [None],
+            }
+        )
+
+        result = waiters.wait_for_status(
+            manager, ['id1', 'id2', 'id3'], search_opts={}
+        )
+
+        self.assertEqual({'id1': True, 'id2': False, 'id3': False}, result)
+        self.assertEqual(2, manager.list.call_count)
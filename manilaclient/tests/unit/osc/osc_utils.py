@@ -76,3 +76,12 @@ class TestCommand(TestCase):
                 self.assertIn(attr, parsed_args)
                 self.assertEqual(value, getattr(parsed_args, attr))
         return parsed_args
+
+
+def fake_waiter(result):
+    """Fake a batched waiter reporting the same result for every resource"""
+
+    def _wait(manager, res_ids, **kwargs):
+        return dict.fromkeys(res_ids, result)
+
+    return _wait
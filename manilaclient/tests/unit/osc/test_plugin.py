@@ -0,0 +1,189 @@
+#   Licensed under the Apache License, Version 2.0 (the "License"); you may
+#   not use this file except in compliance with the License. You may obtain
+#   a copy of the License at
+#
+#        http://www.apache.org/licenses/LICENSE-2.0
+#
+#   Unless required by applicable law or agreed to in writing, software
+#   distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+#   WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+#   License for the specific language governing permissions and limitations
+#   under the License.
+
+import argparse
+from unittest import mock
+
+import fixtures
+
+from manilaclient import api_versions
+from manilaclient.common import resource_cache
+from manilaclient.osc import plugin
+from manilaclient.tests.unit.osc import osc_utils
+
+ENDPOINT = 'http://manila.example.com/v2'
+
+
+class TestMakeClient(osc_utils.TestCase):
+    def setUp(self):
+        super().setUp()
+        self.cache_dir = self.useFixture(fixtures.TempDir()).path
+        self.useFixture(
+            fixtures.EnvironmentVariable(
+                'MANILACLIENT_CACHE_DIR', self.cache_dir
+            )
+        )
+
+        self.instance = mock.Mock()
+        self.instance._api_version = {plugin.API_NAME: '2.50'}
+        self.instance._cli_options = argparse.Namespace(
+            os_endpoint_override=ENDPOINT,
+            debug=False,
+            os_share_api_version_cache_ttl=plugin.DEFAULT_VERSION_CACHE_TTL,
+            os_share_api_version_refresh=False,
+        )
+
+        self.mock_client = self.useFixture(
+            fixtures.MockPatchObject(plugin.client, 'Client')
+        ).mock
+        self.mock_get_range = self.useFixture(
+            fixtures.MockPatchObject(
+                api_versions,
+                'get_server_version_range',
+                mock.Mock(
+                    return_value=(
+                        api_versions.APIVersion('2.0'),
+                        api_versions.APIVersion('2.60'),
+                    )
+                ),
+            )
+        ).mock
+        self.mock_client_class = self.useFixture(
+            fixtures.MockPatchObject(plugin.utils, 'get_client_class')
+        ).mock
+
+    def _assert_client_version(self, version):
+        client_kwargs = self.mock_client_class.return_value.call_args[1]
+        self.assertEqual(
+            api_versions.APIVersion(version), client_kwargs['api_version']
+        )
+
+    def test_make_client_caches_discovered_version(self):
+        plugin.make_client(self.instance)
+        plugin.make_client(self.instance)
+
+        self.assertEqual(1, self.mock_get_range.call_count)
+        self.assertEqual(1, self.mock_client.call_count)
+        self._assert_client_version('2.50')
+
+    def test_make_client_resource_cache_disabled_by_default(self):
+        self.useFixture(
+            fixtures.EnvironmentVariable('OS_SHARE_RESOURCE_CACHE_TTL')
+        )
+        options = plugin.build_option_parser(argparse.ArgumentParser())
+        self.instance._cli_options.os_share_resource_cache_ttl = (
+            options.parse_args([]).os_share_resource_cache_ttl
+        )
+
+        plugin.make_client(self.instance)
+
+        client_kwargs = self.mock_client_class.return_value.call_args[1]
+        self.assertEqual(0, client_kwargs['resource_cache_ttl'])
+
+    def test_make_client_enables_resource_cache(self):
+        self.instance._cli_options.os_share_resource_cache_ttl = (
+            resource_cache.DEFAULT_TTL
+        )
+
+        plugin.make_client(self.instance)
+
+        client_kwargs = self.mock_client_class.return_value.call_args[1]
+        self.assertEqual(
+            resource_cache.DEFAULT_TTL, client_kwargs['resource_cache_ttl']
+        )
+
+    def test_make_client_retry_policy(self):
+        self.instance._cli_options.os_share_retries = 3
+        self.instance._cli_options.os_share_retry_max_delay = 5
+
+        plugin.make_client(self.instance)
+
+        client_kwargs = self.mock_client_class.return_value.call_args[1]
+        retry_policy = client_kwargs['retry_policy']
+        self.assertEqual(3, retry_policy.retries)
+        self.assertEqual(5, retry_policy.max_delay)
+        # The same policy, and retry budget, is used to discover versions.
+        self.assertIs(
+            retry_policy, self.mock_client.call_args[1]['retry_policy']
+        )
+
+    def test_make_client_no_retries_by_default(self):
+        plugin.make_client(self.instance)
+
+        client_kwargs = self.mock_client_class.return_value.call_args[1]
+        self.assertEqual(0, client_kwargs['retry_policy'].retries)
+
+    def test_make_client_refresh(self):
+        plugin.make_client(self.instance)
+        self.instance._cli_options.os_share_api_version_refresh = True
+        plugin.make_client(self.instance)
+
+        self.assertEqual(2, self.mock_get_range.call_count)
+
+    def test_make_client_cache_disabled(self):
+        self.instance._cli_options.os_share_api_version_cache_ttl = 0
+
+        plugin.make_client(self.instance)
+        plugin.make_client(self.instance)
+
+        self.assertEqual(2, self.mock_get_range.call_count)
+        self.assertEqual({}, plugin._read_version_cache())
+
+    def test_make_client_cache_expired(self):
+        mock_time = self.useFixture(
+            fixtures.MockPatchObject(plugin.time, 'time')
+        ).mock
+        mock_time.return_value = 1000
+        plugin.make_client(self.instance)
+        mock_time.return_value = 1000 + plugin.DEFAULT_VERSION_CACHE_TTL + 1
+        plugin.make_client(self.instance)
+
+        self.assertEqual(2, self.mock_get_range.call_count)
+
+    def test_make_client_cache_keyed_by_endpoint(self):
+        plugin.make_client(self.instance)
+        self.instance._cli_options.os_endpoint_override = ENDPOINT + '/other'
+        plugin.make_client(self.instance)
+
+        self.assertEqual(2, self.mock_get_range.call_count)
+        self.assertEqual(
+            {ENDPOINT, ENDPOINT + '/other'},
+            set(plugin._read_version_cache()),
+        )
+
+    def test_make_client_downgrades_to_cached_max_version(self):
+        self.instance._api_version = {plugin.API_NAME: '2.70'}
+
+        plugin.make_client(self.instance)
+        plugin.make_client(self.instance)
+
+        self.assertEqual(1, self.mock_get_range.call_count)
+        self._assert_client_version('2.60')
+
+    def test_make_client_server_without_microversions_not_cached(self):
+        self.mock_get_range.return_value = (
+            api_versions.APIVersion(),
+            api_versions.APIVersion(),
+        )
+
+        plugin.make_client(self.instance)
+
+        self.assertEqual({}, plugin._read_version_cache())
+
+    def test_corrupted_cache_is_ignored(self):
+        with open(plugin._get_version_cache_path(), 'w') as cache_file:
+            cache_file.write('not json')
+
+        plugin.make_client(self.instance)
+
+        self.assertEqual(1, self.mock_get_range.call_count)
+        self.assertIn(ENDPOINT, plugin._read_version_cache())
@@ -0,0 +1,245 @@
+#   Licensed under the Apache License, Version 2.0 (the "License"); you may
+#   not use this file except in compliance with the License. You may obtain
+#   a copy of the License at
+#
+#        http://www.apache.org/licenses/LICENSE-2.0
+#
+#   Unless required by applicable law or agreed to in writing, software
+#   distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+#   WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+#   License for the specific language governing permissions and limitations
+#   under the License.
+
+import threading
+from unittest import mock
+
+import ddt
+from osc_lib import exceptions as osc_exceptions
+
+from manilaclient.common import constants
+from manilaclient.common import httpclient
+from manilaclient import exceptions
+from manilaclient.osc import utils
+from manilaclient.tests.unit.osc import osc_utils
+
+SHARE_ID = 'b2d18606-2673-4965-885a-4f5a8b955b9b'
+
+
+class TestRunInParallel(osc_utils.TestCase):
+    def test_results_in_order(self):
+        barrier = threading.Barrier(3, timeout=5)
+
+        def func(item):
+            # The first items complete last.
+            if item < 3:
+                barrier.wait()
+            return item * 2
+
+        self.assertEqual(
+            [0, 2, 4, 6, 8], utils.run_in_parallel(func, range(5), parallel=4)
+        )
+
+    def test_errors(self):
+        # NOTE: errors are propagated, commands report failures per item by
+        # catching them in func.
+        calls = []
+
+        def func(item):
+            calls.append(item)
+            if item == 1:
+                raise exceptions.NotFound(404)
+            return item
+
+        self.assertRaises(
+            exceptions.NotFound,
+            utils.run_in_parallel,
+            func,
+            range(4),
+            parallel=2,
+        )
+        self.assertIn(1, calls)
+
+    def test_sequential(self):
+        threads = set()
+
+        def func(item):
+            threads.add(threading.current_thread())
+            return item
+
+        self.assertEqual(
+            [0, 1, 2], utils.run_in_parallel(func, range(3), parallel=1)
+        )
+        self.assertEqual({threading.current_thread()}, threads)
+
+    def test_request_headers(self):
+        def func(item):
+            return httpclient._request_headers.get({}).get('X-Fake')
+
+        with httpclient.request_headers({'X-Fake': 'fake'}):
+            results = utils.run_in_parallel(func, range(3), parallel=3)
+
+        self.assertEqual(['fake'] * 3, results)
+
+    def test_invalid_parallel(self):
+        func = mock.Mock()
+
+        self.assertRaises(
+            exceptions.CommandError,
+            utils.run_in_parallel,
+            func,
+            range(3),
+            parallel=0,
+        )
+        func.assert_not_called()
+
+
+class TestFetchConcurrently(osc_utils.TestCase):
+    def test_fetch_concurrently(self):
+        # Both calls have to be in flight at the same time to get past the
+        # barrier.
+        barrier = threading.Barrier(2, timeout=5)
+
+        def call(result):
+            barrier.wait()
+            return result
+
+        self.assertEqual(
+            ['share', 'locations'],
+            utils.fetch_concurrently(
+                lambda: call('share'), lambda: call('locations')
+            ),
+        )
+
+    def test_fetch_concurrently_error(self):
+        second = mock.Mock(side_effect=exceptions.NotFound(404))
+        third = mock.Mock(return_value='third')
+
+        self.assertRaises(
+            exceptions.NotFound,
+            utils.fetch_concurrently,
+            lambda: 'first',
+            second,
+            third,
+        )
+        # The other calls complete, the error is raised afterwards.
+        third.assert_called_once_with()
+
+    def test_fetch_concurrently_first_call_error(self):
+        second = mock.Mock(return_value='second')
+
+        self.assertRaises(
+            exceptions.NotFound,
+            utils.fetch_concurrently,
+            mock.Mock(side_effect=exceptions.NotFound(404)),
+            second,
+        )
+        second.assert_called_once_with()
+
+    def test_fetch_concurrently_shared_executor(self):
+        def call():
+            return threading.current_thread().name
+
+        with mock.patch.object(
+            utils.futures, 'ThreadPoolExecutor'
+        ) as executor:
+            names = utils.fetch_concurrently(call, call, call)
+            names += utils.fetch_concurrently(call, call)
+
+        executor.assert_not_called()
+        self.assertEqual(threading.current_thread().name, names[0])
+        for name in names[1:3] + names[4:]:
+            self.assertTrue(name.startswith('manilaclient-fetch'))
+
+    def test_request_headers(self):
+        def call():
+            return httpclient._request_headers.get({}).get('X-Fake')
+
+        with httpclient.request_headers({'X-Fake': 'fake'}):
+            fetched = utils.fetch_concurrently(call, call)
+
+        self.assertEqual(['fake'] * 2, fetched)
+
+
+class TestFindResourceAndFetch(osc_utils.TestCase):
+    def setUp(self):
+        super().setUp()
+        self.manager = mock.Mock()
+        self.find_resource = mock.Mock(return_value=mock.Mock(id=SHARE_ID))
+        self.fetch = mock.Mock(return_value=['location'])
+
+    def test_by_id(self):
+        barrier = threading.Barrier(2, timeout=5)
+
+        def find_resource(manager, name_or_id):
+            barrier.wait()
+            return mock.Mock(id=SHARE_ID)
+
+        def fetch(resource_id):
+            barrier.wait()
+            return ['l']
+
+        self.find_resource.side_effect = find_resource
+        self.fetch.side_effect = fetch
+
+        resource, locations = utils.find_resource_and_fetch(
+            self.find_resource, self.manager, SHARE_ID, self.fetch
+        )
+
+        self.assertEqual(SHARE_ID, resource.id)
+        self.assertEqual(['l'], locations)
+        self.find_resource.assert_called_once_with(self.manager, SHARE_ID)
+        self.fetch.assert_called_once_with(SHARE_ID)
+
+    def test_by_name(self):
+        resource, locations = utils.find_resource_and_fetch(
+            self.find_resource, self.manager, 'share', self.fetch
+        )
+
+        self.assertEqual(SHARE_ID, resource.id)
+        self.assertEqual(['location'], locations)
+        self.find_resource.assert_called_once_with(self.manager, 'share')
+        self.fetch.assert_called_once_with(SHARE_ID)
+
+    def test_by_name_looking_like_an_id(self):
+        name = '6d32b1b6-8ef2-4f94-8d6e-7e6fcd9d0b24'
+        self.fetch.side_effect = [exceptions.NotFound(404), ['location']]
+
+        resource, locations = utils.find_resource_and_fetch(
+            self.find_resource, self.manager, name, self.fetch
+        )
+
+        self.assertEqual(SHARE_ID, resource.id)
+        self.assertEqual(['location'], locations)
+        self.fetch.assert_has_calls([mock.call(name), mock.call(SHARE_ID)])
+
+    def test_not_found(self):
+        self.find_resource.side_effect = osc_exceptions.CommandError()
+        self.fetch.side_effect = exceptions.NotFound(404)
+
+        self.assertRaises(
+            osc_exceptions.CommandError,
+            utils.find_resource_and_fetch,
+            self.find_resource,
+            self.manager,
+            SHARE_ID,
+            self.fetch,
+        )
+
+
+@ddt.ddt
+class TestGetServerSort(osc_utils.TestCase):
+    @ddt.data(
+        ('name', ('name', 'asc')),
+        ('created_at:desc', ('created_at', 'desc')),
+        ('size:asc', ('size', 'asc')),
+        (None, (None, None)),
+        ('name:asc,size:desc', (None, None)),
+        ('description', (None, None)),
+        ('name:up', (None, None)),
+    )
+    @ddt.unpack
+    def test_get_server_sort(self, sort, expected):
+        self.assertEqual(
+            expected,
+            utils.get_server_sort(sort, constants.SHARE_SORT_KEY_VALUES),
+        )
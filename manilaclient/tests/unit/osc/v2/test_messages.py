@@ -11,6 +11,8 @@
 #   under the License.
 #
 
+from unittest import mock
+
 from osc_lib import exceptions
 from osc_lib import utils as oscutils
 
@@ -75,6 +77,41 @@ class TestMessageDelete(TestMessage):
         self.messages_mock.delete.assert_called_with(self.message)
         self.assertIsNone(result)
 
+    def test_message_delete_parallel(self):
+        messages = manila_fakes.FakeMessage.create_messages(count=4)
+        by_id = {res.id: res for res in messages}
+
+        def _delete(res):
+            if res is messages[1]:
+                raise exceptions.CommandError()
+
+        self.messages_mock.delete.side_effect = _delete
+
+        arglist = [res.id for res in messages] + ['--parallel', '3']
+        verifylist = [
+            ('message', [res.id for res in messages]),
+            ('parallel', 3),
+        ]
+        parsed_args = self.check_parser(self.cmd, arglist, verifylist)
+
+        with (
+            mock.patch(
+                'manilaclient.common.apiclient.utils.find_resource',
+                side_effect=lambda manager, ref: by_id[ref],
+            ),
+            mock.patch.object(
+                osc_messages.utils,
+                'run_in_parallel',
+                wraps=osc_messages.utils.run_in_parallel,
+            ) as run_in_parallel,
+        ):
+            self.assertRaises(
+                exceptions.CommandError, self.cmd.take_action, parsed_args
+            )
+
+        run_in_parallel.assert_called_once_with(mock.ANY, mock.ANY, 3)
+        self.assertEqual(4, self.messages_mock.delete.call_count)
+
     def test_message_delete_multiple(self):
         messages = manila_fakes.FakeMessage.create_messages(count=2)
         arglist = [messages[0].id, messages[1].id]
@@ -167,12 +204,34 @@ class TestMessageList(TestMessage):
                 'message_level': None,
                 'created_since': None,
                 'created_before': None,
-            }
+            },
+            sort_key=None,
+            sort_dir=None,
         )
 
         self.assertEqual(COLUMNS, columns)
         self.assertEqual(list(self.values), list(data))
 
+    def test_list_messages_sort(self):
+        arglist = ['--sort', 'created_at:desc']
+        verifylist = [('sort', 'created_at:desc')]
+        parsed_args = self.check_parser(self.cmd, arglist, verifylist)
+
+        self.cmd.take_action(parsed_args)
+
+        list_kwargs = self.messages_mock.list.call_args[1]
+        self.assertEqual('created_at', list_kwargs['sort_key'])
+        self.assertEqual('desc', list_kwargs['sort_dir'])
+
+    def test_list_messages_invalid_sort(self):
+        arglist = ['--sort', 'user_message']
+        verifylist = [('sort', 'user_message')]
+        parsed_args = self.check_parser(self.cmd, arglist, verifylist)
+
+        self.assertRaises(
+            exceptions.CommandError, self.cmd.take_action, parsed_args
+        )
+
     def test_list_messages_api_version_exception(self):
         self.app.client_manager.share.api_version = api_versions.APIVersion(
             "2.50"
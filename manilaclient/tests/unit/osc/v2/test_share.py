@@ -25,6 +25,7 @@ from manilaclient import api_versions
 from manilaclient.api_versions import MAX_VERSION
 from manilaclient.common.apiclient import exceptions
 from manilaclient.common import cliutils
+from manilaclient.common import waiters
 from manilaclient.osc.v2 import share as osc_shares
 from manilaclient.tests.unit.osc import osc_fakes
 from manilaclient.tests.unit.osc import osc_utils
@@ -640,6 +641,56 @@ class TestShareDelete(TestShare):
             osc_exceptions.CommandError, self.cmd.take_action, parsed_args
         )
 
+    def test_share_delete_parallel(self):
+        shares = manila_fakes.FakeShare.create_shares(count=4)
+        shares_by_id = {share.id: share for share in shares}
+        self.shares_mock.get = mock.Mock(side_effect=shares_by_id.get)
+
+        def _delete(share, share_group_id):
+            if share is shares[1]:
+                raise exceptions.CommandError()
+
+        self.shares_mock.delete.side_effect = _delete
+
+        arglist = [share.id for share in shares] + [
+            '--parallel',
+            '3',
+            '--wait',
+        ]
+        verifylist = [
+            ('shares', [share.id for share in shares]),
+            ('parallel', 3),
+            ('wait', True),
+        ]
+        parsed_args = self.check_parser(self.cmd, arglist, verifylist)
+
+        with mock.patch.object(
+            waiters, 'wait_for_delete', side_effect=osc_utils.fake_waiter(True)
+        ) as mock_wait:
+            exc = self.assertRaises(
+                osc_exceptions.CommandError, self.cmd.take_action, parsed_args
+            )
+
+        self.assertIn('1 of 4 shares', str(exc))
+        self.assertEqual(4, self.shares_mock.delete.call_count)
+        mock_wait.assert_called_once_with(
+            self.shares_mock,
+            [shares[0].id, shares[2].id, shares[3].id],
+            search_opts={'status': 'deleting'},
+        )
+
+    def test_share_delete_parallel_invalid(self):
+        shares = self.setup_shares_mock(count=1)
+
+        arglist = [shares[0].id, '--parallel', '0']
+        verifylist = [('shares', [shares[0].id]), ('parallel', 0)]
+        parsed_args = self.check_parser(self.cmd, arglist, verifylist)
+
+        self.assertRaises(
+            exceptions.CommandError, self.cmd.take_action, parsed_args
+        )
+        self.shares_mock.delete.assert_not_called()
+
     def test_share_delete_no_name(self):
         # self.setup_shares_mock(count=1)
 
@@ -667,7 +718,9 @@ class TestShareDelete(TestShare):
 
         parsed_args = self.check_parser(self.cmd, arglist, verifylist)
 
-        with mock.patch('osc_lib.utils.wait_for_delete', return_value=True):
+        with mock.patch.object(
+            waiters, 'wait_for_delete', side_effect=osc_utils.fake_waiter(True)
+        ):
             result = self.cmd.take_action(parsed_args)
             self.shares_mock.delete.assert_called_with(shares[0], None)
             self.shares_mock.get.assert_called_with(shares[0].name)
@@ -686,7 +739,11 @@ class TestShareDelete(TestShare):
 
         parsed_args = self.check_parser(self.cmd, arglist, verifylist)
 
-        with mock.patch('osc_lib.utils.wait_for_delete', return_value=False):
+        with mock.patch.object(
+            waiters,
+            'wait_for_delete',
+            side_effect=osc_utils.fake_waiter(False),
+        ):
             self.assertRaises(
                 osc_exceptions.CommandError, self.cmd.take_action, parsed_args
             )
@@ -778,7 +835,7 @@ class TestShareList(TestShare):
         search_opts = self._get_search_opts()
 
         self.shares_mock.list.assert_called_once_with(
-            search_opts=search_opts,
+            search_opts=search_opts, sort_key=None, sort_dir=None
         )
 
         self.assertEqual(self.columns, cmd_columns)
@@ -808,7 +865,7 @@ class TestShareList(TestShare):
         search_opts['all_tenants'] = True
 
         self.shares_mock.list.assert_called_once_with(
-            search_opts=search_opts,
+            search_opts=search_opts, sort_key=None, sort_dir=None
         )
 
         self.assertEqual(self.columns, cmd_columns)
@@ -841,7 +898,7 @@ class TestShareList(TestShare):
         search_opts['all_tenants'] = True
 
         self.shares_mock.list.assert_called_once_with(
-            search_opts=search_opts,
+            search_opts=search_opts, sort_key=None, sort_dir=None
         )
 
         self.assertEqual(self.columns, cmd_columns)
@@ -870,7 +927,7 @@ class TestShareList(TestShare):
         search_opts['user_id'] = self.user.id
 
         self.shares_mock.list.assert_called_once_with(
-            search_opts=search_opts,
+            search_opts=search_opts, sort_key=None, sort_dir=None
         )
         self.assertEqual(self.columns, cmd_columns)
 
@@ -901,7 +958,7 @@ class TestShareList(TestShare):
         search_opts['user_id'] = self.user.id
 
         self.shares_mock.list.assert_called_once_with(
-            search_opts=search_opts,
+            search_opts=search_opts, sort_key=None, sort_dir=None
         )
 
         self.assertEqual(self.columns, cmd_columns)
@@ -930,7 +987,7 @@ class TestShareList(TestShare):
         search_opts['name'] = self.new_share.name
 
         self.shares_mock.list.assert_called_once_with(
-            search_opts=search_opts,
+            search_opts=search_opts, sort_key=None, sort_dir=None
         )
 
         self.assertEqual(self.columns, cmd_columns)
@@ -959,7 +1016,7 @@ class TestShareList(TestShare):
         search_opts['status'] = self.new_share.status
 
         self.shares_mock.list.assert_called_once_with(
-            search_opts=search_opts,
+            search_opts=search_opts, sort_key=None, sort_dir=None
         )
 
         self.assertEqual(self.columns, cmd_columns)
@@ -987,7 +1044,7 @@ class TestShareList(TestShare):
         search_opts['all_tenants'] = True
 
         self.shares_mock.list.assert_called_once_with(
-            search_opts=search_opts,
+            search_opts=search_opts, sort_key=None, sort_dir=None
         )
 
         self.assertEqual(self.columns, cmd_columns)
@@ -1012,7 +1069,7 @@ class TestShareList(TestShare):
         search_opts = self._get_search_opts()
 
         self.shares_mock.list.assert_called_once_with(
-            search_opts=search_opts,
+            search_opts=search_opts, sort_key=None, sort_dir=None
         )
 
         collist = [
@@ -1112,9 +1169,56 @@ class TestShareList(TestShare):
 
         data = self._get_data()
 
-        self.shares_mock.list.assert_called_once_with(search_opts=search_opts)
+        self.shares_mock.list.assert_called_once_with(
+            search_opts=search_opts, sort_key=None, sort_dir=None
+        )
         self.assertEqual(data, tuple(cmd_data))
 
+    def test_share_list_sorted_on_server(self):
+        arglist = ['--sort', 'created_at:desc', '--limit', '20']
+        verifylist = [('sort', 'created_at:desc'), ('limit', 20)]
+        parsed_args = self.check_parser(self.cmd, arglist, verifylist)
+        with mock.patch.object(
+            osc_shares.oscutils, 'sort_items'
+        ) as sort_items:
+            self.cmd.take_action(parsed_args)
+
+        list_kwargs = self.shares_mock.list.call_args[1]
+        self.assertEqual('created_at', list_kwargs['sort_key'])
+        self.assertEqual('desc', list_kwargs['sort_dir'])
+        self.assertEqual(20, list_kwargs['search_opts']['limit'])
+        sort_items.assert_not_called()
+
+    def test_share_list_sorted_on_client(self):
+        arglist = ['--sort', 'status:asc,name:desc']
+        verifylist = [('sort', 'status:asc,name:desc')]
+        parsed_args = self.check_parser(self.cmd, arglist, verifylist)
+        with mock.patch.object(
+            osc_shares.oscutils, 'sort_items', return_value=[]
+        ) as sort_items:
+            self.cmd.take_action(parsed_args)
+
+        list_kwargs = self.shares_mock.list.call_args[1]
+        self.assertIsNone(list_kwargs['sort_key'])
+        self.assertIsNone(list_kwargs['sort_dir'])
+        sort_items.assert_called_once_with(
+            self.shares_mock.list.return_value, 'status:asc,name:desc', str
+        )
+
+    def test_share_list_default_sort_on_client(self):
+        parsed_args = self.check_parser(self.cmd, [], [('sort', None)])
+        with mock.patch.object(
+            osc_shares.oscutils, 'sort_items', return_value=[]
+        ) as sort_items:
+            self.cmd.take_action(parsed_args)
+
+        list_kwargs = self.shares_mock.list.call_args[1]
+        self.assertIsNone(list_kwargs['sort_key'])
+        self.assertIsNone(list_kwargs['sort_dir'])
+        sort_items.assert_called_once_with(
+            self.shares_mock.list.return_value, 'name:asc', str
+        )
+
     def test_share_list_negative_limit(self):
         arglist = [
             "--limit",
@@ -1153,7 +1257,7 @@ class TestShareList(TestShare):
         search_opts['description~'] = self.new_share.description
 
         self.shares_mock.list.assert_called_once_with(
-            search_opts=search_opts,
+            search_opts=search_opts, sort_key=None, sort_dir=None
         )
 
         self.assertEqual(self.columns, cmd_columns)
@@ -1257,6 +1361,21 @@ class TestShareShow(TestShare):
             manila_fakes.FakeShare.get_share_data(self._share), data
         )
 
+    def test_share_show_by_id(self):
+        share_id = str(uuid.uuid4())
+        self._share.id = share_id
+        self.export_locations_mock.list.return_value = [self._export_location]
+        arglist = [share_id]
+        verifylist = [("share", share_id)]
+        parsed_args = self.check_parser(self.cmd, arglist, verifylist)
+
+        columns, data = self.cmd.take_action(parsed_args)
+
+        self.shares_mock.get.assert_called_once_with(share_id)
+        # The export locations are fetched along with the share.
+        self.export_locations_mock.list.assert_called_once_with(share_id)
+        self.assertIn('export_locations', columns)
+
 
 class TestShareSet(TestShare):
     def setUp(self):
@@ -1462,6 +1581,28 @@ class TestShareUnset(TestShare):
         self.cmd.take_action(parsed_args)
         self._share.delete_metadata.assert_called_with(parsed_args.property)
 
+    def test_share_unset_property_bulk(self):
+        arglist = [
+            '--property',
+            'Manila',
+            '--property',
+            'Zorilla',
+            '--bulk',
+            self._share.id,
+        ]
+        verifylist = [
+            ('property', ['Manila', 'Zorilla']),
+            ('bulk', True),
+            ('share', self._share.id),
+        ]
+
+        parsed_args = self.check_parser(self.cmd, arglist, verifylist)
+
+        self.cmd.take_action(parsed_args)
+        self._share.delete_metadata.assert_called_once_with(
+            ['Manila', 'Zorilla'], bulk=True
+        )
+
     def test_share_unset_name(self):
         arglist = [
             '--name',
@@ -1841,7 +1982,9 @@ class TestAbandonShare(TestShare):
 
         parsed_args = self.check_parser(self.cmd, arglist, verifylist)
 
-        with mock.patch('osc_lib.utils.wait_for_delete', return_value=True):
+        with mock.patch.object(
+            waiters, 'wait_for_delete', side_effect=osc_utils.fake_waiter(True)
+        ):
             result = self.cmd.take_action(parsed_args)
             self.shares_mock.unmanage.assert_called_with(self._share)
             self.assertIsNone(result)
@@ -1852,7 +1995,11 @@ class TestAbandonShare(TestShare):
 
         parsed_args = self.check_parser(self.cmd, arglist, verifylist)
 
-        with mock.patch('osc_lib.utils.wait_for_delete', return_value=False):
+        with mock.patch.object(
+            waiters,
+            'wait_for_delete',
+            side_effect=osc_utils.fake_waiter(False),
+        ):
             self.assertRaises(
                 osc_exceptions.CommandError, self.cmd.take_action, parsed_args
             )
@@ -2039,6 +2186,33 @@ class TestExportLocationUnset(TestShare):
             self._share.id, ['Bobcat'], subresource=self._export_location.id
         )
 
+    def test_share_unset_export_location_property_bulk(self):
+        self.app.client_manager.share.api_version = api_versions.APIVersion(
+            '2.87'
+        )
+        arglist = [
+            self._share.id,
+            self._export_location.id,
+            '--property',
+            'Bobcat',
+            '--bulk',
+        ]
+        verifylist = [
+            ('share', self._share.id),
+            ('export_location', self._export_location.id),
+            ('property', ['Bobcat']),
+            ('bulk', True),
+        ]
+
+        parsed_args = self.check_parser(self.cmd, arglist, verifylist)
+        self.cmd.take_action(parsed_args)
+        self.export_locations_mock.delete_metadata.assert_called_once_with(
+            self._share.id,
+            ['Bobcat'],
+            subresource=self._export_location.id,
+            bulk=True,
+        )
+
     def test_share_unset_export_location_property_exception(self):
         self.app.client_manager.share.api_version = api_versions.APIVersion(
             '2.87'
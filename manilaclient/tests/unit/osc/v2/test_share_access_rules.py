@@ -14,6 +14,7 @@
 from unittest import mock
 
 import ddt
+import fixtures
 from osc_lib import exceptions
 from osc_lib import utils as oscutils
 
@@ -562,3 +563,165 @@ class TestShareAccessUnset(TestShareAccess):
             self.access_rule, ['key1']
         )
         self.assertIsNone(result)
+
+
+class TestShareAccessSync(TestShareAccess):
+    def setUp(self):
+        super().setUp()
+
+        self.share = manila_fakes.FakeShare.create_one_share()
+        self.shares_mock.get.return_value = self.share
+        self.access_rules_mock.sync.return_value = [
+            (
+                'add',
+                {
+                    'access_type': 'ip',
+                    'access_to': '10.0.0.5',
+                    'access_level': 'ro',
+                },
+                None,
+            ),
+            (
+                'remove',
+                {
+                    'id': 'rule_id',
+                    'access_type': 'ip',
+                    'access_to': '10.0.0.3',
+                    'access_level': 'rw',
+                },
+                None,
+            ),
+        ]
+
+        # Get the command object to test
+        self.cmd = osc_share_access_rules.SyncShareAccess(self.app, None)
+
+    def test_access_rule_sync(self):
+        arglist = [
+            self.share.id,
+            '--rule',
+            'access_type=ip,access_to=10.0.0.5,access_level=ro',
+            '--rule',
+            'access_type=ip,access_to=10.0.0.1',
+            '--parallel',
+            '4',
+        ]
+        verifylist = [
+            ('share', self.share.id),
+            (
+                'rule',
+                [
+                    {
+                        'access_type': 'ip',
+                        'access_to': '10.0.0.5',
+                        'access_level': 'ro',
+                    },
+                    {'access_type': 'ip', 'access_to': '10.0.0.1'},
+                ],
+            ),
+            ('parallel', 4),
+        ]
+        parsed_args = self.check_parser(self.cmd, arglist, verifylist)
+
+        columns, data = self.cmd.take_action(parsed_args)
+
+        self.access_rules_mock.sync.assert_called_once_with(
+            self.share,
+            [
+                {
+                    'access_type': 'ip',
+                    'access_to': '10.0.0.5',
+                    'access_level': 'ro',
+                },
+                {'access_type': 'ip', 'access_to': '10.0.0.1'},
+            ],
+            concurrency=4,
+            dry_run=False,
+        )
+        self.assertEqual(
+            ['Action', 'ID', 'Access Type', 'Access To', 'Access Level'],
+            columns,
+        )
+        self.assertEqual(
+            [
+                ('add', None, 'ip', '10.0.0.5', 'ro'),
+                ('remove', 'rule_id', 'ip', '10.0.0.3', 'rw'),
+            ],
+            list(data),
+        )
+
+    def test_access_rule_sync_rules_file(self):
+        rules_file = self.useFixture(fixtures.TempDir()).join('rules.json')
+        with open(rules_file, 'w') as f:
+            f.write(
+                '[{"access_type": "ip", "access_to": "10.0.0.1", '
+                '"properties": {"key": "value"}}]'
+            )
+        arglist = [self.share.id, '--rules-file', rules_file, '--dry-run']
+        verifylist = [
+            ('share', self.share.id),
+            ('rules_file', rules_file),
+            ('dry_run', True),
+        ]
+        parsed_args = self.check_parser(self.cmd, arglist, verifylist)
+
+        self.cmd.take_action(parsed_args)
+
+        self.access_rules_mock.sync.assert_called_once_with(
+            self.share,
+            [
+                {
+                    'access_type': 'ip',
+                    'access_to': '10.0.0.1',
+                    'metadata': {'key': 'value'},
+                }
+            ],
+            concurrency=1,
+            dry_run=True,
+        )
+
+    def test_access_rule_sync_invalid_rules_file(self):
+        rules_file = self.useFixture(fixtures.TempDir()).join('rules.json')
+        with open(rules_file, 'w') as f:
+            f.write('{"access_to": "10.0.0.1"}')
+        arglist = [self.share.id, '--rules-file', rules_file]
+        verifylist = [('rules_file', rules_file)]
+        parsed_args = self.check_parser(self.cmd, arglist, verifylist)
+
+        self.assertRaises(
+            exceptions.CommandError, self.cmd.take_action, parsed_args
+        )
+        self.access_rules_mock.sync.assert_not_called()
+
+    def test_access_rule_sync_failures(self):
+        self.access_rules_mock.sync.return_value.append(
+            (
+                'update',
+                {
+                    'id': 'other_rule_id',
+                    'access_type': 'ip',
+                    'access_to': '10.0.0.4',
+                    'access_level': 'rw',
+                },
+                Exception('fake'),
+            )
+        )
+        arglist = [self.share.id]
+        verifylist = [('share', self.share.id), ('rule', [])]
+        parsed_args = self.check_parser(self.cmd, arglist, verifylist)
+
+        self.assertRaises(
+            exceptions.CommandError, self.cmd.take_action, parsed_args
+        )
+
+    def test_access_rule_sync_api_version_exception(self):
+        self.app.client_manager.share.api_version = api_versions.APIVersion(
+            '2.44'
+        )
+        arglist = [self.share.id]
+        verifylist = [('share', self.share.id)]
+        parsed_args = self.check_parser(self.cmd, arglist, verifylist)
+
+        self.assertRaises(
+            exceptions.CommandError, self.cmd.take_action, parsed_args
+        )
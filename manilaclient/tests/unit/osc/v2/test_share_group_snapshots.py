@@ -20,6 +20,7 @@ from osc_lib import utils as oscutils
 from unittest import mock
 
 from manilaclient import api_versions
+from manilaclient.common import waiters
 from manilaclient.osc.v2 import (
     share_group_snapshots as osc_share_group_snapshots,
 )
@@ -264,7 +265,9 @@ class TestDeleteShareGroupSnapshot(TestShareGroupSnapshot):
 
         parsed_args = self.check_parser(self.cmd, arglist, verifylist)
 
-        with mock.patch('osc_lib.utils.wait_for_delete', return_value=True):
+        with mock.patch.object(
+            waiters, 'wait_for_delete', side_effect=osc_utils.fake_waiter(True)
+        ):
             result = self.cmd.take_action(parsed_args)
 
             self.group_snapshot_mocks.delete.assert_called_with(
@@ -284,7 +287,11 @@ class TestDeleteShareGroupSnapshot(TestShareGroupSnapshot):
 
         parsed_args = self.check_parser(self.cmd, arglist, verifylist)
 
-        with mock.patch('osc_lib.utils.wait_for_delete', return_value=False):
+        with mock.patch.object(
+            waiters,
+            'wait_for_delete',
+            side_effect=osc_utils.fake_waiter(False),
+        ):
             self.assertRaises(
                 exceptions.CommandError, self.cmd.take_action, parsed_args
             )
@@ -19,6 +19,7 @@ from osc_lib import exceptions as osc_exceptions
 from osc_lib import utils as oscutils
 
 from manilaclient import api_versions
+from manilaclient.common import waiters
 from manilaclient.osc import utils
 from manilaclient.osc.v2 import share_groups as osc_share_groups
 from manilaclient.tests.unit.osc import osc_utils
@@ -257,7 +258,9 @@ class TestShareGroupDelete(TestShareGroup):
 
         parsed_args = self.check_parser(self.cmd, arglist, verifylist)
 
-        with mock.patch('osc_lib.utils.wait_for_delete', return_value=True):
+        with mock.patch.object(
+            waiters, 'wait_for_delete', side_effect=osc_utils.fake_waiter(True)
+        ):
             result = self.cmd.take_action(parsed_args)
 
             self.groups_mock.delete.assert_called_with(
@@ -272,7 +275,11 @@ class TestShareGroupDelete(TestShareGroup):
 
         parsed_args = self.check_parser(self.cmd, arglist, verifylist)
 
-        with mock.patch('osc_lib.utils.wait_for_delete', return_value=False):
+        with mock.patch.object(
+            waiters,
+            'wait_for_delete',
+            side_effect=osc_utils.fake_waiter(False),
+        ):
             self.assertRaises(
                 exceptions.CommandError, self.cmd.take_action, parsed_args
             )
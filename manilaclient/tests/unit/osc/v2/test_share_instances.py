@@ -16,6 +16,7 @@ from osc_lib import exceptions
 from osc_lib import utils as oscutils
 
 from manilaclient.common import cliutils
+from manilaclient.common import waiters
 from manilaclient.osc import utils
 from manilaclient.osc.v2 import share_instances as osc_share_instances
 
@@ -209,7 +210,9 @@ class TestShareInstanceDelete(TestShareInstance):
 
         parsed_args = self.check_parser(self.cmd, arglist, verifylist)
 
-        with mock.patch('osc_lib.utils.wait_for_delete', return_value=True):
+        with mock.patch.object(
+            waiters, 'wait_for_delete', side_effect=osc_utils.fake_waiter(True)
+        ):
             result = self.cmd.take_action(parsed_args)
 
             self.instances_mock.force_delete.assert_called_with(
@@ -224,7 +227,11 @@ class TestShareInstanceDelete(TestShareInstance):
 
         parsed_args = self.check_parser(self.cmd, arglist, verifylist)
 
-        with mock.patch('osc_lib.utils.wait_for_delete', return_value=False):
+        with mock.patch.object(
+            waiters,
+            'wait_for_delete',
+            side_effect=osc_utils.fake_waiter(False),
+        ):
             self.assertRaises(
                 exceptions.CommandError, self.cmd.take_action, parsed_args
             )
@@ -575,6 +575,37 @@ class TestShareNetworkSubnetUnset(TestShareNetworkSubnet):
             subresource=self.share_network_subnet.id,
         )
 
+    def test_unset_share_network_subnet_property_bulk(self):
+        self.app.client_manager.share.api_version = api_versions.APIVersion(
+            '2.78'
+        )
+        arglist = [
+            self.share_network.id,
+            self.share_network_subnet.id,
+            '--property',
+            'Manila',
+            '--property',
+            'test',
+            '--bulk',
+        ]
+        verifylist = [
+            ('share_network', self.share_network.id),
+            ('share_network_subnet', self.share_network_subnet.id),
+            ('property', ['Manila', 'test']),
+            ('bulk', True),
+        ]
+
+        parsed_args = self.check_parser(self.cmd, arglist, verifylist)
+
+        self.cmd.take_action(parsed_args)
+
+        self.share_subnets_mock.delete_metadata.assert_called_once_with(
+            self.share_network.id,
+            ['Manila', 'test'],
+            subresource=self.share_network_subnet.id,
+            bulk=True,
+        )
+
     def test_unset_share_network_subnet_property_exception(self):
         self.app.client_manager.share.api_version = api_versions.APIVersion(
             '2.78'
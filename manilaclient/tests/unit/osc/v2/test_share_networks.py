@@ -20,6 +20,7 @@ from osc_lib import exceptions
 from osc_lib import utils as oscutils
 
 from manilaclient import api_versions
+from manilaclient.common import waiters
 from manilaclient.osc.v2 import share_networks as osc_share_networks
 from manilaclient.tests.unit.osc import osc_utils
 from manilaclient.tests.unit.osc.v2 import fakes as manila_fakes
@@ -240,9 +241,45 @@ class TestShareNetworkDelete(TestShareNetwork):
             verifylist,
         )
 
+    def test_share_network_delete_parallel(self):
+        share_networks = manila_fakes.FakeShareNetwork.create_share_networks(
+            count=4
+        )
+        by_id = {res.id: res for res in share_networks}
+
+        def _delete(res):
+            if res is share_networks[1]:
+                raise exceptions.CommandError()
+
+        self.share_networks_mock.delete.side_effect = _delete
+
+        arglist = [res.id for res in share_networks] + ['--parallel', '3']
+        verifylist = [
+            ('share_network', [res.id for res in share_networks]),
+            ('parallel', 3),
+        ]
+        parsed_args = self.check_parser(self.cmd, arglist, verifylist)
+
+        with (
+            mock.patch(
+                'osc_lib.utils.find_resource',
+                side_effect=lambda manager, ref: by_id[ref],
+            ),
+            mock.patch.object(
+                osc_share_networks.utils,
+                'run_in_parallel',
+                wraps=osc_share_networks.utils.run_in_parallel,
+            ) as run_in_parallel,
+        ):
+            self.assertRaises(
+                exceptions.CommandError, self.cmd.take_action, parsed_args
+            )
+
+        run_in_parallel.assert_called_once_with(mock.ANY, mock.ANY, 3)
+        self.assertEqual(4, self.share_networks_mock.delete.call_count)
+
     @ddt.data(True, False)
     def test_share_network_delete_with_wait(self, wait):
-        oscutils.wait_for_delete = mock.Mock(return_value=True)
         share_networks = manila_fakes.FakeShareNetwork.create_share_networks(
             count=2
         )
@@ -260,8 +297,15 @@ class TestShareNetworkDelete(TestShareNetwork):
 
         parsed_args = self.check_parser(self.cmd, arglist, verifylist)
 
-        with mock.patch(
-            'osc_lib.utils.find_resource', side_effect=share_networks
+        with (
+            mock.patch(
+                'osc_lib.utils.find_resource', side_effect=share_networks
+            ),
+            mock.patch.object(
+                waiters,
+                'wait_for_delete',
+                side_effect=osc_utils.fake_waiter(True),
+            ) as mock_wait,
         ):
             result = self.cmd.take_action(parsed_args)
 
@@ -269,18 +313,13 @@ class TestShareNetworkDelete(TestShareNetwork):
             self.share_networks_mock.delete.call_count, len(share_networks)
         )
         if wait:
-            oscutils.wait_for_delete.assert_has_calls(
-                [
-                    mock.call(
-                        manager=self.share_networks_mock,
-                        res_id=share_networks[0].id,
-                    ),
-                    mock.call(
-                        manager=self.share_networks_mock,
-                        res_id=share_networks[1].id,
-                    ),
-                ]
+            mock_wait.assert_called_once_with(
+                self.share_networks_mock,
+                [share_networks[0].id, share_networks[1].id],
+                search_opts={},
             )
+        else:
+            mock_wait.assert_not_called()
         self.assertIsNone(result)
 
     def test_share_network_delete_exception(self):
@@ -299,7 +338,6 @@ class TestShareNetworkDelete(TestShareNetwork):
         )
 
     def test_share_network_delete_wait_fails(self):
-        oscutils.wait_for_delete = mock.Mock(return_value=False)
         arglist = [
             self.share_network.id,
             '--wait',
@@ -314,9 +352,14 @@ class TestShareNetworkDelete(TestShareNetwork):
         ):
             parsed_args = self.check_parser(self.cmd, arglist, verifylist)
 
-        self.assertRaises(
-            exceptions.CommandError, self.cmd.take_action, parsed_args
-        )
+        with mock.patch.object(
+            waiters,
+            'wait_for_delete',
+            side_effect=osc_utils.fake_waiter(False),
+        ):
+            self.assertRaises(
+                exceptions.CommandError, self.cmd.take_action, parsed_args
+            )
         self.share_networks_mock.delete.assert_called_once_with(
             self.share_network
         )
@@ -17,7 +17,7 @@ from osc_lib import utils as oscutils
 
 from manilaclient import api_versions
 from manilaclient.common import cliutils
-
+from manilaclient.common import waiters
 from manilaclient.osc import utils
 from manilaclient.osc.v2 import share_replicas as osc_share_replicas
 
@@ -391,7 +391,9 @@ class TestShareReplicaDelete(TestShareReplica):
 
         parsed_args = self.check_parser(self.cmd, arglist, verifylist)
 
-        with mock.patch('osc_lib.utils.wait_for_delete', return_value=True):
+        with mock.patch.object(
+            waiters, 'wait_for_delete', side_effect=osc_utils.fake_waiter(True)
+        ):
             result = self.cmd.take_action(parsed_args)
 
             self.replicas_mock.delete.assert_called_with(
@@ -406,7 +408,11 @@ class TestShareReplicaDelete(TestShareReplica):
 
         parsed_args = self.check_parser(self.cmd, arglist, verifylist)
 
-        with mock.patch('osc_lib.utils.wait_for_delete', return_value=False):
+        with mock.patch.object(
+            waiters,
+            'wait_for_delete',
+            side_effect=osc_utils.fake_waiter(False),
+        ):
             self.assertRaises(
                 exceptions.CommandError, self.cmd.take_action, parsed_args
             )
@@ -689,6 +695,32 @@ class TestShareReplicaUnset(TestShareReplica):
             parsed_args.property
         )
 
+    def test_share_replica_unset_property_bulk(self):
+        self.app.client_manager.share.api_version = api_versions.APIVersion(
+            '2.95'
+        )
+        arglist = [
+            '--property',
+            'key1',
+            '--property',
+            'key2',
+            '--bulk',
+            self.share_replica.id,
+        ]
+        verifylist = [
+            ('property', ['key1', 'key2']),
+            ('bulk', True),
+            ('replica', self.share_replica.id),
+        ]
+
+        parsed_args = self.check_parser(self.cmd, arglist, verifylist)
+
+        self.cmd.take_action(parsed_args)
+
+        self.share_replica.delete_metadata.assert_called_once_with(
+            ['key1', 'key2'], bulk=True
+        )
+
     def test_share_replica_unset_multiple_properties(self):
         self.app.client_manager.share.api_version = api_versions.APIVersion(
             '2.95'
@@ -20,6 +20,7 @@ from osc_lib import exceptions
 from osc_lib import utils as oscutils
 
 from manilaclient import api_versions
+from manilaclient.common import waiters
 from manilaclient.osc.v2 import share_servers as osc_share_servers
 from manilaclient.tests.unit.osc import osc_utils
 from manilaclient.tests.unit.osc.v2 import fakes as manila_fakes
@@ -72,6 +73,43 @@ class TestDeleteShareServer(TestShareServer):
         self.servers_mock.delete.assert_called_once_with(self.share_server)
         self.assertIsNone(result)
 
+    def test_share_server_delete_parallel(self):
+        share_servers = manila_fakes.FakeShareServer.create_share_servers(
+            count=4
+        )
+        by_id = {res.id: res for res in share_servers}
+
+        def _delete(res):
+            if res is share_servers[1]:
+                raise exceptions.CommandError()
+
+        self.servers_mock.delete.side_effect = _delete
+
+        arglist = [res.id for res in share_servers] + ['--parallel', '3']
+        verifylist = [
+            ('share_servers', [res.id for res in share_servers]),
+            ('parallel', 3),
+        ]
+        parsed_args = self.check_parser(self.cmd, arglist, verifylist)
+
+        with (
+            mock.patch(
+                'osc_lib.utils.find_resource',
+                side_effect=lambda manager, ref: by_id[ref],
+            ),
+            mock.patch.object(
+                osc_share_servers.utils,
+                'run_in_parallel',
+                wraps=osc_share_servers.utils.run_in_parallel,
+            ) as run_in_parallel,
+        ):
+            self.assertRaises(
+                exceptions.CommandError, self.cmd.take_action, parsed_args
+            )
+
+        run_in_parallel.assert_called_once_with(mock.ANY, mock.ANY, 3)
+        self.assertEqual(4, self.servers_mock.delete.call_count)
+
     def test_share_server_delete_wait(self):
         arglist = [self.share_server.id, '--wait']
         verifylist = [
@@ -81,7 +119,9 @@ class TestDeleteShareServer(TestShareServer):
 
         parsed_args = self.check_parser(self.cmd, arglist, verifylist)
 
-        with mock.patch('osc_lib.utils.wait_for_delete', return_value=True):
+        with mock.patch.object(
+            waiters, 'wait_for_delete', side_effect=osc_utils.fake_waiter(True)
+        ):
             result = self.cmd.take_action(parsed_args)
 
             self.servers_mock.delete.assert_called_once_with(self.share_server)
@@ -96,7 +136,11 @@ class TestDeleteShareServer(TestShareServer):
 
         parsed_args = self.check_parser(self.cmd, arglist, verifylist)
 
-        with mock.patch('osc_lib.utils.wait_for_delete', return_value=False):
+        with mock.patch.object(
+            waiters,
+            'wait_for_delete',
+            side_effect=osc_utils.fake_waiter(False),
+        ):
             self.assertRaises(
                 exceptions.CommandError, self.cmd.take_action, parsed_args
             )
@@ -481,7 +525,9 @@ class TestAbandonShareServer(TestShareServer):
 
         parsed_args = self.check_parser(self.cmd, arglist, verifylist)
 
-        with mock.patch('osc_lib.utils.wait_for_delete', return_value=True):
+        with mock.patch.object(
+            waiters, 'wait_for_delete', side_effect=osc_utils.fake_waiter(True)
+        ):
             result = self.cmd.take_action(parsed_args)
             self.servers_mock.unmanage.assert_called_with(self.share_server)
             self.assertIsNone(result)
@@ -492,7 +538,11 @@ class TestAbandonShareServer(TestShareServer):
 
         parsed_args = self.check_parser(self.cmd, arglist, verifylist)
 
-        with mock.patch('osc_lib.utils.wait_for_delete', return_value=False):
+        with mock.patch.object(
+            waiters,
+            'wait_for_delete',
+            side_effect=osc_utils.fake_waiter(False),
+        ):
             self.assertRaises(
                 exceptions.CommandError, self.cmd.take_action, parsed_args
             )
@@ -23,6 +23,7 @@ from osc_lib import utils as oscutils
 
 from manilaclient import api_versions
 from manilaclient.common import cliutils
+from manilaclient.common import waiters
 from manilaclient.osc.v2 import share_snapshots as osc_share_snapshots
 from manilaclient.tests.unit.osc import osc_utils
 from manilaclient.tests.unit.osc.v2 import fakes as manila_fakes
@@ -283,6 +284,43 @@ class TestShareSnapshotDelete(TestShareSnapshot):
         self.snapshots_mock.delete.assert_called_with(self.share_snapshot)
         self.assertIsNone(result)
 
+    def test_share_snapshot_delete_parallel(self):
+        share_snapshots = (
+            manila_fakes.FakeShareSnapshot.create_share_snapshots(count=4)
+        )
+        by_id = {res.id: res for res in share_snapshots}
+
+        def _delete(res):
+            if res is share_snapshots[1]:
+                raise exceptions.CommandError()
+
+        self.snapshots_mock.delete.side_effect = _delete
+
+        arglist = [res.id for res in share_snapshots] + ['--parallel', '3']
+        verifylist = [
+            ('snapshot', [res.id for res in share_snapshots]),
+            ('parallel', 3),
+        ]
+        parsed_args = self.check_parser(self.cmd, arglist, verifylist)
+
+        with (
+            mock.patch(
+                'osc_lib.utils.find_resource',
+                side_effect=lambda manager, ref: by_id[ref],
+            ),
+            mock.patch.object(
+                osc_share_snapshots.oscutils,
+                'run_in_parallel',
+                wraps=osc_share_snapshots.oscutils.run_in_parallel,
+            ) as run_in_parallel,
+        ):
+            self.assertRaises(
+                exceptions.CommandError, self.cmd.take_action, parsed_args
+            )
+
+        run_in_parallel.assert_called_once_with(mock.ANY, mock.ANY, 3)
+        self.assertEqual(4, self.snapshots_mock.delete.call_count)
+
     def test_share_snapshot_delete_force(self):
         arglist = [self.share_snapshot.id, '--force']
         verifylist = [('snapshot', [self.share_snapshot.id]), ('force', True)]
@@ -330,7 +368,9 @@ class TestShareSnapshotDelete(TestShareSnapshot):
 
         parsed_args = self.check_parser(self.cmd, arglist, verifylist)
 
-        with mock.patch('osc_lib.utils.wait_for_delete', return_value=True):
+        with mock.patch.object(
+            waiters, 'wait_for_delete', side_effect=osc_utils.fake_waiter(True)
+        ):
             result = self.cmd.take_action(parsed_args)
 
             self.snapshots_mock.delete.assert_called_with(self.share_snapshot)
@@ -341,7 +381,11 @@ class TestShareSnapshotDelete(TestShareSnapshot):
         verifylist = [('snapshot', [self.share_snapshot.id]), ('wait', True)]
 
         parsed_args = self.check_parser(self.cmd, arglist, verifylist)
-        with mock.patch('osc_lib.utils.wait_for_delete', return_value=False):
+        with mock.patch.object(
+            waiters,
+            'wait_for_delete',
+            side_effect=osc_utils.fake_waiter(False),
+        ):
             self.assertRaises(
                 exceptions.CommandError, self.cmd.take_action, parsed_args
             )
@@ -587,6 +631,28 @@ class TestShareSnapshotUnset(TestShareSnapshot):
             parsed_args.property
         )
 
+    def test_unset_snapshot_property_bulk(self):
+        arglist = [
+            '--property',
+            'Manila',
+            '--property',
+            'test',
+            '--bulk',
+            self.share_snapshot.id,
+        ]
+        verifylist = [
+            ('property', ['Manila', 'test']),
+            ('bulk', True),
+            ('snapshot', self.share_snapshot.id),
+        ]
+
+        parsed_args = self.check_parser(self.cmd, arglist, verifylist)
+
+        self.cmd.take_action(parsed_args)
+        self.share_snapshot.delete_metadata.assert_called_once_with(
+            ['Manila', 'test'], bulk=True
+        )
+
     def test_unset_snapshot_name_exception(self):
         arglist = [self.share_snapshot.id, '--name']
         verifylist = [('snapshot', self.share_snapshot.id), ('name', True)]
@@ -665,12 +731,41 @@ class TestShareSnapshotList(TestShareSnapshot):
                 'name~': None,
                 'description~': None,
                 'description': None,
-            }
+            },
+            sort_key=None,
+            sort_dir=None,
         )
 
         self.assertEqual(COLUMNS, columns)
         self.assertEqual(list(self.values), list(data))
 
+    def test_list_snapshots_sorted_on_server(self):
+        arglist = ['--sort', 'size:desc']
+        verifylist = [('sort', 'size:desc')]
+        parsed_args = self.check_parser(self.cmd, arglist, verifylist)
+        with mock.patch.object(
+            osc_share_snapshots.utils, 'sort_items'
+        ) as sort_items:
+            self.cmd.take_action(parsed_args)
+
+        list_kwargs = self.snapshots_mock.list.call_args[1]
+        self.assertEqual('size', list_kwargs['sort_key'])
+        self.assertEqual('desc', list_kwargs['sort_dir'])
+        sort_items.assert_not_called()
+
+    def test_list_snapshots_default_sort_on_client(self):
+        parsed_args = self.check_parser(self.cmd, [], [('sort', None)])
+        with mock.patch.object(
+            osc_share_snapshots.utils, 'sort_items', return_value=[]
+        ) as sort_items:
+            self.cmd.take_action(parsed_args)
+
+        list_kwargs = self.snapshots_mock.list.call_args[1]
+        self.assertIsNone(list_kwargs['sort_key'])
+        sort_items.assert_called_once_with(
+            self.snapshots_list, 'name:asc', str
+        )
+
     def test_list_snapshots_all_projects(self):
         all_tenants_list = COLUMNS.copy()
         all_tenants_list.append('Project ID')
@@ -700,7 +795,9 @@ class TestShareSnapshotList(TestShareSnapshot):
                 'name~': None,
                 'description~': None,
                 'description': None,
-            }
+            },
+            sort_key=None,
+            sort_dir=None,
         )
 
         self.assertEqual(all_tenants_list, columns)
@@ -733,7 +830,9 @@ class TestShareSnapshotList(TestShareSnapshot):
                 'name~': None,
                 'description~': None,
                 'description': None,
-            }
+            },
+            sort_key=None,
+            sort_dir=None,
         )
 
         self.assertEqual(COLUMNS_DETAIL, columns)
@@ -791,7 +890,9 @@ class TestShareSnapshotList(TestShareSnapshot):
                 'name~': None,
                 'description~': None,
                 'description': None,
-            }
+            },
+            sort_key=None,
+            sort_dir=None,
         )
 
         self.assertEqual(COLUMNS, columns)
@@ -827,7 +928,9 @@ class TestShareSnapshotList(TestShareSnapshot):
                 'description~': None,
                 'description': None,
                 'with_count': True,
-            }
+            },
+            sort_key=None,
+            sort_dir=None,
         )
 
 
@@ -1056,7 +1159,9 @@ class TestShareSnapshotAbandon(TestShareSnapshot):
 
         parsed_args = self.check_parser(self.cmd, arglist, verifylist)
 
-        with mock.patch('osc_lib.utils.wait_for_delete', return_value=True):
+        with mock.patch.object(
+            waiters, 'wait_for_delete', side_effect=osc_utils.fake_waiter(True)
+        ):
             result = self.cmd.take_action(parsed_args)
             self.snapshots_mock.unmanage.assert_called_with(
                 self.share_snapshot
@@ -1069,7 +1174,11 @@ class TestShareSnapshotAbandon(TestShareSnapshot):
 
         parsed_args = self.check_parser(self.cmd, arglist, verifylist)
 
-        with mock.patch('osc_lib.utils.wait_for_delete', return_value=False):
+        with mock.patch.object(
+            waiters,
+            'wait_for_delete',
+            side_effect=osc_utils.fake_waiter(False),
+        ):
             self.assertRaises(
                 exceptions.CommandError, self.cmd.take_action, parsed_args
             )
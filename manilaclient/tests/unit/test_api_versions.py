@@ -19,8 +19,11 @@ import ddt
 import manilaclient
 from manilaclient import api_versions
 from manilaclient.common import cliutils
+from manilaclient.common import constants
+from manilaclient.common import httpclient
 from manilaclient import exceptions
 from manilaclient.tests.unit import utils
+from manilaclient.tests.unit.v2 import fakes
 
 
 @ddt.ddt
@@ -266,6 +269,70 @@ class WrapsTestCase(utils.TestCase):
         ]
         self.assertEqual(args_2, some_func_2.arguments)
 
+    def test_resolved_method_is_cached(self):
+        @api_versions.wraps("2.2", "2.6")
+        def some_func(*args, **kwargs):
+            pass
+
+        mock_get = self.mock_object(
+            api_versions,
+            'get_versioned_methods',
+            mock.Mock(side_effect=api_versions.get_versioned_methods),
+        )
+
+        for _ in range(3):
+            some_func(self._get_obj_with_vers("2.4"))
+        some_func(self._get_obj_with_vers("2.5"))
+
+        self.assertEqual(2, mock_get.call_count)
+
+    def test_cache_is_cleared_when_methods_are_registered(self):
+        @api_versions.wraps("2.2", "2.4")
+        def some_func(*args, **kwargs):
+            return 'old'
+
+        obj = self._get_obj_with_vers("2.5")
+        self.assertRaises(exceptions.UnsupportedVersion, some_func, obj)
+
+        @api_versions.wraps("2.5")  # noqa
+        def some_func(*args, **kwargs):  # noqa
+            return 'new'
+
+        self.assertEqual('new', some_func(obj))
+
+    def test_tight_loop_of_manager_calls(self):
+        # NOTE: the version specific implementation of manager methods is
+        # only looked up once per client version, not on every call.
+        cs = fakes.FakeClient(api_version=api_versions.APIVersion("2.44"))
+        api_versions._VERSIONED_METHOD_CACHE.clear()
+        mock_get = self.mock_object(
+            api_versions,
+            'get_versioned_methods',
+            mock.Mock(side_effect=api_versions.get_versioned_methods),
+        )
+
+        for _ in range(1000):
+            cs.shares.get('1234')
+            cs.shares.access_list('1111')
+
+        self.assertEqual(1, mock_get.call_count)
+
+
+class ExperimentalAPITestCase(utils.TestCase):
+    def test_header_is_request_scoped(self):
+        manager = mock.Mock()
+        manager.client.default_headers = {'X-Fake': 'fake'}
+
+        @api_versions.experimental_api
+        def experimental(manager):
+            return dict(httpclient._request_headers.get({}))
+
+        headers = experimental(manager)
+
+        self.assertEqual({constants.EXPERIMENTAL_HTTP_HEADER: 'true'}, headers)
+        self.assertEqual({}, httpclient._request_headers.get({}))
+        self.assertEqual({'X-Fake': 'fake'}, manager.client.default_headers)
+
 
 class DiscoverVersionTestCase(utils.TestCase):
     def setUp(self):
@@ -304,6 +371,22 @@ class DiscoverVersionTestCase(utils.TestCase):
         )
         self.assertTrue(self.fake_client.services.server_api_version.called)
 
+    def test_server_version_range_provided(self):
+        manilaclient.API_MAX_VERSION = api_versions.APIVersion("2.11")
+        manilaclient.API_MIN_VERSION = api_versions.APIVersion("2.1")
+
+        discovered_version = api_versions.discover_version(
+            None,
+            api_versions.APIVersion('2.9'),
+            server_version_range=(
+                api_versions.APIVersion('2.4'),
+                api_versions.APIVersion('2.7'),
+            ),
+        )
+
+        self.assertEqual('2.7', discovered_version.get_string())
+        self.assertFalse(self.fake_client.services.server_api_version.called)
+
     def test_server_is_too_old(self):
         self._mock_returned_server_version('2.2', '2.0')
         manilaclient.API_MAX_VERSION = api_versions.APIVersion("2.10")
@@ -10,9 +10,16 @@
 # License for the specific language governing permissions and limitations
 # under the License.
 
+import json
+import tracemalloc
 from unittest import mock
+import warnings
 
+import fixtures
+
+from manilaclient import api_versions
 from manilaclient import base
+from manilaclient.common import resource_cache
 from manilaclient import exceptions
 from manilaclient.tests.unit import utils
 from manilaclient.tests.unit.v2 import fakes
@@ -68,3 +75,551 @@ class BaseTest(utils.TestCase):
         cs.shares.list.assert_called_with(
             search_opts={'all_tenants': 1, 'is_soft_deleted': True}
         )
+
+    def _mock_paged_list(self, manager, items):
+        def fake_list(search_opts=None, **kwargs):
+            offset = search_opts.get('offset', 0)
+            return items[offset : offset + search_opts['limit']]
+
+        return self.mock_object(
+            manager, 'list', mock.Mock(side_effect=fake_list)
+        )
+
+    def test_iter_list_pages(self):
+        manager = base.ManagerWithFind(cs)
+        mock_list = self._mock_paged_list(manager, list(range(5)))
+
+        result = manager.iter_list(
+            page_size=2, search_opts={'all_tenants': 1}, sort_key='name'
+        )
+
+        self.assertEqual(0, mock_list.call_count)
+        self.assertEqual(0, next(result))
+        self.assertEqual(1, mock_list.call_count)
+        self.assertEqual([1, 2, 3, 4], list(result))
+        mock_list.assert_has_calls(
+            [
+                mock.call(
+                    search_opts={'all_tenants': 1, 'limit': 2, 'offset': o},
+                    sort_key='name',
+                )
+                for o in (0, 2, 4, 5)
+            ]
+        )
+
+    def test_iter_list_exact_multiple_of_page_size(self):
+        manager = base.ManagerWithFind(cs)
+        mock_list = self._mock_paged_list(manager, list(range(4)))
+
+        self.assertEqual([0, 1, 2, 3], list(manager.iter_list(page_size=2)))
+        self.assertEqual(3, mock_list.call_count)
+
+    def test_iter_list_with_limit_and_offset(self):
+        manager = base.ManagerWithFind(cs)
+        mock_list = self._mock_paged_list(manager, list(range(10)))
+
+        result = manager.iter_list(
+            page_size=2, search_opts={'limit': 3, 'offset': 4}
+        )
+
+        self.assertEqual([4, 5, 6], list(result))
+        mock_list.assert_has_calls(
+            [
+                mock.call(search_opts={'limit': 2, 'offset': 4}),
+                mock.call(search_opts={'limit': 1, 'offset': 6}),
+            ]
+        )
+        self.assertEqual(2, mock_list.call_count)
+
+    def test_iter_list_server_caps_page_size(self):
+        manager = base.ManagerWithFind(cs)
+        items = list(range(8))
+
+        def fake_list(search_opts=None, **kwargs):
+            # osapi_max_limit is lower than the page size.
+            offset = search_opts['offset']
+            return items[offset : offset + min(search_opts['limit'], 3)]
+
+        mock_list = self.mock_object(
+            manager, 'list', mock.Mock(side_effect=fake_list)
+        )
+
+        self.assertEqual(items, list(manager.iter_list(page_size=5)))
+        mock_list.assert_has_calls(
+            [
+                mock.call(search_opts={'limit': 5, 'offset': o})
+                for o in (0, 3, 6, 8)
+            ]
+        )
+        self.assertEqual(
+            [0, 1, 2, 3],
+            list(manager.iter_list(page_size=5, search_opts={'limit': 4})),
+        )
+
+    def test_iter_list_server_ignores_offset(self):
+        manager = base.ManagerWithFind(cs)
+        mock_list = self.mock_object(
+            manager, 'list', mock.Mock(return_value=[0, 1])
+        )
+
+        self.assertEqual([0, 1], list(manager.iter_list(page_size=5)))
+        self.assertEqual(2, mock_list.call_count)
+
+    def test_iter_list_server_ignores_pagination(self):
+        manager = base.ManagerWithFind(cs)
+        mock_list = self.mock_object(
+            manager, 'list', mock.Mock(return_value=list(range(5)))
+        )
+
+        self.assertEqual([0, 1, 2, 3, 4], list(manager.iter_list(page_size=2)))
+        self.assertEqual(1, mock_list.call_count)
+
+    def test_iter_list_server_ignores_pagination_with_limit(self):
+        manager = base.ManagerWithFind(cs)
+        self.mock_object(
+            manager, 'list', mock.Mock(return_value=list(range(5)))
+        )
+
+        self.assertEqual(
+            [0, 1, 2],
+            list(manager.iter_list(page_size=2, search_opts={'limit': 3})),
+        )
+
+    def test_iter_list_with_count(self):
+        manager = base.ManagerWithFind(cs)
+        self.mock_object(manager, 'list', mock.Mock(return_value=([1, 2], 2)))
+
+        self.assertEqual([1, 2], list(manager.iter_list(page_size=5)))
+
+    def test_iter_list_invalid_page_size(self):
+        manager = base.ManagerWithFind(cs)
+
+        self.assertRaises(ValueError, list, manager.iter_list(page_size=0))
+
+    def test_iter_list_shares(self):
+        self.mock_completion()
+        client = fakes.FakeClient()
+
+        result = list(client.shares.iter_list(page_size=10))
+
+        client.assert_called(
+            'GET', '/shares/detail?is_public=True&limit=10', pos=0
+        )
+        # The fake server ignores the offset, the iteration stops when it
+        # returns the same page again.
+        client.assert_called(
+            'GET', '/shares/detail?is_public=True&limit=10&offset=4'
+        )
+        self.assertEqual(4, len(result))
+        self.assertTrue(all(isinstance(s, shares.Share) for s in result))
+
+    def test_findall_by_name_filters_on_server(self):
+        client = fakes.FakeClient(api_version=api_versions.APIVersion('2.68'))
+        share = shares.Share(None, {'id': 'fake_id', 'name': 'fake_name'})
+        mock_list = self.mock_object(
+            client.shares, 'list', mock.Mock(return_value=[share])
+        )
+
+        result = client.shares.find(name='fake_name')
+
+        self.assertEqual(share, result)
+        mock_list.assert_called_once_with(
+            search_opts={'all_tenants': 1, 'name': 'fake_name'}
+        )
+
+    def test_findall_by_name_filters_soft_deleted_on_server(self):
+        client = fakes.FakeClient()
+        mock_list = self.mock_object(
+            client.shares, 'list', mock.Mock(return_value=[])
+        )
+
+        client.shares.findall(name='fake_name')
+
+        mock_list.assert_has_calls(
+            [
+                mock.call(search_opts={'all_tenants': 1, 'name': 'fake_name'}),
+                mock.call(
+                    search_opts={
+                        'all_tenants': 1,
+                        'name': 'fake_name',
+                        'is_soft_deleted': True,
+                    }
+                ),
+            ]
+        )
+
+    def test_findall_without_server_side_name_filter(self):
+        manager = base.ManagerWithFind(cs)
+        resource = base.Resource(None, {'id': 'fake_id', 'name': 'fake'})
+        other = base.Resource(None, {'id': 'other_id', 'name': 'other'})
+        mock_list = self.mock_object(
+            manager, 'list', mock.Mock(return_value=[resource, other])
+        )
+
+        self.assertEqual([resource], manager.findall(name='fake'))
+        mock_list.assert_called_once_with(search_opts={'all_tenants': 1})
+
+    def test_list_without_completion_cache(self):
+        client = fakes.FakeClient()
+        mock_submit = self.mock_object(base.completion_cache.WRITER, 'submit')
+        mock_makedirs = self.mock_object(base.os, 'makedirs')
+
+        client.shares.list()
+
+        mock_submit.assert_not_called()
+        mock_makedirs.assert_not_called()
+
+    def test_list_with_completion_cache(self):
+        client = fakes.FakeClient()
+        client.use_completion_cache = True
+        self.useFixture(
+            fixtures.EnvironmentVariable(
+                'MANILACLIENT_UUID_CACHE_DIR', '/fake_dir'
+            )
+        )
+        mock_submit = self.mock_object(base.completion_cache.WRITER, 'submit')
+
+        result = client.shares.list()
+
+        mock_submit.assert_has_calls(
+            [
+                mock.call(
+                    StartsWith('/fake_dir/', 'share-uuid-cache'),
+                    [share.id for share in result],
+                    append=False,
+                ),
+                mock.call(
+                    StartsWith('/fake_dir/', 'share-human-id-cache'),
+                    [],
+                    append=False,
+                ),
+            ]
+        )
+
+    def test_create_with_completion_cache(self):
+        client = fakes.FakeClient()
+        client.use_completion_cache = True
+        mock_submit = self.mock_object(base.completion_cache.WRITER, 'submit')
+
+        share = client.shares.create('nfs', 1)
+
+        mock_submit.assert_any_call(mock.ANY, [share.id], append=True)
+
+    def test_write_to_completion_cache(self):
+        client = fakes.FakeClient()
+        client.use_completion_cache = True
+        self.useFixture(
+            fixtures.EnvironmentVariable(
+                'MANILACLIENT_UUID_CACHE_DIR', '/fake_dir'
+            )
+        )
+        mock_submit = self.mock_object(base.completion_cache.WRITER, 'submit')
+
+        with warnings.catch_warnings(record=True) as caught:
+            warnings.simplefilter('always')
+            client.shares.write_to_completion_cache('uuid', 'fake_id')
+
+        self.assertTrue(
+            any(issubclass(w.category, DeprecationWarning) for w in caught)
+        )
+        mock_submit.assert_called_once_with(
+            StartsWith('/fake_dir/', 'share-uuid-cache'),
+            ['fake_id'],
+            append=True,
+        )
+
+    def test_write_to_completion_cache_disabled(self):
+        client = fakes.FakeClient()
+        mock_submit = self.mock_object(base.completion_cache.WRITER, 'submit')
+
+        with warnings.catch_warnings():
+            warnings.simplefilter('ignore')
+            client.shares.write_to_completion_cache('uuid', 'fake_id')
+
+        mock_submit.assert_not_called()
+
+    def _get_client_with_resource_cache(self):
+        client = fakes.FakeClient()
+        client.resource_cache = resource_cache.ResourceCache()
+        return client
+
+    def test_get_with_resource_cache(self):
+        client = self._get_client_with_resource_cache()
+
+        first = client.share_types.get('1234')
+        second = client.share_types.get('1234')
+
+        self.assertEqual(first, second)
+        self.assertEqual(1, len(client.client.callstack))
+
+    def test_get_with_resource_cache_keyed_by_version(self):
+        client = self._get_client_with_resource_cache()
+
+        client.share_types.get('1234')
+        client.api_version = api_versions.APIVersion('2.10')
+        client.share_types.get('1234')
+
+        self.assertEqual(2, len(client.client.callstack))
+
+    def test_list_with_resource_cache(self):
+        client = self._get_client_with_resource_cache()
+
+        client.share_types.list()
+        client.share_types.list()
+
+        self.assertEqual(1, len(client.client.callstack))
+
+    def test_resource_cache_cleared_on_write(self):
+        client = self._get_client_with_resource_cache()
+
+        client.share_types.get('1234')
+        client.share_types.delete('fake_type1')
+        client.share_types.get('1234')
+
+        self.assertEqual(3, len(client.client.callstack))
+
+    def test_resource_cache_not_used_without_opt_in(self):
+        client = self._get_client_with_resource_cache()
+
+        client.shares.get('1234')
+        client.shares.get('1234')
+
+        self.assertEqual(2, len(client.client.callstack))
+        self.assertEqual(0, len(client.resource_cache))
+
+    def test_resource_cache_bypass(self):
+        client = self._get_client_with_resource_cache()
+
+        client.share_types.get('1234')
+        with resource_cache.bypass():
+            client.share_types.get('1234')
+
+        self.assertEqual(2, len(client.client.callstack))
+
+
+class CompactResourceTest(utils.TestCase):
+    def _get_manager(self, compact_resources, body=None):
+        api = mock.Mock(
+            compact_resources=compact_resources,
+            use_completion_cache=False,
+            resource_cache=None,
+        )
+        api.client.get.return_value = (None, body)
+        return shares.ShareManager(api)
+
+    def test_attributes(self):
+        manager = self._get_manager(True)
+        info = {'id': 'fake_id', 'name': 'fake', 'status': 'available'}
+
+        share = shares.Share(manager, info, loaded=True)
+
+        self.assertEqual('fake', share.name)
+        self.assertEqual('available', share.status)
+        self.assertNotIn('name', vars(share))
+        self.assertIs(info, share._info)
+        self.assertRaises(AttributeError, getattr, share, 'missing')
+        self.assertEqual(info, share.to_dict())
+
+    def test_setattr_overrides_field(self):
+        manager = self._get_manager(True)
+        share = shares.Share(manager, {'id': 'fake_id', 'name': 'fake'})
+
+        share.name = 'new'
+
+        self.assertEqual('new', share.name)
+
+    def test_repr(self):
+        manager = self._get_manager(True)
+        resource = base.Resource(manager, dict(foo="bar", baz="spam"))
+
+        self.assertEqual("<Resource baz=spam, foo=bar>", repr(resource))
+
+    def test_lazy_loading(self):
+        manager = self._get_manager(True)
+        manager.get = mock.Mock(
+            return_value=shares.Share(
+                manager, {'id': 'fake_id', 'size': 1}, loaded=True
+            )
+        )
+        share = shares.Share(manager, {'id': 'fake_id'})
+
+        self.assertEqual(1, share.size)
+        manager.get.assert_called_once_with('fake_id')
+
+    def test_listing_memory(self):
+        # NOTE: a synthetic detailed listing of 100k shares, the resources
+        # built for it in compact mode must take much less memory.
+        fields = (
+            'name',
+            'status',
+            'size',
+            'share_proto',
+            'host',
+            'share_type',
+            'availability_zone',
+            'created_at',
+            'project_id',
+            'description',
+            'is_public',
+            'share_network_id',
+            'snapshot_id',
+            'task_state',
+            'replication_type',
+            'share_group_id',
+            'user_id',
+            'metadata',
+        )
+        body = {
+            'shares': [
+                dict({field: f'{field}-{i}' for field in fields}, id=str(i))
+                for i in range(100000)
+            ]
+        }
+
+        def measure(compact_resources):
+            manager = self._get_manager(compact_resources, body=body)
+            # NOTE: use a fresh class for each mode, instances of a class
+            # share the layout of their attributes dict.
+            manager.resource_class = type('Share', (shares.Share,), {})
+            tracemalloc.start()
+            try:
+                result = manager._list('/shares/detail', 'shares')
+                memory = tracemalloc.get_traced_memory()[0]
+            finally:
+                tracemalloc.stop()
+            self.assertEqual(100000, len(result))
+            return memory
+
+        regular = measure(False)
+        compact = measure(True)
+
+        self.assertLess(compact, regular / 2)
+
+
+class StreamingListTest(utils.TestCase):
+    def _get_manager(self, stream_listings, payload):
+        api = mock.Mock(
+            compact_resources=False,
+            stream_listings=stream_listings,
+            use_completion_cache=False,
+            resource_cache=None,
+        )
+        self.responses = []
+
+        def get(url, stream=False):
+            resp = mock.Mock()
+            self.responses.append(resp)
+            resp.iter_content.side_effect = lambda chunk_size: (
+                payload[i : i + chunk_size]
+                for i in range(0, len(payload), chunk_size)
+            )
+            return resp, None if stream else json.loads(payload)
+
+        api.client.get.side_effect = get
+        return shares.ShareManager(api)
+
+    def test_list_stream(self):
+        body = {
+            'shares': [{'id': '1', 'name': 'a'}, {}, {'id': '2'}],
+            'shares_links': [{'href': 'fake', 'rel': 'next'}],
+        }
+        manager = self._get_manager(True, json.dumps(body).encode())
+
+        result = manager._list('/shares/detail', 'shares', stream=True)
+
+        # Nothing is requested until the listing is iterated.
+        manager.api.client.get.assert_not_called()
+        self.assertEqual(['1', '2'], [share.id for share in result])
+        manager.api.client.get.assert_called_once_with(
+            '/shares/detail', stream=True
+        )
+        self.responses[0].close.assert_called_once_with()
+
+    def test_list_stream_not_enabled(self):
+        body = {'shares': [{'id': '1'}]}
+        manager = self._get_manager(False, json.dumps(body).encode())
+
+        result = manager._list('/shares/detail', 'shares', stream=True)
+
+        self.assertIsInstance(result, list)
+        manager.api.client.get.assert_called_once_with('/shares/detail')
+
+    def test_list_stream_with_count(self):
+        body = {'shares': [{'id': '1'}], 'count': 1}
+        manager = self._get_manager(True, json.dumps(body).encode())
+
+        result, count = manager._list(
+            '/shares/detail?with_count=True', 'shares', stream=True
+        )
+
+        self.assertEqual(1, count)
+        self.assertEqual('1', result[0].id)
+
+    def test_shares_list_stream(self):
+        body = {'shares': [{'id': '1'}, {'id': '2'}]}
+        manager = self._get_manager(True, json.dumps(body).encode())
+        manager.api.api_version = api_versions.APIVersion('2.69')
+
+        result = manager.list()
+
+        self.assertEqual(['1', '2'], [share.id for share in result])
+        manager.api.client.get.assert_called_once_with(
+            '/shares/detail?is_public=True', stream=True
+        )
+
+    def test_list_stream_memory(self):
+        # NOTE: a synthetic detailed listing of 10k shares, consuming it as
+        # it is streamed must peak at a fraction of the memory needed to
+        # decode it at once.
+        fields = (
+            'name',
+            'status',
+            'size',
+            'share_proto',
+            'host',
+            'share_type',
+            'availability_zone',
+            'created_at',
+            'project_id',
+            'description',
+        )
+        body = {
+            'shares': [
+                dict({field: f'{field}-{i}' for field in fields}, id=str(i))
+                for i in range(10000)
+            ]
+        }
+        payload = json.dumps(body).encode()
+        del body
+
+        def measure(stream_listings):
+            manager = self._get_manager(stream_listings, payload)
+            tracemalloc.start()
+            try:
+                count = 0
+                for share in manager._list(
+                    '/shares/detail', 'shares', stream=True
+                ):
+                    count += 1
+                peak = tracemalloc.get_traced_memory()[1]
+            finally:
+                tracemalloc.stop()
+            self.assertEqual(10000, count)
+            return peak
+
+        buffered = measure(False)
+        streamed = measure(True)
+
+        self.assertLess(streamed, buffered / 10)
+
+
+class StartsWith:
+    def __init__(self, prefix, suffix):
+        self.prefix = prefix
+        self.suffix = suffix
+
+    def __eq__(self, other):
+        return other.startswith(self.prefix) and other.endswith(self.suffix)
+
+    def __repr__(self):
+        return f"<{self.prefix}...{self.suffix}>"
@@ -92,3 +92,9 @@ class TestResponse(requests.Response):
     @property
     def text(self):
         return self._text
+
+    @property
+    def content(self):
+        if isinstance(self._text, str):
+            return self._text.encode('utf-8')
+        return self._text
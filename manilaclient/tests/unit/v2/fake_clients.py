@@ -43,7 +43,7 @@ class FakeHTTPClient(httpclient.HTTPClient):
         self.password = 'password'
         self.auth_url = 'auth_url'
         self.callstack = []
-        self.base_url = 'localhost'
+        self._base_url = 'localhost'
         self.default_headers = {
             'X-Auth-Token': 'xabc123',
             'X-Openstack-Manila-Api-Version': api_version,
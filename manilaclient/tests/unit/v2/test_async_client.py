@@ -0,0 +1,212 @@
+# Licensed under the Apache License, Version 2.0 (the "License"); you may
+# not use this file except in compliance with the License. You may obtain
+# a copy of the License at
+#
+# http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+# WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+# License for the specific language governing permissions and limitations
+# under the License.
+
+import asyncio
+from concurrent import futures
+import threading
+from unittest import mock
+
+from manilaclient.common import httpclient
+from manilaclient.common import resource_cache
+from manilaclient import exceptions
+from manilaclient.tests.unit import utils
+from manilaclient.tests.unit.v2 import fakes
+from manilaclient.v2 import async_client
+from manilaclient.v2 import shares
+
+
+class ThreadedAsyncClientTest(utils.TestCase):
+    def setUp(self):
+        super().setUp()
+        self.mock_completion()
+        self.cs = fakes.FakeClient()
+        self.async_cs = async_client.ThreadedAsyncClient(client=self.cs)
+        self.addCleanup(self.async_cs.executor.shutdown)
+
+    def test_managers_are_wrapped(self):
+        managers = self.async_cs.shares
+
+        self.assertIsInstance(managers, async_client.AsyncManager)
+        self.assertIs(self.cs.shares, managers.manager)
+        self.assertIs(managers, self.async_cs.shares)
+        self.assertIs(
+            self.cs.share_snapshots, self.async_cs.share_snapshots.manager
+        )
+        self.assertEqual(self.cs.api_version, self.async_cs.api_version)
+
+    def test_non_manager_attributes_are_not_wrapped(self):
+        self.assertIs(self.cs.client, self.async_cs.client.client)
+        self.assertIs(shares.Share, self.async_cs.shares.resource_class)
+
+    def test_get(self):
+        share = asyncio.run(self.async_cs.shares.get('1234'))
+
+        self.cs.assert_called('GET', '/shares/1234')
+        self.assertIsInstance(share, shares.Share)
+        self.assertIs(self.cs.shares, share.manager)
+
+    def test_list(self):
+        result = asyncio.run(self.async_cs.shares.list())
+
+        self.cs.assert_called('GET', '/shares/detail?is_public=True')
+        self.assertTrue(all(isinstance(s, shares.Share) for s in result))
+
+    def test_iter_list(self):
+        async def collect():
+            return [
+                share
+                async for share in self.async_cs.shares.iter_list(page_size=10)
+            ]
+
+        result = asyncio.run(collect())
+
+        self.cs.assert_called(
+            'GET', '/shares/detail?is_public=True&limit=10', pos=0
+        )
+        # The fake server ignores the offset, the iteration stops when it
+        # returns the same page again.
+        self.cs.assert_called(
+            'GET', '/shares/detail?is_public=True&limit=10&offset=4'
+        )
+        self.assertEqual(4, len(result))
+        self.assertTrue(all(isinstance(s, shares.Share) for s in result))
+
+    def test_iter_list_left_early(self):
+        threads = []
+
+        def iter_list():
+            try:
+                yield 1
+                yield 2
+            finally:
+                threads.append(threading.current_thread())
+
+        self.cs.shares.iter_list = iter_list
+
+        async def first():
+            iterator = self.async_cs.shares.iter_list()
+            try:
+                async for item in iterator:
+                    return item
+            finally:
+                await iterator.aclose()
+
+        self.assertEqual(1, asyncio.run(first()))
+        self.assertEqual(1, len(threads))
+        self.assertIsNot(threading.main_thread(), threads[0])
+
+    def test_concurrent_gets(self):
+        async def gather():
+            return await asyncio.gather(
+                *[self.async_cs.shares.get('1234') for _ in range(10)]
+            )
+
+        result = asyncio.run(gather())
+
+        self.assertEqual(10, len(result))
+        self.assertEqual(10, len(self.cs.client.callstack))
+
+    def test_errors_are_propagated(self):
+        self.mock_object(
+            self.cs.shares,
+            'get',
+            mock.Mock(side_effect=exceptions.NotFound(404)),
+        )
+
+        self.assertRaises(
+            exceptions.NotFound,
+            asyncio.run,
+            self.async_cs.shares.get('fake'),
+        )
+
+    def test_request_headers_in_task(self):
+        self.mock_object(
+            self.cs.shares,
+            'get',
+            mock.Mock(
+                side_effect=lambda share: httpclient._request_headers.get()
+            ),
+        )
+
+        async def get():
+            with httpclient.request_headers({'X-Fake': 'fake'}):
+                return await self.async_cs.shares.get('1234')
+
+        self.assertEqual({'X-Fake': 'fake'}, asyncio.run(get()))
+
+    def test_resource_cache_bypass_in_task(self):
+        async def bypassed():
+            with resource_cache.bypass():
+                return await self.async_cs.run(resource_cache._bypass.get)
+
+        self.assertTrue(asyncio.run(bypassed()))
+
+    def test_external_executor_is_not_shut_down(self):
+        executor = mock.Mock(spec=futures.Executor)
+        async_cs = async_client.ThreadedAsyncClient(
+            client=mock.Mock(), executor=executor
+        )
+
+        asyncio.run(async_cs.aclose())
+
+        executor.shutdown.assert_not_called()
+
+    def test_context_manager_closes_client(self):
+        async_cs = async_client.ThreadedAsyncClient(
+            client=mock.Mock(), max_workers=2
+        )
+
+        async def use():
+            async with async_cs as c:
+                return c
+
+        self.assertIs(async_cs, asyncio.run(use()))
+        async_cs.client.client.close.assert_called_once_with()
+
+    def test_client_created_from_kwargs(self):
+        mock_client = self.mock_object(async_client.client, 'Client')
+        mock_client.return_value.client.pool_maxsize = 10
+
+        async_cs = async_client.ThreadedAsyncClient(
+            input_auth_token='token', service_catalog_url='http://fake'
+        )
+        self.addCleanup(async_cs.executor.shutdown)
+
+        mock_client.assert_called_once_with(
+            input_auth_token='token', service_catalog_url='http://fake'
+        )
+        self.assertIs(mock_client.return_value, async_cs.client)
+
+    def test_executor_sized_after_connection_pool(self):
+        self.cs.client.pool_maxsize = 4
+
+        async_cs = async_client.ThreadedAsyncClient(client=self.cs)
+        self.addCleanup(async_cs.executor.shutdown)
+
+        self.assertEqual(4, async_cs.executor._max_workers)
+
+    def test_connection_pool_sized_after_max_workers(self):
+        mock_client = self.mock_object(async_client.client, 'Client')
+
+        async_cs = async_client.ThreadedAsyncClient(
+            input_auth_token='token',
+            service_catalog_url='http://fake',
+            max_workers=32,
+        )
+        self.addCleanup(async_cs.executor.shutdown)
+
+        mock_client.assert_called_once_with(
+            input_auth_token='token',
+            service_catalog_url='http://fake',
+            pool_maxsize=32,
+        )
+        self.assertEqual(32, async_cs.executor._max_workers)
@@ -10,6 +10,8 @@
 # License for the specific language governing permissions and limitations
 # under the License.
 
+import subprocess
+import sys
 from unittest import mock
 
 import ddt
@@ -70,6 +72,320 @@ class ClientTest(utils.TestCase):
         self.assertIsNotNone(c.client)
         self.assertIsNone(c.keystone_client)
 
+    def test_session_transport(self):
+        s = mock.Mock()
+        s.get_endpoint.return_value = 'http://manila.example.com/v2'
+        s.get_token.return_value = 'token'
+
+        c = client.Client(
+            session=s,
+            api_version=manilaclient.API_MAX_VERSION,
+            region_name='RegionOne',
+            use_session_transport=True,
+        )
+
+        self.assertIs(s, c.client.session_adapter.session)
+        self.assertEqual('RegionOne', c.client.session_adapter.region_name)
+        self.assertNotIn('X-Auth-Token', c.client.default_headers)
+        self.assertIsNone(c.client.http_session)
+
+    def test_session_transport_with_token(self):
+        self.assertRaises(
+            exceptions.ClientException,
+            client.Client,
+            input_auth_token='token',
+            service_catalog_url='http://fake',
+            api_version=manilaclient.API_MAX_VERSION,
+            use_session_transport=True,
+        )
+
+    def test_deferred_authentication(self):
+        s = mock.Mock()
+        s.get_endpoint.return_value = 'http://manila.example.com/v2'
+        s.get_token.return_value = 'token'
+
+        c = client.Client(session=s, api_version=manilaclient.API_MAX_VERSION)
+
+        # Creating the client doesn't make any round trip to Keystone.
+        s.get_token.assert_not_called()
+        s.get_endpoint.assert_not_called()
+
+        http_session = self.mock_object(c.client, 'http_session')
+        http_session.request.return_value = utils.TestResponse(
+            {'status_code': 200, 'text': '{"shares": []}'}
+        )
+        for _ in range(2):
+            c.shares.list(detailed=False)
+
+        # The token and the endpoint are looked up once, on first use.
+        s.get_token.assert_called_once_with(c.keystone_client.auth)
+        s.get_endpoint.assert_called_once()
+        self.assertEqual(
+            'token',
+            http_session.request.call_args[1]['headers']['X-Auth-Token'],
+        )
+        self.assertEqual('http://manila.example.com/', c.client.base_url)
+
+    def test_deferred_authentication_failure(self):
+        s = mock.Mock()
+        s.get_token.side_effect = [None, 'token']
+
+        c = client.Client(
+            session=s,
+            service_catalog_url='http://manila.example.com/v2',
+            api_version=manilaclient.API_MAX_VERSION,
+        )
+
+        self.assertRaises(RuntimeError, getattr, c.client, 'token')
+        # Failures are not memoized, the next request tries again.
+        self.assertEqual('token', c.client.token)
+
+    def _get_session_client(self, **kwargs):
+        s = mock.Mock()
+        s.get_endpoint.return_value = 'http://manila.example.com/v2'
+        s.get_token.return_value = 'token'
+        auth = mock.Mock(auth_url='http://keystone.example.com/v3')
+        return client.Client(
+            session=s,
+            auth=auth,
+            api_version=manilaclient.API_MAX_VERSION,
+            **kwargs,
+        )
+
+    def test_for_project(self):
+        c = self._get_session_client(resource_cache_ttl=10)
+
+        project_client = c.for_project(project_id='project1')
+
+        self.assertIsNot(c, project_client)
+        self.assertEqual('project1', project_client.project_id)
+        self.assertIs(c.api_version, project_client.api_version)
+        self.assertIs(
+            c.client.http_session, project_client.client.http_session
+        )
+        self.assertIs(
+            c.client.retry_policy, project_client.client.retry_policy
+        )
+        self.assertIs(project_client, project_client.shares.api)
+        self.assertIs(project_client, project_client.share_types.api)
+        self.assertIsNot(c.resource_cache, project_client.resource_cache)
+        self.assertEqual(10, project_client.resource_cache.ttl)
+        auth = project_client.keystone_client.auth
+        self.assertIsInstance(auth, client._ProjectToken)
+        self.assertEqual('http://keystone.example.com/v3', auth.auth_url)
+        self.assertEqual('project1', auth._project_id)
+        # The token to rescope and the endpoint of the project are only
+        # looked up on first use.
+        c.keystone_client.session.get_token.assert_not_called()
+        c.keystone_client.session.get_endpoint.assert_not_called()
+        self.assertEqual(
+            'http://manila.example.com/', project_client.client.base_url
+        )
+        c.keystone_client.session.get_endpoint.assert_called_once_with(
+            project_client.keystone_client.auth,
+            interface='publicURL',
+            service_type='sharev2',
+            region_name=None,
+        )
+
+    def _get_project_ids(self, c):
+        root_auth = c.keystone_client.auth
+
+        def get_project_id(auth):
+            return 'parent' if auth is root_auth else auth._project_id
+
+        return get_project_id
+
+    def test_for_project_scoped_endpoint_override(self):
+        c = self._get_session_client(
+            service_catalog_url='http://manila.example.com/v2/parent'
+        )
+        session = c.keystone_client.session
+        session.get_project_id.side_effect = self._get_project_ids(c)
+
+        project_client = c.for_project(project_id='project1')
+
+        self.assertEqual(
+            'http://manila.example.com/v2/project1',
+            project_client.client.endpoint_url,
+        )
+        self.assertEqual(
+            'http://manila.example.com/v2/parent', c.client.endpoint_url
+        )
+        session.get_endpoint.assert_not_called()
+
+    def test_for_project_endpoint_override(self):
+        c = self._get_session_client(
+            service_catalog_url='http://manila.example.com/v2'
+        )
+        session = c.keystone_client.session
+        session.get_project_id.side_effect = self._get_project_ids(c)
+
+        project_client = c.for_project(project_id='project1')
+
+        self.assertEqual(
+            'http://manila.example.com/v2', project_client.client.endpoint_url
+        )
+
+    def test_for_project_scoped_catalog_endpoint(self):
+        c = self._get_session_client()
+        session = c.keystone_client.session
+        get_project_id = self._get_project_ids(c)
+        session.get_endpoint.side_effect = lambda auth, **kwargs: (
+            f'http://manila.example.com/v2/{get_project_id(auth)}'
+        )
+
+        project_client = c.for_project(project_id='project1')
+
+        self.assertEqual(
+            'http://manila.example.com/v2/project1',
+            project_client.client.endpoint_url,
+        )
+        self.assertEqual(
+            'http://manila.example.com/v2/parent', c.client.endpoint_url
+        )
+
+    def test_for_project_caches_scoped_auth(self):
+        c = self._get_session_client()
+
+        clients = [
+            c.for_project(project_id=f'project{i % 2}') for i in range(4)
+        ]
+        clients.append(clients[0].for_project(project_id='project1'))
+
+        self.assertEqual(2, len(c._project_auths))
+        self.assertIs(
+            clients[0].keystone_client.auth, clients[2].keystone_client.auth
+        )
+        self.assertIs(
+            clients[1].keystone_client.auth, clients[4].keystone_client.auth
+        )
+        self.assertIsNot(
+            clients[0].keystone_client.auth, clients[1].keystone_client.auth
+        )
+
+    def test_for_project_drops_expired_scoped_auth(self):
+        c = self._get_session_client()
+        auth = c.for_project(project_id='p').keystone_client.auth
+        auth.auth_ref = mock.Mock()
+        auth.auth_ref.will_expire_soon.return_value = False
+
+        self.assertIs(auth, c.for_project(project_id='p').keystone_client.auth)
+
+        auth.auth_ref.will_expire_soon.return_value = True
+        new_auth = c.for_project(project_id='p').keystone_client.auth
+
+        self.assertIsNot(auth, new_auth)
+        self.assertIs(
+            new_auth, c.for_project(project_id='p').keystone_client.auth
+        )
+
+    def _rescope(self, auth, session):
+        # Authenticate without version discovery, recording the token which
+        # is rescoped.
+        tokens = []
+
+        def create_plugin(session):
+            tokens.append(auth._token)
+            plugin = mock.Mock()
+            plugin.get_auth_ref.return_value = auth._token
+            return plugin
+
+        with mock.patch.object(
+            auth, '_do_create_plugin', side_effect=create_plugin
+        ):
+            return auth.get_auth_ref(session), tokens
+
+    def test_for_project_root_token_expiry(self):
+        c = self._get_session_client()
+        s = c.keystone_client.session
+        s.get_token.side_effect = ['root1', 'root2']
+        auth = c.for_project(project_id='p').keystone_client.auth
+
+        # The root token expired and was renewed between both
+        # authentications, the current one is rescoped.
+        self.assertEqual(('root1', ['root1']), self._rescope(auth, s))
+        self.assertEqual(('root2', ['root2']), self._rescope(auth, s))
+        s.get_token.assert_called_with(c._root_auth)
+
+    def test_for_project_root_token_revoked(self):
+        c = self._get_session_client()
+        s = c.keystone_client.session
+        s.get_token.side_effect = ['revoked', 'root']
+        auth = c.for_project(project_id='p').keystone_client.auth
+        plugins = [mock.Mock(), mock.Mock()]
+        plugins[0].get_auth_ref.side_effect = client.ks_exceptions.Unauthorized
+        plugins[1].get_auth_ref.return_value = 'auth_ref'
+
+        with mock.patch.object(auth, '_do_create_plugin', side_effect=plugins):
+            self.assertEqual('auth_ref', auth.get_auth_ref(s))
+
+        c._root_auth.invalidate.assert_called_once_with()
+        self.assertEqual('root', auth._token)
+
+    def test_for_project_root_token_revoked_not_renewable(self):
+        c = self._get_session_client()
+        s = c.keystone_client.session
+        c._root_auth.invalidate.return_value = False
+        auth = c.for_project(project_id='p').keystone_client.auth
+        plugin = mock.Mock()
+        plugin.get_auth_ref.side_effect = client.ks_exceptions.Unauthorized
+
+        with mock.patch.object(auth, '_do_create_plugin', return_value=plugin):
+            self.assertRaises(
+                client.ks_exceptions.Unauthorized, auth.get_auth_ref, s
+            )
+
+        s.get_token.assert_called_once_with(c._root_auth)
+
+    def test_for_project_sweep_shares_connections(self):
+        c = self._get_session_client()
+        http_session = self.mock_object(c.client, 'http_session')
+        http_session.request.return_value = utils.TestResponse(
+            {'status_code': 200, 'text': '{"shares": []}'}
+        )
+
+        tokens = set()
+        for i in range(20):
+            project_client = c.for_project(project_id=f'project{i}')
+            project_client.shares.list(detailed=False)
+            tokens.add(project_client.keystone_client.auth)
+
+        self.assertEqual(20, len(tokens))
+        self.assertEqual(20, http_session.request.call_count)
+        # Version discovery isn't repeated for every project.
+        for call in http_session.request.call_args_list:
+            self.assertIn('/shares', call[0][1])
+
+    def test_for_project_session_transport(self):
+        c = self._get_session_client(use_session_transport=True)
+
+        project_client = c.for_project(project_name='p', project_domain_id='d')
+
+        session_adapter = project_client.client.session_adapter
+        self.assertIsNot(c.client.session_adapter, session_adapter)
+        self.assertIs(c.keystone_client.session, session_adapter.session)
+        self.assertEqual('p', session_adapter.auth._project_name)
+        self.assertEqual('d', session_adapter.auth.project_domain_id)
+
+    def test_for_project_errors(self):
+        c = client.Client(
+            input_auth_token='token',
+            service_catalog_url='http://manila.example.com/v2',
+            api_version=manilaclient.API_MAX_VERSION,
+        )
+        self.assertRaises(
+            exceptions.ClientException, c.for_project, project_id='p'
+        )
+
+        c = self._get_session_client()
+        self.assertRaises(exceptions.ClientException, c.for_project)
+
+        c._root_auth = mock.Mock(auth_url=None)
+        self.assertRaises(
+            exceptions.ClientException, c.for_project, project_id='p'
+        )
+
     def test_auth_via_token(self):
         base_url = uuidutils.generate_uuid(dashed=False)
 
@@ -82,6 +398,28 @@ class ClientTest(utils.TestCase):
         self.assertIsNotNone(c.client)
         self.assertIsNone(c.keystone_client)
 
+    def test_credentials_are_not_used_on_creation(self):
+        request = self.mock_object(client.session.Session, 'request')
+
+        c = client.Client(
+            username='user',
+            password='password',
+            project_name='project',
+            user_domain_id='default',
+            project_domain_id='default',
+            auth_url='http://keystone.example.com/identity',
+            api_version=manilaclient.API_MAX_VERSION,
+        )
+
+        # Keystone is neither discovered nor asked for a token or an
+        # endpoint until the first request.
+        request.assert_not_called()
+        self.assertIsInstance(c.keystone_client.auth, client.identity.Password)
+        self.assertEqual(
+            'http://keystone.example.com/identity',
+            c.keystone_client.auth.auth_url,
+        )
+
     @mock.patch.object(client.Client, '_get_keystone_auth_and_session')
     def test_valid_region_name_v1(self, mock_get_auth):
         self.mock_object(client.httpclient, 'HTTPClient')
@@ -105,9 +443,12 @@ class ClientTest(utils.TestCase):
         )
 
         self.assertTrue(mock_get_auth.called)
+        endpoint, token = client.httpclient.HTTPClient.call_args[0][:2]
+        self.assertEqual('http://1.2.3.4', endpoint())
+        self.assertEqual('fake_token', token())
         client.httpclient.HTTPClient.assert_called_with(
-            'http://1.2.3.4',
-            'fake_token',
+            mock.ANY,
+            mock.ANY,
             'python-manilaclient',
             insecure=False,
             cacert=None,
@@ -116,6 +457,14 @@ class ClientTest(utils.TestCase):
             retries=None,
             http_log_debug=False,
             api_version=manilaclient.API_DEPRECATED_VERSION,
+            pool_maxsize=None,
+            connection_retries=None,
+            keep_alive=True,
+            json_decoder=None,
+            retry_policy=None,
+            rate_limiter=None,
+            instruments=None,
+            session_adapter=None,
         )
         self.assertIsNotNone(c.client)
 
@@ -134,12 +483,12 @@ class ClientTest(utils.TestCase):
         mocked_adapter.session.get_endpoint.return_value = None
         mocked_adapter.auth = mock_auth
 
-        self.assertRaises(
-            RuntimeError,
-            client.Client,
+        c = client.Client(
             api_version=manilaclient.API_MAX_VERSION,
             region_name='FakeRegion',
         )
+
+        self.assertRaises(RuntimeError, getattr, c.client, 'endpoint_url')
         self.assertTrue(mock_get_auth.called)
         mocked_adapter.session.get_endpoint.assert_called_with(
             mock_auth,
@@ -171,15 +520,18 @@ class ClientTest(utils.TestCase):
         )
 
         self.assertTrue(mock_get_auth.called)
+        endpoint, token = client.httpclient.HTTPClient.call_args[0][:2]
+        self.assertEqual('http://2.2.2.2', endpoint())
         mocked_adapter.session.get_endpoint.assert_called_with(
             mock_auth,
             interface='publicURL',
             service_type='sharev2',
             region_name='SecondRegion',
         )
+        self.assertEqual('fake_token', token())
         client.httpclient.HTTPClient.assert_called_with(
-            'http://2.2.2.2',
-            'fake_token',
+            mock.ANY,
+            mock.ANY,
             'python-manilaclient',
             insecure=False,
             cacert=None,
@@ -188,6 +540,14 @@ class ClientTest(utils.TestCase):
             retries=None,
             http_log_debug=False,
             api_version=manilaclient.API_MIN_VERSION,
+            pool_maxsize=None,
+            connection_retries=None,
+            keep_alive=True,
+            json_decoder=None,
+            retry_policy=None,
+            rate_limiter=None,
+            instruments=None,
+            session_adapter=None,
         )
         self.assertIsNotNone(c.client)
 
@@ -196,13 +556,14 @@ class ClientTest(utils.TestCase):
         mock_auth = mock.Mock()
         region = 'region1'
         mock_session.get_endpoint.return_value = 'http://fake-endpoint/'
-        client.Client(
+        c = client.Client(
             session=mock_session,
             auth=mock_auth,
             service_type='sharev2',
             endpoint_type='public',
             region_name=region,
         )
+        self.assertEqual('http://fake-endpoint/', c.client.endpoint_url)
         mock_session.get_endpoint.assert_called_once_with(
             mock_auth,
             service_type='sharev2',
@@ -246,14 +607,8 @@ class ClientTest(utils.TestCase):
         },
     )
     def test_client_init_no_session_no_auth_token(self, kwargs):
-        def fake_url_for(version):
-            if version == 'v3.0':
-                return 'url_v3.0'
-            else:
-                return None
-
         self.mock_object(client.httpclient, 'HTTPClient')
-        self.mock_object(client.identity.v3, 'Password')
+        self.mock_object(client.identity, 'Password')
         self.mock_object(client.adapter, 'LegacyJsonAdapter')
         self.mock_object(client.session.discover, 'Discover')
         self.mock_object(client.session, 'Session')
@@ -261,21 +616,20 @@ class ClientTest(utils.TestCase):
         client_args['api_version'] = manilaclient.API_MIN_VERSION
         self.auth_url = client_args['auth_url']
 
-        client.session.discover.Discover.return_value.url_for.side_effect = (
-            fake_url_for
-        )
-
         # Mock the adapter to return token and endpoint
         mocked_adapter = client.adapter.LegacyJsonAdapter.return_value
         mocked_adapter.session.get_token.return_value = 'fake_token'
         mocked_adapter.session.get_endpoint.return_value = 'http://3.3.3.3'
-        mocked_adapter.auth = client.identity.v3.Password.return_value
+        mocked_adapter.auth = client.identity.Password.return_value
 
         client.Client(**client_args)
 
+        endpoint, token = client.httpclient.HTTPClient.call_args[0][:2]
+        self.assertEqual('http://3.3.3.3', endpoint())
+        self.assertEqual('fake_token', token())
         client.httpclient.HTTPClient.assert_called_with(
-            'http://3.3.3.3',
-            'fake_token',
+            mock.ANY,
+            mock.ANY,
             'python-manilaclient',
             insecure=False,
             cacert=None,
@@ -284,11 +638,21 @@ class ClientTest(utils.TestCase):
             retries=None,
             http_log_debug=False,
             api_version=manilaclient.API_MIN_VERSION,
+            pool_maxsize=None,
+            connection_retries=None,
+            keep_alive=True,
+            json_decoder=None,
+            retry_policy=None,
+            rate_limiter=None,
+            instruments=None,
+            session_adapter=None,
         )
 
-        # Verify identity.v3.Password was called with correct credentials
-        client.identity.v3.Password.assert_called_with(
-            auth_url='url_v3.0',
+        # The Keystone version is discovered by the auth plugin when it
+        # first authenticates.
+        client.session.discover.Discover.assert_not_called()
+        client.identity.Password.assert_called_with(
+            auth_url=client_args['auth_url'],
             username=client_args['username'],
             password=client_args.get('password'),
             user_id=client_args['user_id'],
@@ -323,26 +687,69 @@ class ClientTest(utils.TestCase):
             region_name=client_args['region_name'],
         )
 
-    @mock.patch.object(client.session.discover, 'Discover', mock.Mock())
-    @mock.patch.object(client.session, 'Session', mock.Mock())
-    def test_client_init_no_session_no_auth_token_endpoint_not_found(self):
-        self.mock_object(client.httpclient, 'HTTPClient')
-        self.mock_object(client.identity.v3, 'Password')
-        self.mock_object(client.adapter, 'LegacyJsonAdapter')
-        client_args = self._get_client_args(
-            auth_urli='fake_url',
-            password='foo_password',
-            tenant_id='foo_tenant_id',
+    def test_managers_are_loaded_lazily(self):
+        c = client.Client(
+            input_auth_token='token',
+            service_catalog_url='http://fake',
+            api_version=manilaclient.API_MAX_VERSION,
         )
-        discover = client.session.discover.Discover
-        discover.return_value.url_for.return_value = None
 
-        self.assertRaises(
-            exceptions.CommandError, client.Client, **client_args
+        self.assertNotIn('shares', vars(c))
+
+        shares_manager = c.shares
+
+        self.assertIs(shares_manager, vars(c)['shares'])
+        self.assertIs(shares_manager, c.shares)
+        self.assertIs(c, shares_manager.api)
+        self.assertEqual('ShareManager', type(shares_manager).__name__)
+
+    def test_resource_cache(self):
+        c = client.Client(
+            input_auth_token='token',
+            service_catalog_url='http://fake',
+            resource_cache_ttl=30,
+            resource_cache_size=10,
+        )
+
+        self.assertEqual(30, c.resource_cache.ttl)
+        self.assertEqual(10, c.resource_cache.maxsize)
+
+    def test_resource_cache_disabled_by_default(self):
+        c = client.Client(
+            input_auth_token='token', service_catalog_url='http://fake'
+        )
+
+        self.assertIsNone(c.resource_cache)
+
+    def test_extensions_override_managers(self):
+        extension = mock.Mock(manager_class=mock.Mock())
+        extension.name = 'shares'
+
+        c = client.Client(
+            input_auth_token='token',
+            service_catalog_url='http://fake',
+            api_version=manilaclient.API_MAX_VERSION,
+            extensions=[extension],
+        )
+
+        self.assertIs(extension.manager_class.return_value, c.shares)
+
+    def test_import_does_not_load_manager_modules(self):
+        # NOTE: run in a fresh interpreter, the test process has already
+        # imported every manager module.
+        code = (
+            'import sys\n'
+            'from manilaclient.v2 import client\n'
+            'c = client.Client(input_auth_token="token",\n'
+            '                  service_catalog_url="http://fake")\n'
+            'c.shares\n'
+            'print(sorted(m for m in sys.modules\n'
+            '             if m.startswith("manilaclient.v2.")))\n'
         )
 
-        self.assertTrue(client.session.Session.called)
-        self.assertTrue(client.session.discover.Discover.called)
-        self.assertFalse(client.httpclient.HTTPClient.called)
-        self.assertFalse(client.identity.v3.Password.called)
-        self.assertFalse(client.adapter.LegacyJsonAdapter.called)
+        output = subprocess.check_output([sys.executable, '-c', code])
+        loaded = output.decode()
+
+        self.assertIn('manilaclient.v2.shares', loaded)
+        for module in ('quotas', 'share_backups', 'share_networks'):
+            self.assertNotIn(f'manilaclient.v2.{module}', loaded)
@@ -186,3 +186,37 @@ class TestLimitsManager(utils.TestCase):
         self.assertIsInstance(lim, limits.Limits)
         for li in lim.absolute:
             self.assertEqual(l1, li)
+
+    def test_get_rate_limiter(self):
+        api = mock.Mock()
+        api.client.get.return_value = (
+            None,
+            {
+                "limits": {
+                    "absolute": {},
+                    "rate": [
+                        {
+                            "uri": "*",
+                            "regex": ".*",
+                            "limit": [
+                                {
+                                    "verb": "POST",
+                                    "value": 10,
+                                    "remaining": 10,
+                                    "unit": "MINUTE",
+                                    "next-available": "fake",
+                                }
+                            ],
+                        }
+                    ],
+                }
+            },
+        )
+        limitsManager = limits.LimitsManager(api)
+
+        limiter = limitsManager.get_rate_limiter()
+
+        api.client.get.assert_called_once_with('/limits')
+        self.assertEqual(1, len(limiter.limits))
+        self.assertTrue(limiter.limits[0].matches('POST', '/shares'))
+        self.assertEqual(10, limiter.limits[0].bucket.capacity)
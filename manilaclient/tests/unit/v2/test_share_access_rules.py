@@ -0,0 +1,312 @@
+# Licensed under the Apache License, Version 2.0 (the "License"); you may
+# not use this file except in compliance with the License. You may obtain
+# a copy of the License at
+#
+# http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+# WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+# License for the specific language governing permissions and limitations
+# under the License.
+
+from unittest import mock
+
+import ddt
+
+from manilaclient import api_versions
+from manilaclient.common import httpclient
+from manilaclient.common import waiters
+from manilaclient import exceptions
+from manilaclient.tests.unit import utils
+from manilaclient.v2 import share_access_rules
+
+
+def _rule(
+    rule_id, access_to, access_level='rw', metadata=None, state='active'
+):
+    return {
+        'id': rule_id,
+        'access_type': 'ip',
+        'access_to': access_to,
+        'access_level': access_level,
+        'state': state,
+        'metadata': metadata or {},
+    }
+
+
+@ddt.ddt
+class ShareAccessRuleSyncTest(utils.TestCase):
+    def setUp(self):
+        super().setUp()
+        self.api = mock.Mock(
+            api_version=api_versions.APIVersion('2.88'),
+            stream_listings=False,
+            use_completion_cache=False,
+        )
+        self.api.client.get.return_value = (
+            None,
+            {
+                'access_list': [
+                    _rule('1', '10.0.0.1'),
+                    _rule('2', '10.0.0.2', metadata={'k1': 'v1', 'k2': 'v2'}),
+                    _rule('3', '10.0.0.3'),
+                    _rule('4', '10.0.0.4', access_level='ro'),
+                ]
+            },
+        )
+        self.manager = share_access_rules.ShareAccessRuleManager(self.api)
+        self.mock_object(self.manager, 'set_access_level')
+        self.mock_object(self.manager, 'set_metadata')
+        self.mock_object(self.manager, 'unset_metadata')
+        self.desired_rules = [
+            {'access_type': 'ip', 'access_to': '10.0.0.1'},
+            {
+                'access_type': 'ip',
+                'access_to': '10.0.0.2',
+                'metadata': {'k1': 'v1', 'k3': 'v3'},
+            },
+            {'access_type': 'ip', 'access_to': '10.0.0.4'},
+            {
+                'access_type': 'ip',
+                'access_to': '10.0.0.5',
+                'access_level': 'ro',
+            },
+        ]
+
+    @ddt.data(1, 4)
+    def test_sync(self, concurrency):
+        result = self.manager.sync(
+            'fake_share', self.desired_rules, concurrency=concurrency
+        )
+
+        self.api.client.get.assert_called_once_with(
+            '/share-access-rules?share_id=fake_share'
+        )
+        self.assertEqual(
+            [
+                ('update', '10.0.0.2', None),
+                ('update', '10.0.0.4', None),
+                ('add', '10.0.0.5', None),
+                ('remove', '10.0.0.3', None),
+            ],
+            [
+                (action, rule['access_to'], error)
+                for action, rule, error in result
+            ],
+        )
+        self.api.shares.allow.assert_called_once_with(
+            'fake_share', 'ip', '10.0.0.5', 'ro', metadata=None
+        )
+        self.api.shares.deny.assert_called_once_with('fake_share', '3')
+        self.manager.set_access_level.assert_called_once_with('4', 'rw')
+        self.manager.set_metadata.assert_called_once_with('2', {'k3': 'v3'})
+        self.manager.unset_metadata.assert_called_once_with('2', ['k2'])
+
+    def test_sync_request_headers(self):
+        headers = []
+
+        def record(*args, **kwargs):
+            headers.append(httpclient._request_headers.get({}).get('X-Fake'))
+
+        self.api.shares.allow.side_effect = record
+        self.api.shares.deny.side_effect = record
+
+        with httpclient.request_headers({'X-Fake': 'fake'}):
+            self.manager.sync('fake_share', self.desired_rules, concurrency=4)
+
+        self.assertEqual(['fake', 'fake'], headers)
+
+    def test_sync_dry_run(self):
+        result = self.manager.sync(
+            'fake_share', self.desired_rules, dry_run=True
+        )
+
+        self.assertEqual(
+            ['update', 'update', 'add', 'remove'],
+            [action for action, rule, error in result],
+        )
+        self.api.shares.allow.assert_not_called()
+        self.api.shares.deny.assert_not_called()
+        self.manager.set_access_level.assert_not_called()
+        self.manager.set_metadata.assert_not_called()
+
+    def test_sync_nothing_to_do(self):
+        desired_rules = [
+            {'access_type': 'ip', 'access_to': '10.0.0.1'},
+            {'access_type': 'ip', 'access_to': '10.0.0.2'},
+            {'access_type': 'ip', 'access_to': '10.0.0.3'},
+            {
+                'access_type': 'ip',
+                'access_to': '10.0.0.4',
+                'access_level': 'ro',
+            },
+        ]
+
+        self.assertEqual([], self.manager.sync('fake_share', desired_rules))
+        self.api.shares.allow.assert_not_called()
+
+    def test_sync_replaces_rules_before_2_88(self):
+        self.api.api_version = api_versions.APIVersion('2.45')
+        self.mock_object(
+            self.manager,
+            'get',
+            mock.Mock(side_effect=exceptions.NotFound(404)),
+        )
+        desired_rules = [
+            {
+                'access_type': 'ip',
+                'access_to': '10.0.0.1',
+                'access_level': 'ro',
+            }
+        ]
+
+        self.manager.sync('fake_share', desired_rules)
+
+        self.api.shares.deny.assert_has_calls(
+            [
+                mock.call('fake_share', '1'),
+                mock.call('fake_share', '2'),
+                mock.call('fake_share', '3'),
+                mock.call('fake_share', '4'),
+            ],
+            any_order=True,
+        )
+        self.api.shares.allow.assert_called_once_with(
+            'fake_share', 'ip', '10.0.0.1', 'ro', metadata=None
+        )
+        self.manager.set_access_level.assert_not_called()
+
+    def _deny_asynchronously(self, states):
+        # The denied rule goes through the given states before it is gone.
+        calls = []
+        states = iter(states)
+
+        def get(rule_id):
+            calls.append(('get', rule_id))
+            state = next(states, None)
+            if state is None:
+                raise exceptions.NotFound(404)
+            return mock.Mock(id=rule_id, state=state)
+
+        self.mock_object(self.manager, 'get', mock.Mock(side_effect=get))
+        self.mock_object(waiters.time, 'sleep')
+        self.api.shares.deny.side_effect = lambda share, rule_id: calls.append(
+            ('deny', rule_id)
+        )
+        self.api.shares.allow.side_effect = lambda share, *args, **kw: (
+            calls.append(('allow', args[1]))
+        )
+        return calls
+
+    def test_sync_replace_waits_for_deny(self):
+        self.api.api_version = api_versions.APIVersion('2.45')
+        calls = self._deny_asynchronously(['queued_to_deny', 'denying'])
+        desired_rules = [
+            {
+                'access_type': 'ip',
+                'access_to': '10.0.0.1',
+                'access_level': 'ro',
+            }
+        ]
+
+        result = self.manager.sync('fake_share', desired_rules)
+
+        self.assertIsNone(result[0][2])
+        self.assertEqual(
+            [
+                ('deny', '1'),
+                ('get', '1'),
+                ('get', '1'),
+                ('get', '1'),
+                ('allow', '10.0.0.1'),
+            ],
+            [call for call in calls if call[1] in ('1', '10.0.0.1')],
+        )
+
+    def test_sync_replace_deny_failed(self):
+        self.api.api_version = api_versions.APIVersion('2.45')
+        self._deny_asynchronously(['denying', 'error'])
+        desired_rules = [
+            {
+                'access_type': 'ip',
+                'access_to': '10.0.0.1',
+                'access_level': 'ro',
+            }
+        ]
+
+        result = self.manager.sync('fake_share', desired_rules)
+
+        self.assertEqual(('update', '1'), (result[0][0], result[0][1]['id']))
+        self.assertIsInstance(result[0][2], exceptions.ClientException)
+        self.api.shares.allow.assert_not_called()
+
+    def test_sync_replaces_rules_in_error(self):
+        self.api.client.get.return_value = (
+            None,
+            {
+                'access_list': [
+                    _rule('1', '10.0.0.1', state='error'),
+                    _rule('2', '10.0.0.2'),
+                ]
+            },
+        )
+        calls = self._deny_asynchronously(['denying'])
+        desired_rules = [
+            {'access_type': 'ip', 'access_to': '10.0.0.1'},
+            {'access_type': 'ip', 'access_to': '10.0.0.2'},
+        ]
+
+        result = self.manager.sync('fake_share', desired_rules)
+
+        self.assertEqual(
+            [('update', '10.0.0.1', None)],
+            [
+                (action, rule['access_to'], error)
+                for action, rule, error in result
+            ],
+        )
+        self.assertEqual(
+            [
+                ('deny', '1'),
+                ('get', '1'),
+                ('get', '1'),
+                ('allow', '10.0.0.1'),
+            ],
+            calls,
+        )
+        self.manager.set_access_level.assert_not_called()
+
+    def test_sync_errors(self):
+        error = exceptions.BadRequest()
+        self.api.shares.deny.side_effect = error
+
+        result = self.manager.sync('fake_share', self.desired_rules)
+
+        self.assertEqual(
+            [None, None, None, error], [error for _, _, error in result]
+        )
+
+    def test_sync_duplicate_rules(self):
+        desired_rules = [
+            {'access_type': 'ip', 'access_to': '10.0.0.1'},
+            {
+                'access_type': 'ip',
+                'access_to': '10.0.0.1',
+                'access_level': 'ro',
+            },
+        ]
+
+        self.assertRaises(
+            ValueError, self.manager.sync, 'fake_share', desired_rules
+        )
+        self.api.shares.allow.assert_not_called()
+
+    def test_sync_invalid_concurrency(self):
+        self.assertRaises(
+            ValueError,
+            self.manager.sync,
+            'fake_share',
+            self.desired_rules,
+            concurrency=0,
+        )
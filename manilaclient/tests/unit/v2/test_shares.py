@@ -857,6 +857,38 @@ class SharesTest(utils.TestCase):
         cs.shares.delete_metadata(share, keys)
         cs.assert_called('DELETE', '/shares/1234/metadata/key1')
 
+    def test_delete_metadata_bulk(self):
+        cs.client.callstack = []
+        cs.shares.delete_metadata('1234', ['key1'], bulk=True)
+        cs.assert_called('GET', '/shares/1234/metadata', pos=0)
+        cs.assert_called(
+            'PUT', '/shares/1234/metadata', {'metadata': {'key2': 'val2'}}
+        )
+        self.assertEqual(2, len(cs.client.callstack))
+
+    def test_delete_metadata_bulk_missing_key(self):
+        self.assertRaises(
+            exceptions.NotFound,
+            cs.shares.delete_metadata,
+            '1234',
+            ['key1', 'fake_key'],
+            bulk=True,
+        )
+        # The existing keys are deleted nonetheless.
+        cs.assert_called(
+            'PUT', '/shares/1234/metadata', {'metadata': {'key2': 'val2'}}
+        )
+
+    def test_delete_metadata_bulk_only_missing_keys(self):
+        self.assertRaises(
+            exceptions.NotFound,
+            cs.shares.delete_metadata,
+            '1234',
+            ['fake_key'],
+            bulk=True,
+        )
+        cs.assert_called('GET', '/shares/1234/metadata')
+
     @ddt.data(
         type('ShareUUID', (object,), {'uuid': '1234'}),
         type('ShareID', (object,), {'id': '1234'}),
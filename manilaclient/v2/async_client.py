@@ -0,0 +1,190 @@
+# Licensed under the Apache License, Version 2.0 (the "License"); you may
+# not use this file except in compliance with the License. You may obtain
+# a copy of the License at
+#
+# http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+# WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+# License for the specific language governing permissions and limitations
+# under the License.
+
+"""asyncio interface to the OpenStack Manila API."""
+
+import asyncio
+from concurrent import futures
+import contextvars
+import functools
+import inspect
+
+from manilaclient import base
+from manilaclient.common import httpclient
+from manilaclient.v2 import client
+
+_EXHAUSTED = object()
+
+
+class AsyncManager:
+    """Awaitable view of a :class:`manilaclient.base.Manager`.
+
+    Every public method of the wrapped manager is exposed as a coroutine
+    function with the same signature, and generator methods such as
+    ``iter_list`` as asynchronous generators. URL building, microversion
+    dispatch and resource construction are done by the wrapped manager
+    itself.
+    """
+
+    def __init__(self, manager, run):
+        self.manager = manager
+        self._run = run
+
+    def __getattr__(self, name):
+        attr = getattr(self.manager, name)
+        if (
+            name.startswith('_')
+            or not callable(attr)
+            or isinstance(attr, type)
+        ):
+            return attr
+
+        if inspect.isgeneratorfunction(attr):
+
+            @functools.wraps(attr)
+            async def _wrapper(*args, **kwargs):
+                # NOTE: generators such as iter_list() are advanced in the
+                # executor, so every page is fetched off the event loop.
+                iterator = attr(*args, **kwargs)
+                try:
+                    while True:
+                        item = await self._run(next, iterator, _EXHAUSTED)
+                        if item is _EXHAUSTED:
+                            return
+                        yield item
+                finally:
+                    # Callers leaving the iteration early close this
+                    # generator, which has to close the wrapped one, e.g. to
+                    # release a streamed response.
+                    if inspect.getgeneratorstate(iterator) != (
+                        inspect.GEN_CLOSED
+                    ):
+                        await self._run(iterator.close)
+
+        else:
+
+            @functools.wraps(attr)
+            async def _wrapper(*args, **kwargs):
+                return await self._run(attr, *args, **kwargs)
+
+        setattr(self, name, _wrapper)
+        return _wrapper
+
+    def __repr__(self):
+        return f"<AsyncManager {self.manager!r}>"
+
+
+class ThreadedAsyncClient:
+    """asyncio flavour of :class:`manilaclient.v2.client.Client`.
+
+    Exposes the same managers as the synchronous client, with coroutine
+    methods, so that API calls do not block the event loop::
+
+        >>> async with ThreadedAsyncClient(session=sess) as c:
+        ...     shares = await c.shares.list()
+        ...     share = await c.shares.get(shares[0])
+
+    This is not an asyncio HTTP transport: the blocking calls of a single
+    synchronous client are run in a pool of worker threads, sharing its
+    connection pool. At most ``max_workers`` requests are in flight at a
+    time, each one holding a worker thread, and the other calls wait for a
+    free worker. It keeps the event loop responsive, but doesn't scale to
+    thousands of concurrent requests.
+
+    :param client: an existing synchronous v2 client to wrap. If it is not
+        given, one is created from the remaining keyword arguments.
+    :param executor: a :class:`concurrent.futures.Executor` used to run the
+        blocking calls. The client owns and shuts down the executor only if
+        it created it.
+    :param max_workers: size of the thread pool created when ``executor``
+        is not given. Defaults to the size of the connection pool of the
+        client, so that every worker can keep its connection open. When
+        the client is created from keyword arguments, its connection pool
+        is sized after ``max_workers`` unless ``pool_maxsize`` is given.
+    """
+
+    def __init__(
+        self,
+        *args,
+        client=None,
+        executor=None,
+        max_workers=None,
+        **kwargs,
+    ):
+        if client is None:
+            if max_workers:
+                kwargs.setdefault('pool_maxsize', max_workers)
+            client = _create_client(*args, **kwargs)
+        self.client = client
+        if not max_workers:
+            max_workers = _get_pool_maxsize(client)
+        self._owns_executor = executor is None
+        self.executor = executor or futures.ThreadPoolExecutor(
+            max_workers=max_workers,
+            thread_name_prefix='manilaclient-async',
+        )
+        self._managers = {}
+
+    @property
+    def api_version(self):
+        return self.client.api_version
+
+    def __getattr__(self, name):
+        if name.startswith('_'):
+            raise AttributeError(name)
+        attr = getattr(self.client, name)
+        if not isinstance(attr, base.Manager):
+            return attr
+        if name not in self._managers:
+            self._managers[name] = AsyncManager(attr, self.run)
+        return self._managers[name]
+
+    async def run(self, func, *args, **kwargs):
+        """Run a blocking callable in the executor and await its result.
+
+        The callable runs in a copy of the context of the calling task, so
+        that headers set with ``httpclient.request_headers`` and the other
+        context scoped settings apply to it.
+        """
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(
+            self.executor,
+            functools.partial(
+                contextvars.copy_context().run, func, *args, **kwargs
+            ),
+        )
+
+    async def aclose(self):
+        """Release the executor and pooled connections of this client."""
+        if self._owns_executor:
+            self.executor.shutdown(wait=False)
+        http_client = getattr(self.client, 'client', None)
+        if hasattr(http_client, 'close'):
+            http_client.close()
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, *exc_info):
+        await self.aclose()
+
+
+def _create_client(*args, **kwargs):
+    return client.Client(*args, **kwargs)
+
+
+def _get_pool_maxsize(manila_client):
+    http_client = getattr(manila_client, 'client', None)
+    return (
+        getattr(http_client, 'pool_maxsize', None)
+        or httpclient.HTTPClient.DEFAULT_POOL_MAXSIZE
+    )
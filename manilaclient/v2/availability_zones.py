@@ -30,6 +30,7 @@ class AvailabilityZoneManager(base.Manager):
     """Manage :class:`AvailabilityZone` resources."""
 
     resource_class = AvailabilityZone
+    cache_reads = True
 
     @api_versions.wraps("1.0", "2.6")
     def list(self):
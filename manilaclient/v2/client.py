@@ -10,47 +10,79 @@
 # License for the specific language governing permissions and limitations
 # under the License.
 
+import copy
+import functools
+import importlib
+import threading
+from urllib import parse
+
 from debtcollector import removals
 from keystoneauth1 import adapter
+from keystoneauth1 import exceptions as ks_exceptions
 from keystoneauth1 import identity
 from keystoneauth1 import session
 
 import manilaclient
+from manilaclient import base
 from manilaclient.common import constants
 from manilaclient.common import httpclient
+from manilaclient.common import resource_cache
 from manilaclient import exceptions
-from manilaclient.v2 import availability_zones
-from manilaclient.v2 import limits
-from manilaclient.v2 import messages
-from manilaclient.v2 import qos_types
-from manilaclient.v2 import quota_classes
-from manilaclient.v2 import quotas
-from manilaclient.v2 import resource_locks
-from manilaclient.v2 import scheduler_stats
-from manilaclient.v2 import security_services
-from manilaclient.v2 import services
-from manilaclient.v2 import share_access_rules
-from manilaclient.v2 import share_backups
-from manilaclient.v2 import share_export_locations
-from manilaclient.v2 import share_group_snapshots
-from manilaclient.v2 import share_group_type_access
-from manilaclient.v2 import share_group_types
-from manilaclient.v2 import share_groups
-from manilaclient.v2 import share_instance_export_locations
-from manilaclient.v2 import share_instances
-from manilaclient.v2 import share_network_subnets
-from manilaclient.v2 import share_networks
-from manilaclient.v2 import share_replica_export_locations
-from manilaclient.v2 import share_replicas
-from manilaclient.v2 import share_servers
-from manilaclient.v2 import share_snapshot_export_locations
-from manilaclient.v2 import share_snapshot_instance_export_locations
-from manilaclient.v2 import share_snapshot_instances
-from manilaclient.v2 import share_snapshots
-from manilaclient.v2 import share_transfers
-from manilaclient.v2 import share_type_access
-from manilaclient.v2 import share_types
-from manilaclient.v2 import shares
+
+
+class _LazyManager:
+    """Import and instantiate a manager on first access.
+
+    Manager modules are only imported, and managers only created, for the
+    managers actually used through a client instance. The manager is then
+    stored on the instance, so later lookups are plain attribute accesses.
+    """
+
+    def __init__(self, module_name, class_name):
+        self.module_name = module_name
+        self.class_name = class_name
+        self.name = None
+
+    def __set_name__(self, owner, name):
+        self.name = name
+
+    def __get__(self, instance, owner=None):
+        if instance is None:
+            return self
+        module = importlib.import_module(f'manilaclient.v2.{self.module_name}')
+        manager = getattr(module, self.class_name)(instance)
+        # NOTE: threads racing for the first access all get the manager
+        # stored first.
+        return instance.__dict__.setdefault(self.name, manager)
+
+
+class _ProjectToken(identity.Token):
+    """Rescope the current token of another auth plugin to a project.
+
+    The token to rescope is looked up when the plugin authenticates, not
+    when it is created, so that it is renewed along with the token of the
+    other plugin rather than being kept past its expiry.
+    """
+
+    def __init__(self, root_auth, **scope):
+        super().__init__(auth_url=root_auth.auth_url, token=None, **scope)
+        self._root_auth = root_auth
+
+    def _rescope(self, session):
+        self._token = session.get_token(self._root_auth)
+        # The versioned plugin is bound to the token it was created with.
+        self._plugin = None
+        return super().get_auth_ref(session)
+
+    def get_auth_ref(self, session, **kwargs):
+        try:
+            return self._rescope(session)
+        except ks_exceptions.Unauthorized:
+            # The token was revoked, or expired ahead of its expiry date:
+            # authenticate the other plugin again, then retry once.
+            if not self._root_auth.invalidate():
+                raise
+            return self._rescope(session)
 
 
 class Client:
@@ -78,12 +110,87 @@ class Client:
         >>> sess = session.Session(auth=auth)
         >>> manila = client.Client(VERSION, session=sess)
 
+    API requests are sent with the token obtained when the client is
+    created. Long running processes may instead send them through the
+    keystoneauth session, which renews the token when it expires and shares
+    its connection pool::
+
+        >>> manila = client.Client(VERSION, session=sess,
+                                   use_session_transport=True)
+
+    Clients acting on behalf of other projects can be derived from a client,
+    they share its session and connections::
+
+        >>> project_client = manila.for_project(project_id=PROJECT_ID)
+
     Then call methods on its managers::
 
         >>> client.shares.list()
         ...
     """
 
+    availability_zones = _LazyManager(
+        'availability_zones', 'AvailabilityZoneManager'
+    )
+    limits = _LazyManager('limits', 'LimitsManager')
+    transfers = _LazyManager('share_transfers', 'ShareTransferManager')
+    messages = _LazyManager('messages', 'MessageManager')
+    qos_types = _LazyManager('qos_types', 'QosTypeManager')
+    services = _LazyManager('services', 'ServiceManager')
+    security_services = _LazyManager(
+        'security_services', 'SecurityServiceManager'
+    )
+    share_networks = _LazyManager('share_networks', 'ShareNetworkManager')
+    share_network_subnets = _LazyManager(
+        'share_network_subnets', 'ShareNetworkSubnetManager'
+    )
+    quota_classes = _LazyManager('quota_classes', 'QuotaClassSetManager')
+    quotas = _LazyManager('quotas', 'QuotaSetManager')
+    resource_locks = _LazyManager('resource_locks', 'ResourceLockManager')
+    shares = _LazyManager('shares', 'ShareManager')
+    share_export_locations = _LazyManager(
+        'share_export_locations', 'ShareExportLocationManager'
+    )
+    share_groups = _LazyManager('share_groups', 'ShareGroupManager')
+    share_group_snapshots = _LazyManager(
+        'share_group_snapshots', 'ShareGroupSnapshotManager'
+    )
+    share_group_type_access = _LazyManager(
+        'share_group_type_access', 'ShareGroupTypeAccessManager'
+    )
+    share_group_types = _LazyManager(
+        'share_group_types', 'ShareGroupTypeManager'
+    )
+    share_instances = _LazyManager('share_instances', 'ShareInstanceManager')
+    share_instance_export_locations = _LazyManager(
+        'share_instance_export_locations', 'ShareInstanceExportLocationManager'
+    )
+    share_snapshots = _LazyManager('share_snapshots', 'ShareSnapshotManager')
+    share_snapshot_instances = _LazyManager(
+        'share_snapshot_instances', 'ShareSnapshotInstanceManager'
+    )
+    share_snapshot_export_locations = _LazyManager(
+        'share_snapshot_export_locations', 'ShareSnapshotExportLocationManager'
+    )
+    share_snapshot_instance_export_locations = _LazyManager(
+        'share_snapshot_instance_export_locations',
+        'ShareSnapshotInstanceExportLocationManager',
+    )
+    share_types = _LazyManager('share_types', 'ShareTypeManager')
+    share_type_access = _LazyManager(
+        'share_type_access', 'ShareTypeAccessManager'
+    )
+    share_servers = _LazyManager('share_servers', 'ShareServerManager')
+    share_replicas = _LazyManager('share_replicas', 'ShareReplicaManager')
+    share_replica_export_locations = _LazyManager(
+        'share_replica_export_locations', 'ShareReplicaExportLocationManager'
+    )
+    pools = _LazyManager('scheduler_stats', 'PoolManager')
+    share_access_rules = _LazyManager(
+        'share_access_rules', 'ShareAccessRuleManager'
+    )
+    share_backups = _LazyManager('share_backups', 'ShareBackupManager')
+
     @removals.removed_kwarg(
         'use_keyring',
         message='This parameter is no longer supported and has no effect.',
@@ -135,6 +242,19 @@ class Client:
         project_domain_name=None,
         cert=None,
         password=None,
+        pool_maxsize=None,
+        connection_retries=None,
+        keep_alive=True,
+        use_completion_cache=False,
+        resource_cache_ttl=0,
+        resource_cache_size=resource_cache.DEFAULT_MAXSIZE,
+        compact_resources=False,
+        json_decoder=None,
+        stream_listings=False,
+        retry_policy=None,
+        rate_limiter=None,
+        instruments=None,
+        use_session_transport=False,
         **kwargs,
     ):
         self.username = username
@@ -150,6 +270,15 @@ class Client:
         self.project_domain_id = project_domain_id
         self.project_domain_name = project_domain_name
 
+        self.use_completion_cache = use_completion_cache
+        self.compact_resources = compact_resources
+        self.stream_listings = stream_listings
+        self.resource_cache = None
+        if resource_cache_ttl:
+            self.resource_cache = resource_cache.ResourceCache(
+                ttl=resource_cache_ttl, maxsize=resource_cache_size
+            )
+
         self.endpoint_type = endpoint_type
         self.auth_url = auth_url
         self.region_name = region_name
@@ -165,6 +294,13 @@ class Client:
             )
             raise exceptions.ClientException(msg)
 
+        if input_auth_token and use_session_transport:
+            msg = (
+                "The session transport requires a keystoneauth session or "
+                "credentials, it can't be used with 'input_auth_token'."
+            )
+            raise exceptions.ClientException(msg)
+
         self.project_id = tenant_id if tenant_id is not None else project_id
         self.keystone_client = None
         self.session = session
@@ -183,7 +319,6 @@ class Client:
                     service_name=service_name,
                     region_name=region_name,
                 )
-                input_auth_token = self.keystone_client.session.get_token(auth)
             else:
                 # Legacy path - create auth plugin and session ourselves
                 auth, ks_session = self._get_keystone_auth_and_session()
@@ -195,23 +330,38 @@ class Client:
                     service_name=service_name,
                     region_name=region_name,
                 )
-                input_auth_token = self.keystone_client.session.get_token(auth)
-
-        if not input_auth_token:
-            raise RuntimeError("Not Authorized")
+            # NOTE: the token and the endpoint are only looked up when the
+            # first request is made, so that creating a client which ends up
+            # unused doesn't cost any round trip to Keystone.
+            input_auth_token = self._get_token
+
+        # Shared with the clients derived with for_project().
+        self._service_type = service_type
+        self._endpoint_override = service_catalog_url
+        self._root_auth = None
+        if self.keystone_client is not None:
+            self._root_auth = (
+                self.keystone_client.auth or self.keystone_client.session.auth
+            )
+        self._project_auths = {}
+        self._project_auths_lock = threading.Lock()
 
         if not service_catalog_url:
-            # Use keystoneauth1 session endpoint discovery
-            service_catalog_url = self.keystone_client.session.get_endpoint(
-                self.keystone_client.auth,
+            service_catalog_url = functools.partial(
+                self._get_endpoint, service_type
+            )
+
+        session_adapter = None
+        if use_session_transport:
+            session_adapter = adapter.Adapter(
+                session=self.keystone_client.session,
+                auth=self.keystone_client.auth,
                 interface=endpoint_type,
                 service_type=service_type,
+                service_name=service_name,
                 region_name=region_name,
             )
 
-        if not service_catalog_url:
-            raise RuntimeError("Could not find Manila endpoint in catalog")
-
         self.api_version = api_version
         self.client = httpclient.HTTPClient(
             service_catalog_url,
@@ -224,74 +374,170 @@ class Client:
             retries=retries,
             http_log_debug=http_log_debug,
             api_version=self.api_version,
+            pool_maxsize=pool_maxsize,
+            connection_retries=connection_retries,
+            keep_alive=keep_alive,
+            json_decoder=json_decoder,
+            retry_policy=retry_policy,
+            rate_limiter=rate_limiter,
+            instruments=instruments,
+            session_adapter=session_adapter,
         )
 
-        self.availability_zones = availability_zones.AvailabilityZoneManager(
-            self
-        )
-        self.limits = limits.LimitsManager(self)
-        self.transfers = share_transfers.ShareTransferManager(self)
-        self.messages = messages.MessageManager(self)
-        self.qos_types = qos_types.QosTypeManager(self)
-        self.services = services.ServiceManager(self)
-        self.security_services = security_services.SecurityServiceManager(self)
-        self.share_networks = share_networks.ShareNetworkManager(self)
-        self.share_network_subnets = (
-            share_network_subnets.ShareNetworkSubnetManager(self)
-        )
-
-        self.quota_classes = quota_classes.QuotaClassSetManager(self)
-        self.quotas = quotas.QuotaSetManager(self)
-
-        self.resource_locks = resource_locks.ResourceLockManager(self)
+        self._load_extensions(extensions)
 
-        self.shares = shares.ShareManager(self)
-        self.share_export_locations = (
-            share_export_locations.ShareExportLocationManager(self)
+    def _get_token(self):
+        token = self.keystone_client.session.get_token(
+            self.keystone_client.auth
         )
-        self.share_groups = share_groups.ShareGroupManager(self)
-        self.share_group_snapshots = (
-            share_group_snapshots.ShareGroupSnapshotManager(self)
+        if not token:
+            raise RuntimeError("Not Authorized")
+        return token
+
+    def _get_endpoint(self, service_type):
+        # Use keystoneauth1 session endpoint discovery
+        endpoint = self.keystone_client.session.get_endpoint(
+            self.keystone_client.auth,
+            interface=self.endpoint_type,
+            service_type=service_type,
+            region_name=self.region_name,
         )
-        self.share_group_type_access = (
-            share_group_type_access.ShareGroupTypeAccessManager(self)
+        if not endpoint:
+            raise RuntimeError("Could not find Manila endpoint in catalog")
+        return endpoint
+
+    def _get_project_endpoint(self, endpoint):
+        # NOTE: endpoints given by the caller may hold the ID of the project
+        # of the token they were given with, e.g. '/v2/{project_id}'.
+        session = self.keystone_client.session
+        root_project_id = session.get_project_id(self._root_auth)
+        project_id = session.get_project_id(self.keystone_client.auth)
+        if not root_project_id or root_project_id == project_id:
+            return endpoint
+        url = parse.urlparse(endpoint)
+        path = '/'.join(
+            project_id if segment == root_project_id else segment
+            for segment in url.path.split('/')
         )
-        self.share_group_types = share_group_types.ShareGroupTypeManager(self)
-        self.share_instances = share_instances.ShareInstanceManager(self)
-        self.share_instance_export_locations = (
-            share_instance_export_locations.ShareInstanceExportLocationManager(
-                self
+        return parse.urlunparse(url._replace(path=path))
+
+    def _get_project_auth(self, **scope):
+        key = tuple(sorted(scope.items()))
+        with self._project_auths_lock:
+            auth = self._project_auths.get(key)
+            # Plugins whose token expired, or failed to be renewed, are
+            # replaced instead of being handed to new clients.
+            if auth is not None and auth.auth_ref is not None:
+                if auth.auth_ref.will_expire_soon(
+                    identity.BaseIdentityPlugin.MIN_TOKEN_LIFE_SECONDS
+                ):
+                    auth = None
+            if auth is None:
+                if not getattr(self._root_auth, 'auth_url', None):
+                    raise exceptions.ClientException(
+                        "Unable to scope a token to another project, the "
+                        "auth plugin of the client has no auth_url."
+                    )
+                auth = _ProjectToken(self._root_auth, **scope)
+                self._project_auths[key] = auth
+        return auth
+
+    def for_project(
+        self,
+        project_id=None,
+        project_name=None,
+        project_domain_id=None,
+        project_domain_name=None,
+    ):
+        """Return a client acting on behalf of another project.
+
+        The new client shares the keystoneauth session, the connection
+        pool, the API version, the retry policy, the rate limiter and the
+        instruments of this client, instead of authenticating and
+        connecting on its own. Its token is obtained by rescoping the
+        token of this client to the project, the first time it makes a
+        request. Scoped tokens are cached, so all the clients derived for
+        the same project share one. The endpoint is looked up in the
+        catalog of the scoped token; with ``service_catalog_url``, the ID
+        of the project of this client in its path is replaced by the ID of
+        the project.
+
+        :param project_id: ID of the project.
+        :param project_name: name of the project, along with the ID or the
+            name of its domain.
+        :param project_domain_id: ID of the domain of the project.
+        :param project_domain_name: name of the domain of the project.
+        """
+        if self.keystone_client is None:
+            raise exceptions.ClientException(
+                "Project clients can only be derived from a client created "
+                "with a keystoneauth session or credentials, not with "
+                "'input_auth_token'."
             )
-        )
-        self.share_snapshots = share_snapshots.ShareSnapshotManager(self)
-        self.share_snapshot_instances = (
-            share_snapshot_instances.ShareSnapshotInstanceManager(self)
-        )
-        self.share_snapshot_export_locations = (
-            share_snapshot_export_locations.ShareSnapshotExportLocationManager(
-                self
+        if not (project_id or project_name):
+            raise exceptions.ClientException(
+                "Either project_id or project_name must be provided."
             )
-        )
-        self.share_snapshot_instance_export_locations = share_snapshot_instance_export_locations.ShareSnapshotInstanceExportLocationManager(  # noqa: E501
-            self
+        scope = {
+            'project_id': project_id,
+            'project_name': project_name,
+            'project_domain_id': project_domain_id,
+            'project_domain_name': project_domain_name,
+        }
+        auth = self._get_project_auth(
+            **{k: v for k, v in scope.items() if v is not None}
         )
 
-        self.share_types = share_types.ShareTypeManager(self)
-        self.share_type_access = share_type_access.ShareTypeAccessManager(self)
-        self.share_servers = share_servers.ShareServerManager(self)
-        self.share_replicas = share_replicas.ShareReplicaManager(self)
-        self.share_replica_export_locations = (
-            share_replica_export_locations.ShareReplicaExportLocationManager(
-                self
-            )
+        derived = copy.copy(self)
+        for name, value in vars(self).items():
+            if not isinstance(value, base.Manager):
+                continue
+            # Managers are bound to their client, lazily loaded ones are
+            # loaded again on first access, extensions are recreated.
+            if isinstance(getattr(type(self), name, None), _LazyManager):
+                del vars(derived)[name]
+            else:
+                setattr(derived, name, type(value)(derived))
+
+        derived.project_id = derived.tenant_id = project_id
+        derived.project_name = derived.tenant_name = project_name
+        derived.project_domain_id = project_domain_id
+        derived.project_domain_name = project_domain_name
+
+        adapter_args = dict(
+            session=self.keystone_client.session,
+            auth=auth,
+            interface=self.endpoint_type,
+            service_type=self._service_type,
+            service_name=self.keystone_client.service_name,
+            region_name=self.region_name,
         )
-        self.pools = scheduler_stats.PoolManager(self)
-        self.share_access_rules = share_access_rules.ShareAccessRuleManager(
-            self
+        derived.keystone_client = adapter.LegacyJsonAdapter(**adapter_args)
+        session_adapter = None
+        if self.client.session_adapter is not None:
+            session_adapter = adapter.Adapter(**adapter_args)
+
+        if self._endpoint_override:
+            endpoint = functools.partial(
+                derived._get_project_endpoint, self._endpoint_override
+            )
+        else:
+            # The endpoint is looked up in the catalog of the scoped token.
+            endpoint = functools.partial(
+                derived._get_endpoint, self._service_type
+            )
+        derived.client = self.client.derive(
+            endpoint,
+            derived._get_token,
+            session_adapter=session_adapter,
         )
-        self.share_backups = share_backups.ShareBackupManager(self)
-
-        self._load_extensions(extensions)
+        # NOTE: responses differ between projects, the cache isn't shared.
+        if self.resource_cache is not None:
+            derived.resource_cache = resource_cache.ResourceCache(
+                ttl=self.resource_cache.ttl,
+                maxsize=self.resource_cache.maxsize,
+            )
+        return derived
 
     def _load_extensions(self, extensions):
         if not extensions:
@@ -314,18 +560,11 @@ class Client:
             verify = self.cacert or True
         ks_session = session.Session(verify=verify, cert=self.cert)
 
-        # Discover Keystone v3 endpoint
-        ks_discover = session.discover.Discover(ks_session, self.auth_url)
-        auth_url = ks_discover.url_for('v3.0')
-        if not auth_url:
-            raise exceptions.CommandError(
-                'Unable to determine the Keystone version to authenticate '
-                'with using the given auth_url.'
-            )
-
-        # Create v3 Password auth plugin
-        auth = identity.v3.Password(
-            auth_url=auth_url,
+        # NOTE: the generic plugin discovers the Keystone version to use
+        # when it first authenticates, not here, so that creating a client
+        # doesn't cost a round trip to Keystone.
+        auth = identity.Password(
+            auth_url=self.auth_url,
             username=self.username,
             password=self.password,
             user_id=self.user_id,
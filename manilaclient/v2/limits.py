@@ -15,6 +15,7 @@
 # under the License.
 
 from manilaclient import base
+from manilaclient.common import rate_limiter
 
 
 class Limits(base.Resource):
@@ -98,3 +99,13 @@ class LimitsManager(base.Manager):
         :rtype: :class:`Limits`
         """
         return self._get("/limits", "limits")
+
+    def get_rate_limiter(self):
+        """Build a client side rate limiter from the server rate limits.
+
+        Assign it to ``client.client.rate_limiter`` to pace the requests of
+        the client so that they stay within the limits.
+
+        :rtype: :class:`manilaclient.common.rate_limiter.RateLimiter`
+        """
+        return rate_limiter.RateLimiter.from_rate_limits(self.get().rate)
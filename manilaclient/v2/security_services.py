@@ -42,6 +42,7 @@ class SecurityServiceManager(base.ManagerWithFind):
     """Manage :class:`SecurityService` resources."""
 
     resource_class = SecurityService
+    name_search_opt = 'name'
 
     @api_versions.wraps("1.0", "2.75")
     def create(
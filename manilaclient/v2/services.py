@@ -95,7 +95,7 @@ class ServiceManager(base.Manager):
     def ensure_shares(self, host):  # noqa
         resource_path = f'{RESOURCE_PATH}/ensure-shares'
         body = {"host": host}
-        return self.api.client.post(resource_path, body=body)
+        return self._write('post', resource_path, body=body)
 
     def server_api_version(self, url_append=""):
         """Returns the API Version supported by the server.
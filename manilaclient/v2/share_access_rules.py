@@ -17,8 +17,16 @@
 # limitations under the License.
 """Interface for share access rules extension."""
 
+from concurrent import futures
+import contextvars
+import logging
+
 from manilaclient import api_versions
 from manilaclient import base
+from manilaclient.common import waiters
+from manilaclient import exceptions
+
+LOG = logging.getLogger(__name__)
 
 RESOURCE_PATH = '/share-access-rules/%s'
 RESOURCE_NAME = 'access'
@@ -26,6 +34,7 @@ RESOURCE_NAME = 'access'
 RESOURCES_METADATA_PATH = '/share-access-rules/%s/metadata'
 RESOURCE_METADATA_PATH = '/share-access-rules/%s/metadata/%s'
 RESOURCE_LIST_PATH = '/share-access-rules'
+DEFAULT_ACCESS_LEVEL = 'rw'
 
 
 class ShareAccessRule(base.Resource):
@@ -98,4 +107,162 @@ class ShareAccessRuleManager(base.ManagerWithFind):
         search_opts['share_id'] = base.getid(share)
         query_string = self._build_query_string(search_opts)
         url = RESOURCE_LIST_PATH + query_string
-        return self._list(url, 'access_list')
+        return self._list(url, 'access_list', stream=True)
+
+    def _plan_sync(self, current_rules, desired_rules):
+        """Compute the changes making current_rules match desired_rules.
+
+        :returns: list of (action, rule, changes) tuples, where action is
+            one of 'add', 'update' or 'remove'.
+        """
+        current = {
+            (rule.access_type, rule.access_to): rule for rule in current_rules
+        }
+        desired = {}
+        for rule in desired_rules:
+            rule = dict(rule)
+            rule.setdefault('access_level', DEFAULT_ACCESS_LEVEL)
+            key = (rule['access_type'], rule['access_to'])
+            if key in desired:
+                raise ValueError(
+                    f"Access to '{key[1]}' of type '{key[0]}' is given more "
+                    "than once."
+                )
+            desired[key] = rule
+
+        plan = []
+        for key, rule in desired.items():
+            existing = current.get(key)
+            if existing is None:
+                plan.append(('add', rule, None))
+                continue
+            if getattr(existing, 'state', None) == 'error':
+                # NOTE: rules in error state were never applied, they are
+                # replaced rather than left as they are.
+                plan.append(
+                    ('update', dict(rule, id=existing.id), {'replace': True})
+                )
+                continue
+            changes = {}
+            if existing.access_level != rule['access_level']:
+                changes['access_level'] = rule['access_level']
+            if rule.get('metadata') is not None:
+                existing_metadata = getattr(existing, 'metadata', None) or {}
+                set_metadata = {
+                    k: v
+                    for k, v in rule['metadata'].items()
+                    if existing_metadata.get(k) != v
+                }
+                unset_metadata = sorted(
+                    set(existing_metadata) - set(rule['metadata'])
+                )
+                if set_metadata:
+                    changes['set_metadata'] = set_metadata
+                if unset_metadata:
+                    changes['unset_metadata'] = unset_metadata
+            if changes:
+                plan.append(('update', dict(rule, id=existing.id), changes))
+        for key, existing in current.items():
+            if key not in desired:
+                plan.append(('remove', existing._info, None))
+        return plan
+
+    def _replace_rule(self, share, rule):
+        shares = self.api.shares
+        shares.deny(share, rule['id'])
+        # NOTE: rules are denied asynchronously, and the same access can't
+        # be allowed again until the denied rule is gone.
+        deleted = waiters.wait_for_delete(
+            self, [rule['id']], status_field='state', error_status=('error',)
+        )
+        if not deleted[rule['id']]:
+            raise exceptions.ClientException(
+                f"Access rule {rule['id']} was not denied, it can't be "
+                "replaced."
+            )
+        shares.allow(
+            share,
+            rule['access_type'],
+            rule['access_to'],
+            rule['access_level'],
+            metadata=rule.get('metadata'),
+        )
+
+    def _apply_sync_change(self, share, action, rule, changes):
+        shares = self.api.shares
+        if action == 'add':
+            shares.allow(
+                share,
+                rule['access_type'],
+                rule['access_to'],
+                rule['access_level'],
+                metadata=rule.get('metadata'),
+            )
+        elif action == 'remove':
+            shares.deny(share, rule['id'])
+        elif changes.get('replace') or (
+            'access_level' in changes
+            and self.api_version < api_versions.APIVersion('2.88')
+        ):
+            # NOTE: the access level can't be changed in place before 2.88,
+            # the rule is replaced instead.
+            self._replace_rule(share, rule)
+        else:
+            if 'access_level' in changes:
+                self.set_access_level(rule['id'], changes['access_level'])
+            if 'set_metadata' in changes:
+                self.set_metadata(rule['id'], changes['set_metadata'])
+            if 'unset_metadata' in changes:
+                self.unset_metadata(rule['id'], changes['unset_metadata'])
+
+    @api_versions.wraps("2.45")
+    def sync(self, share, desired_rules, concurrency=1, dry_run=False):
+        """Make the access rules of a share match the desired ones.
+
+        The current rules are listed once, and only the rules that differ
+        are added, updated or removed, with up to ``concurrency`` of these
+        changes applied in parallel. Rules in error state are replaced, as
+        are rules whose access level changes before API microversion 2.88;
+        their replacement waits for the old rule to be denied.
+
+        :param share: either share object or text with its ID.
+        :param desired_rules: iterable of dicts describing every rule the
+            share must have, with their 'access_type' and 'access_to', and
+            optionally their 'access_level' (defaults to 'rw') and
+            'metadata'. The metadata of a rule is left as is if not given.
+        :param concurrency: maximum number of changes applied at once.
+        :param dry_run: only compute the changes, without applying them.
+        :returns: list of (action, rule, error) tuples, one per change, where
+            action is 'add', 'update' or 'remove', rule is a dict describing
+            the rule and error is the exception raised while applying the
+            change, or None if it succeeded.
+        """
+        concurrency = int(concurrency)
+        if concurrency < 1:
+            raise ValueError("concurrency must be a positive integer.")
+
+        plan = self._plan_sync(self.access_list(share), desired_rules)
+        if dry_run or not plan:
+            return [(action, rule, None) for action, rule, changes in plan]
+
+        def apply(change):
+            action, rule, changes = change
+            try:
+                self._apply_sync_change(share, action, rule, changes)
+            except Exception as e:
+                LOG.debug("Failed to %s access rule %s: %s", action, rule, e)
+                return action, rule, e
+            return action, rule, None
+
+        if concurrency == 1 or len(plan) == 1:
+            return [apply(change) for change in plan]
+        with futures.ThreadPoolExecutor(
+            max_workers=min(concurrency, len(plan))
+        ) as executor:
+            # NOTE: the changes are applied in the context of the caller,
+            # e.g. with its request headers.
+            pending = [
+                executor.submit(contextvars.copy_context().run, apply, change)
+                for change in plan
+            ]
+            return [future.result() for future in pending]
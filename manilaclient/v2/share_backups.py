@@ -30,6 +30,7 @@ class ShareBackupManager(base.ManagerWithFind):
     """Manage :class:`ShareBackup` resources."""
 
     resource_class = ShareBackup
+    name_search_opt = 'name'
 
     @api_versions.wraps("2.80")
     @api_versions.experimental_api
@@ -145,4 +146,4 @@ class ShareBackupManager(base.ManagerWithFind):
         self.run_hooks('modify_body_for_action', body, **kwargs)
         backup_id = base.getid(backup)
         url = RESOURCE_PATH_ACTION % backup_id
-        return self.api.client.post(url, body=body)
+        return self._write('post', url, body=body)
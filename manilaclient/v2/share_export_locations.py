@@ -63,8 +63,10 @@ class ShareExportLocationManager(base.MetadataCapableManager):
         )
 
     @api_versions.wraps('2.87')
-    def delete_metadata(self, resource, keys, subresource=None):
-        return super().delete_metadata(resource, keys, subresource=subresource)
+    def delete_metadata(self, resource, keys, subresource=None, bulk=False):
+        return super().delete_metadata(
+            resource, keys, subresource=subresource, bulk=bulk
+        )
 
     @api_versions.wraps('2.87')
     def update_all_metadata(self, resource, metadata, subresource=None):
@@ -49,6 +49,7 @@ class ShareGroupSnapshotManager(base.ManagerWithFind):
     """Manage :class:`ShareGroupSnapshot` resources."""
 
     resource_class = ShareGroupSnapshot
+    name_search_opt = 'name'
 
     def _create_share_group_snapshot(
         self, share_group, name=None, description=None
@@ -220,7 +221,7 @@ class ShareGroupSnapshotManager(base.ManagerWithFind):
         if force:
             url = RESOURCE_PATH_ACTION % share_group_snapshot_id
             body = {'force_delete': None}
-            self.api.client.post(url, body=body)
+            self._write('post', url, body=body)
         else:
             url = RESOURCE_PATH % share_group_snapshot_id
             self._delete(url)
@@ -244,7 +245,7 @@ class ShareGroupSnapshotManager(base.ManagerWithFind):
         share_group_snapshot_id = base.getid(share_group_snapshot)
         url = RESOURCE_PATH_ACTION % share_group_snapshot_id
         body = {'reset_status': {'status': state}}
-        self.api.client.post(url, body=body)
+        self._write('post', url, body=body)
 
     @api_versions.wraps("2.31", "2.54")
     @api_versions.experimental_api
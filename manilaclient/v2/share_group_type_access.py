@@ -87,4 +87,4 @@ class ShareGroupTypeAccessManager(base.ManagerWithFind):
         self.run_hooks('modify_body_for_action', body, **kwargs)
         share_group_type_id = base.getid(share_group_type)
         url = RESOURCE_PATH_ACTION % share_group_type_id
-        return self.api.client.post(url, body=body)
+        return self._write('post', url, body=body)
@@ -92,6 +92,7 @@ class ShareGroupTypeManager(base.ManagerWithFind):
     """Manage :class:`ShareGroupType` resources."""
 
     resource_class = ShareGroupType
+    cache_reads = True
 
     def _create_share_group_type(
         self, name, share_types, is_public=False, group_specs=None
@@ -50,6 +50,7 @@ class ShareGroupManager(base.ManagerWithFind):
     """Manage :class:`ShareGroup` resources."""
 
     resource_class = ShareGroup
+    name_search_opt = 'name'
 
     def _create_share_group(
         self,
@@ -293,7 +294,7 @@ class ShareGroupManager(base.ManagerWithFind):
         if force:
             url = RESOURCE_PATH_ACTION % share_group_id
             body = {'force_delete': None}
-            self.api.client.post(url, body=body)
+            self._write('post', url, body=body)
         else:
             url = RESOURCE_PATH % share_group_id
             self._delete(url)
@@ -317,7 +318,7 @@ class ShareGroupManager(base.ManagerWithFind):
         share_group_id = base.getid(share_group)
         url = RESOURCE_PATH_ACTION % share_group_id
         body = {'reset_status': {'status': state}}
-        self.api.client.post(url, body=body)
+        self._write('post', url, body=body)
 
     @api_versions.wraps("2.31", "2.54")
     @api_versions.experimental_api
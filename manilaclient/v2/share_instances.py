@@ -81,7 +81,7 @@ class ShareInstanceManager(base.ManagerWithFind):
         body = {action: info}
         self.run_hooks('modify_body_for_action', body, **kwargs)
         url = f'/share_instances/{base.getid(instance)}/action'
-        return self.api.client.post(url, body=body)
+        return self._write('post', url, body=body)
 
     def _do_force_delete(self, instance, action_name="force_delete"):
         """Delete a share instance forcibly - share status will be avoided.
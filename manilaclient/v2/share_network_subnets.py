@@ -144,8 +144,10 @@ class ShareNetworkSubnetManager(base.MetadataCapableManager):
         )
 
     @api_versions.wraps('2.78')
-    def delete_metadata(self, resource, keys, subresource=None):
-        return super().delete_metadata(resource, keys, subresource=subresource)
+    def delete_metadata(self, resource, keys, subresource=None, bulk=False):
+        return super().delete_metadata(
+            resource, keys, subresource=subresource, bulk=bulk
+        )
 
     @api_versions.wraps('2.78')
     def update_all_metadata(self, resource, metadata, subresource=None):
@@ -43,6 +43,7 @@ class ShareNetworkManager(base.ManagerWithFind):
     """Manage :class:`ShareNetwork` resources."""
 
     resource_class = ShareNetwork
+    name_search_opt = 'name'
 
     @api_versions.wraps("1.0", "2.25")
     def create(
@@ -270,7 +271,7 @@ class ShareNetworkManager(base.ManagerWithFind):
         body = {action: info}
         self.run_hooks('modify_body_for_action', body)
         url = ACTION_PATH % base.getid(share_network)
-        return self.api.client.post(url, body=body)
+        return self._write('post', url, body=body)
 
     def add_security_service(self, share_network, security_service):
         """Associate given security service with a share network.
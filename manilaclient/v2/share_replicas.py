@@ -316,7 +316,7 @@ class ShareReplicaManager(base.MetadataCapableManager):
         self.run_hooks('modify_body_for_action', body, **kwargs)
         replica_id = base.getid(replica)
         url = RESOURCE_PATH_ACTION % replica_id
-        return self.api.client.post(url, body=body)
+        return self._write('post', url, body=body)
 
     def _do_delete(self, replica, force=False):
         """Delete a share replica.
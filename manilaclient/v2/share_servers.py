@@ -207,7 +207,7 @@ class ShareServerManager(base.ManagerWithFind):
         body = {action: info}
         self.run_hooks('modify_body_for_action', body)
         url = ACTION_PATH % base.getid(share_server)
-        return self.api.client.post(url, body=body)
+        return self._write('post', url, body=body)
 
     @api_versions.wraps("2.57")
     @api_versions.experimental_api
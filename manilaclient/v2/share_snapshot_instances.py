@@ -71,4 +71,4 @@ class ShareSnapshotInstanceManager(base.ManagerWithFind):
         body = {action: info}
         self.run_hooks('modify_body_for_action', body, **kwargs)
         url = f'/snapshot-instances/{base.getid(instance)}/action'
-        return self.api.client.post(url, body=body)
+        return self._write('post', url, body=body)
@@ -61,6 +61,7 @@ class ShareSnapshotManager(base.MetadataCapableManager):
     """Manage :class:`ShareSnapshot` resources."""
 
     resource_class = ShareSnapshot
+    name_search_opt = 'name'
     resource_path = '/snapshots'
 
     def _do_create(
@@ -191,7 +192,7 @@ class ShareSnapshotManager(base.MetadataCapableManager):
         else:
             path = f"/snapshots{query_string}"
 
-        return self._list(path, 'snapshots')
+        return self._list(path, 'snapshots', stream=True)
 
     def delete(self, snapshot):
         """Delete a snapshot of a share.
@@ -277,4 +278,4 @@ class ShareSnapshotManager(base.MetadataCapableManager):
         body = {action: info}
         self.run_hooks('modify_body_for_action', body, **kwargs)
         url = f'/snapshots/{base.getid(snapshot)}/action'
-        return self.api.client.post(url, body=body)
+        return self._write('post', url, body=body)
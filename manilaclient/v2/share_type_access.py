@@ -60,4 +60,4 @@ class ShareTypeAccessManager(base.ManagerWithFind):
         body = {action: info}
         self.run_hooks('modify_body_for_action', body, **kwargs)
         url = f'/types/{base.getid(share_type)}/action'
-        return self.api.client.post(url, body=body)
+        return self._write('post', url, body=body)
@@ -112,6 +112,7 @@ class ShareTypeManager(base.ManagerWithFind):
     """Manage :class:`ShareType` resources."""
 
     resource_class = ShareType
+    cache_reads = True
 
     def list(self, search_opts=None, show_all=True):
         """Get a list of all share types.
@@ -134,6 +134,7 @@ class ShareManager(base.MetadataCapableManager):
     """Manage :class:`Share` resources."""
 
     resource_class = Share
+    name_search_opt = 'name'
     resource_path = '/shares'
 
     def create(
@@ -451,8 +452,8 @@ class ShareManager(base.MetadataCapableManager):
 
         :param share: either share object or text with its ID.
         """
-        return self.api.client.post(
-            f"/os-share-unmanage/{base.getid(share)}/unmanage"
+        return self._write(
+            'post', f"/os-share-unmanage/{base.getid(share)}/unmanage"
         )
 
     @api_versions.wraps("2.7")  # noqa
@@ -667,7 +668,7 @@ class ShareManager(base.MetadataCapableManager):
         else:
             path = f"/shares{query_string}"
 
-        return self._list(path, 'shares', return_raw=return_raw)
+        return self._list(path, 'shares', return_raw=return_raw, stream=True)
 
     def delete(self, share, share_group_id=None):
         """Delete a share.
@@ -969,7 +970,7 @@ class ShareManager(base.MetadataCapableManager):
         body = {action: info}
         self.run_hooks('modify_body_for_action', body, **kwargs)
         url = f'/shares/{base.getid(share)}/action'
-        return self.api.client.post(url, body=body)
+        return self._write('post', url, body=body)
 
     def _do_reset_state(self, share, state, action_name):
         """Update the provided share with the provided state.